@@ -0,0 +1,354 @@
+"""
+Corpus replay: offline regression and speed check of detection and the page scripts
+
+Replays every page of a captured corpus (python main.py ... --capture-dir,
+see src.page_corpus) without the survey. Detection must still give the page
+type and activity code recorded at capture time, and the fill scripts must
+do their job on every page variant: FILL_ALL_ZERO_JS / FILL_VISIBLE_INPUTS_JS
+fill exactly the visible text inputs, SELECT_TOPICS_JS finds and checks every
+offered topic and unchecks them again.
+
+The browser engine loads all pages into one reused headless page
+(set_content, every request aborted), so a pass over the corpus takes well
+under a second. The html engine replays the same checks on the HTTP engine's
+parser (HtmlStep) and needs no Chromium.
+
+Usage:
+    python -m benchmarks.bench_corpus --capture-stub          # seed the corpus from the local stub
+    python -m benchmarks.bench_corpus
+    python -m benchmarks.bench_corpus --engine html --repeat 20
+    python -m benchmarks.bench_corpus --save-baseline benchmarks/baselines/corpus.json
+    python -m benchmarks.bench_corpus --baseline benchmarks/baselines/corpus.json --tolerance 0.2
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.page_corpus import PageCorpus
+from src.page_snapshot import PageSnapshot, take_snapshot
+from src.page_scripts import FILL_ALL_ZERO_JS, FILL_VISIBLE_INPUTS_JS, SELECT_TOPICS_JS
+from src.question_detector import detect_question_type
+from src.text_normalizer import normalize_for_checkbox_matching
+
+
+DEFAULT_CORPUS = 'benchmarks/corpus'
+ENGINES = ('browser', 'html')
+
+# Any URL: the html engine only resolves the form action against it
+CORPUS_URL = 'http://corpus.invalid/index.php/262621'
+
+
+class BrowserReplay:
+    """Pages loaded into one reused headless Chromium page"""
+
+    def __init__(self, headless: bool = True, bulk: bool = False):
+        from playwright.sync_api import sync_playwright
+
+        self.bulk = bulk
+        self._playwright = sync_playwright().start()
+        self._browser = self._playwright.chromium.launch(headless=headless)
+        self.page = self._browser.new_page()
+        # Captured pages reference the survey's assets; nothing leaves the machine
+        self.page.route('**/*', lambda route: route.abort())
+
+    def load(self, html: str) -> None:
+        self.page.set_content(html, wait_until='domcontentloaded')
+
+    def snapshot(self) -> PageSnapshot:
+        return take_snapshot(self.page)
+
+    def fill_zero(self) -> int:
+        return self.page.evaluate(FILL_ALL_ZERO_JS, self.bulk)['filled']
+
+    def fill_visible(self, values: List[str]) -> int:
+        return self.page.evaluate(FILL_VISIBLE_INPUTS_JS, {'values': values, 'bulk': self.bulk})['filled']
+
+    def select_topics(self, topic_norms: List[str]) -> Dict[str, Any]:
+        return self.page.evaluate(SELECT_TOPICS_JS, {'topicNorms': topic_norms, 'bulk': self.bulk})
+
+    def close(self) -> None:
+        self._browser.close()
+        self._playwright.stop()
+
+
+class HtmlReplay:
+    """Pages parsed by the HTTP engine (no browser)"""
+
+    def __init__(self):
+        from src.http_engine import HtmlStep
+
+        self._step_class = HtmlStep
+        self.step = None
+
+    def load(self, html: str) -> None:
+        self.step = self._step_class(CORPUS_URL, html)
+
+    def snapshot(self) -> PageSnapshot:
+        return self.step.snapshot
+
+    def fill_zero(self) -> int:
+        for field in self.step.inputs:
+            field['value'] = '0'
+        return len(self.step.inputs)
+
+    def fill_visible(self, values: List[str]) -> int:
+        return self.step.fill_visible(values)
+
+    def select_topics(self, topic_norms: List[str]) -> Dict[str, Any]:
+        return self.step.select_topics(topic_norms)
+
+    def close(self) -> None:
+        pass
+
+
+def replay_page(replay, html: str, entry: Dict[str, Any]) -> List[str]:
+    """
+    Detection and fill checks of one corpus page
+
+    Returns:
+        Problems found (empty when the page behaves as captured)
+    """
+    problems = []
+    replay.load(html)
+    snapshot = replay.snapshot()
+
+    if entry['page_type'] == 'completion':
+        if not snapshot.completed:
+            problems.append("completion page not recognized")
+        return problems
+
+    info = detect_question_type(snapshot.question_text)
+    expected = (entry['page_type'], entry['activity_code'])
+    detected = (info.page_type, info.activity_code) if info else (None, None)
+
+    if entry['page_type'] is not None and detected != expected:
+        problems.append(f"detected as {detected[0]} {detected[1] or ''}, captured as {expected[0]} {expected[1] or ''}")
+    if info is None:
+        return problems
+
+    visible = snapshot.visible_inputs
+
+    if info.page_type == 'fixed_zero':
+        filled = replay.fill_zero()
+        values = [field['value'] for field in replay.snapshot().inputs]
+        if filled != len(snapshot.inputs) or any(value != '0' for value in values):
+            problems.append(f"FILL_ALL_ZERO: filled {filled} of {len(snapshot.inputs)} inputs")
+
+    elif info.page_type in ('simple_inputs', 'table_counts'):
+        planned = [str(i + 1) for i in range(len(visible))]
+        filled = replay.fill_visible(planned)
+        after = replay.snapshot()
+        got = [field['value'] for field in after.visible_inputs]
+        hidden = [field['value'] for field in after.inputs if not field.get('visible')]
+        if filled != len(planned) or got != planned:
+            problems.append(f"FILL_VISIBLE_INPUTS: filled {filled} of {len(planned)} visible inputs")
+        if any(value for value in hidden):
+            problems.append("FILL_VISIBLE_INPUTS: wrote into hidden rows")
+
+    elif info.page_type == 'checkboxes':
+        labels = [box['label'] for box in snapshot.checkboxes if box['label']]
+        report = replay.select_topics([normalize_for_checkbox_matching(label) for label in labels])
+        unmatched = [label for label, match in zip(labels, report['matches']) if match['match'] == 'unmatched']
+        if unmatched:
+            problems.append(f"SELECT_TOPICS: no checkbox found for {', '.join(unmatched)}")
+        if not all(box['checked'] for box in replay.snapshot().checkboxes if box['label']):
+            problems.append("SELECT_TOPICS: not all topics checked")
+
+        replay.select_topics([])
+        if any(box['checked'] for box in replay.snapshot().checkboxes):
+            problems.append("SELECT_TOPICS: checkboxes left checked after selecting none")
+
+    return problems
+
+
+def percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def run_corpus(corpus: PageCorpus, engine: str, repeat: int, headless: bool = True, bulk: bool = False) -> Dict[str, Any]:
+    """Replay the corpus `repeat` times; best time per page"""
+    entries = corpus.sorted_entries()
+    pages = [(entry, corpus.html(entry)) for entry in entries]
+
+    replay = BrowserReplay(headless=headless, bulk=bulk) if engine == 'browser' else HtmlReplay()
+    best: Dict[str, float] = {}
+    problems: Dict[str, List[str]] = {}
+    passes = []
+
+    try:
+        for _ in range(repeat):
+            pass_start = time.perf_counter()
+            for entry, html in pages:
+                start = time.perf_counter()
+                problems[entry['id']] = replay_page(replay, html, entry)
+                elapsed = time.perf_counter() - start
+                best[entry['id']] = min(best.get(entry['id'], elapsed), elapsed)
+            passes.append(time.perf_counter() - pass_start)
+    finally:
+        replay.close()
+
+    by_type: Dict[str, List[float]] = defaultdict(list)
+    for entry in entries:
+        by_type[entry['page_type'] or 'unknown'].append(best[entry['id']])
+
+    failures = [
+        {'id': entry['id'], 'page_type': entry['page_type'], 'activity_code': entry['activity_code'], 'problems': problems[entry['id']]}
+        for entry in entries if problems[entry['id']]
+    ]
+
+    return {
+        'generated': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'engine': engine,
+        'bulk': bulk,
+        'corpus': str(corpus.dir),
+        'pages': len(entries),
+        'pass_ms': round(min(passes) * 1000, 2) if passes else 0.0,
+        'by_type': {
+            page_type: {
+                'pages': len(times),
+                'p50_ms': round(percentile(times, 50) * 1000, 3),
+                'max_ms': round(max(times) * 1000, 3),
+            }
+            for page_type, times in sorted(by_type.items())
+        },
+        'failures': failures,
+    }
+
+
+def capture_stub(corpus_dir: str) -> int:
+    """
+    Seed a corpus from the local survey stub
+
+    Runs the HTTP engine with capture for every benchmark shape, so every
+    stub page variant (all school types, 3 and 12 topics) is captured.
+
+    Returns:
+        Number of new pages
+    """
+    from benchmarks.bench_e2e import SHAPES, _shape_config
+    from src.config_loader import get_school_types
+    from src.http_engine import HttpFormFiller
+    from src.logger_config import setup_logger
+    from src.survey_stub import SurveyStubServer
+
+    corpus = PageCorpus.shared(corpus_dir)
+    before = len(corpus)
+    logger = setup_logger(name='bench_corpus', log_to_file=False)
+
+    server = SurveyStubServer(port=0).start()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for shape in SHAPES:
+                config = dict(_shape_config(shape), code=f"CAPTURE-{shape}")
+                config_path = Path(tmp) / f"{shape}.json"
+                config_path.write_text(json.dumps(config, ensure_ascii=False), encoding='utf-8')
+
+                # The survey shows the sections of the shape's school types only
+                server.register_token(config['code'], get_school_types(config))
+                HttpFormFiller(str(config_path), form_url=server.url, logger=logger, capture_dir=corpus_dir).run()
+    finally:
+        server.stop()
+
+    return len(corpus) - before
+
+
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Regressions of a report against a baseline report of the same engine
+
+    A page type regresses when its median replay time grew by more than
+    `tolerance` (relative); the whole pass likewise.
+
+    Returns:
+        Human readable regression messages (empty when none)
+    """
+    if baseline.get('engine') != report['engine']:
+        return [f"baseline engine is {baseline.get('engine')}, report engine is {report['engine']}"]
+
+    regressions = []
+    for page_type, stats in report['by_type'].items():
+        base = baseline.get('by_type', {}).get(page_type)
+        if base and stats['p50_ms'] > base['p50_ms'] * (1 + tolerance):
+            regressions.append(f"{page_type}: p50 {base['p50_ms']:.3f} ms → {stats['p50_ms']:.3f} ms")
+
+    if baseline.get('pass_ms') and report['pass_ms'] > baseline['pass_ms'] * (1 + tolerance):
+        regressions.append(f"corpus pass {baseline['pass_ms']:.1f} ms → {report['pass_ms']:.1f} ms")
+
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Replay detection and fill scripts on the captured page corpus')
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS, help='Corpus directory (default: %(default)s)')
+    parser.add_argument('--engine', choices=ENGINES, default='browser', help='Replay engine (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=3, help='Passes over the corpus (best time is reported)')
+    parser.add_argument('--bulk-fill', action='store_true', help='Run the fill scripts in bulk mode')
+    parser.add_argument('--headed', action='store_true', help='Show the browser')
+    parser.add_argument('--capture-stub', action='store_true', help='First capture all stub page variants into the corpus')
+    parser.add_argument('--output', help='Write the JSON report here')
+    parser.add_argument('--baseline', help='Compare against this baseline JSON report')
+    parser.add_argument('--save-baseline', help='Also write the report as a new baseline here')
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.25,
+        help='Allowed relative slowdown before a page type counts as regression (default: %(default)s)'
+    )
+    args = parser.parse_args(argv)
+
+    if args.capture_stub:
+        print(f"Captured {capture_stub(args.corpus)} new page(s) from the survey stub")
+
+    corpus = PageCorpus(args.corpus)
+    if not len(corpus):
+        print(f"❌ Corpus {corpus.dir} is empty (capture with --capture-dir or --capture-stub)")
+        return 1
+
+    report = run_corpus(corpus, args.engine, max(1, args.repeat), headless=not args.headed, bulk=args.bulk_fill)
+
+    print(f"{report['pages']} pages from {report['corpus']} ({report['engine']} engine), "
+          f"best pass {report['pass_ms']:.1f} ms")
+    for page_type, stats in report['by_type'].items():
+        print(f"  {page_type:<14} {stats['pages']:>4} pages  p50={stats['p50_ms']:8.3f} ms  max={stats['max_ms']:8.3f} ms")
+
+    for target in (args.output, args.save_baseline):
+        if target:
+            Path(target).parent.mkdir(parents=True, exist_ok=True)
+            Path(target).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+            print(f"Report written to {target}")
+
+    status = 0
+
+    if report['failures']:
+        print(f"\n❌ {len(report['failures'])} page(s) no longer behave as captured:")
+        for failure in report['failures']:
+            print(f"  - {failure['id']} ({failure['page_type']} {failure['activity_code'] or ''}): {'; '.join(failure['problems'])}")
+        status = 1
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+        regressions = compare_to_baseline(report, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) against {args.baseline}:")
+            for message in regressions:
+                print(f"  - {message}")
+            return 1
+        print(f"\n✅ No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,341 @@
+"""
+End-to-end benchmark: surveys per minute and per-phase latency
+
+Drives AsyncFormFiller through a ContextPool against the local survey stub
+(src.survey_stub) for a matrix of config shapes × concurrency levels and
+reports p50/p95 survey latency, throughput and the time split across
+login, detection, fill and navigation. With --bulk-fill the fillers run one
+ExpressionManager recalculation per page (compare MS_WIDE with and without).
+
+Usage:
+    python -m benchmarks.bench_e2e
+    python -m benchmarks.bench_e2e --concurrency 1,4,8 --surveys 16 --latency 0.05
+    python -m benchmarks.bench_e2e --output bench.json --save-baseline benchmarks/baselines/e2e.json
+    python -m benchmarks.bench_e2e --baseline benchmarks/baselines/e2e.json --tolerance 0.2
+    python -m benchmarks.bench_e2e --shapes MS_WIDE --bulk-fill
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import platform
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from playwright.async_api import async_playwright
+
+from src.async_form_filler import AsyncFormFiller
+from src.browser_pool import ContextPool
+from src.resource_policy import ResourcePolicy
+from src.survey_pages import TOPIC_LABELS
+from src.survey_stub import SurveyStubServer
+
+
+PHASES = ('login', 'detection', 'fill', 'navigation')
+
+
+def _year_counts(base: int) -> Dict[str, int]:
+    return {"2022-2023": base, "2023-2024": base + 2, "2024-2025": base + 4}
+
+
+def _shape_config(shape: str) -> Dict[str, Any]:
+    """
+    JSON configuration (without code) for one benchmark shape
+
+    Shapes:
+        MS, ZS, SD: one school type with 3 topics per activity
+        ALL: all three school types
+        MS_WIDE: MŠ with all 12 topics (largest checkbox/table pages)
+    """
+    topics = TOPIC_LABELS if shape == 'MS_WIDE' else TOPIC_LABELS[:3]
+    school_types = ['MS', 'ZS', 'SD'] if shape == 'ALL' else [shape.split('_')[0]]
+
+    config: Dict[str, Any] = {"school_name": f"Benchmark {shape}", "dvpp_topics": {}, "sdp_zzor": {}}
+
+    if 'MS' in school_types:
+        config['MS'] = 40
+        config['dvpp_topics']['vzdělávání_MŠ_1_I_4'] = list(topics)
+        config['sdp_zzor']['1.I/6 Inovativní vzdělávání dětí v MŠ'] = {t: _year_counts(5) for t in topics}
+    if 'ZS' in school_types:
+        config['ZS'] = 250
+        config['dvpp_topics']['vzdělávání_ZŠ_1_II_7'] = list(topics)
+        config['sdp_zzor']['1.II/9 Inovativní vzdělávání žáků v ZŠ'] = {t: _year_counts(20) for t in topics}
+    if 'SD' in school_types:
+        config['SD'] = 60
+        config['dvpp_topics']['vzdělávání_ŠD_ŠK_1_V_1'] = list(topics)
+        config['sdp_zzor']['1.V/3 Inovativní vzdělávání účastníků zájmového vzdělávání v ŠD/ŠK'] = {
+            t: _year_counts(8) for t in topics
+        }
+
+    return config
+
+
+SHAPES = ('MS', 'ZS', 'SD', 'ALL', 'MS_WIDE')
+
+
+def percentile(values: List[float], p: float) -> float:
+    """
+    Nearest-rank percentile
+
+    Examples:
+        >>> percentile([1.0, 2.0, 3.0, 4.0], 50)
+        2.0
+        >>> percentile([1.0, 2.0, 3.0, 4.0], 95)
+        4.0
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+async def _run_cell(
+    playwright,
+    server: SurveyStubServer,
+    work_dir: Path,
+    shape: str,
+    concurrency: int,
+    surveys: int,
+    block_resources: bool,
+    bulk_fill: bool,
+    headless: bool,
+    logger: logging.Logger
+) -> Dict[str, Any]:
+    """Run `surveys` surveys of one shape with `concurrency` contexts"""
+    config = _shape_config(shape)
+    school_types = [st for st in ('MS', 'ZS', 'SD') if config.get(st, 0) > 0]
+
+    config_paths = []
+    for index in range(surveys):
+        token = f"bench-{shape}-{concurrency}-{index}".lower()
+        server.register_token(token, school_types)
+        path = work_dir / f"{token}.json"
+        path.write_text(json.dumps(dict(config, code=token), ensure_ascii=False), encoding='utf-8')
+        config_paths.append((token, path))
+
+    policy = ResourcePolicy(server.url) if block_resources else None
+    pool = ContextPool(
+        playwright,
+        size=concurrency,
+        headless=headless,
+        clear_origins=[server.url],
+        logger=logger,
+        on_context_created=policy.install_async if policy else None
+    )
+    await pool.start()
+
+    latencies: List[float] = []
+    phase_totals = {phase: 0.0 for phase in PHASES}
+    fill_modes = Counter()
+    failures = 0
+
+    async def one(path: Path) -> None:
+        nonlocal failures
+        filler = AsyncFormFiller(str(path), logger=logger, form_url=server.url, bulk_fill=bulk_fill)
+        async with pool.acquire() as context:
+            start = time.perf_counter()
+            success = await filler.run_in_context(context)
+            latencies.append(time.perf_counter() - start)
+        if not success:
+            failures += 1
+        for phase in PHASES:
+            phase_totals[phase] += filler.phase_times.get(phase, 0.0)
+        fill_modes.update(filler.fill_modes)
+
+    wall_start = time.perf_counter()
+    try:
+        await asyncio.gather(*(one(path) for _, path in config_paths))
+    finally:
+        await pool.close()
+    wall = time.perf_counter() - wall_start
+
+    completed = sum(1 for token, _ in config_paths if token in server.completed)
+    phase_sum = sum(phase_totals.values()) or 1.0
+
+    return {
+        'shape': shape,
+        'concurrency': concurrency,
+        'surveys': surveys,
+        'completed': completed,
+        'failed': max(failures, surveys - completed),
+        'wall_s': round(wall, 3),
+        'p50_s': round(percentile(latencies, 50), 3),
+        'p95_s': round(percentile(latencies, 95), 3),
+        'surveys_per_min': round(completed / wall * 60, 2) if wall else 0.0,
+        'phases_mean_s': {phase: round(total / surveys, 4) for phase, total in phase_totals.items()},
+        'phases_share': {phase: round(total / phase_sum, 3) for phase, total in phase_totals.items()},
+        'fill_modes': dict(fill_modes),
+    }
+
+
+async def run_matrix(
+    shapes: List[str],
+    concurrency_levels: List[int],
+    surveys: int,
+    latency: float,
+    jitter: float,
+    block_resources: bool,
+    bulk_fill: bool = False,
+    headless: bool = True
+) -> Dict[str, Any]:
+    """
+    Run every shape × concurrency cell against a fresh in-process stub
+
+    Returns:
+        Report dict with 'meta' and 'results' (one entry per cell)
+    """
+    logger = logging.getLogger('bench_e2e')
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+
+    server = SurveyStubServer(latency=latency, jitter=jitter).start()
+    results = []
+
+    try:
+        with tempfile.TemporaryDirectory(prefix='bench_e2e_') as tmp:
+            async with async_playwright() as p:
+                for shape in shapes:
+                    for concurrency in concurrency_levels:
+                        cell = await _run_cell(
+                            p, server, Path(tmp), shape, concurrency, surveys, block_resources, bulk_fill, headless, logger
+                        )
+                        results.append(cell)
+                        print(_format_row(cell), flush=True)
+    finally:
+        server.stop()
+
+    return {
+        'meta': {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'surveys_per_cell': surveys,
+            'latency_s': latency,
+            'jitter_s': jitter,
+            'block_resources': block_resources,
+            'bulk_fill': bulk_fill,
+        },
+        'results': results,
+    }
+
+
+def _format_row(cell: Dict[str, Any]) -> str:
+    share = cell['phases_share']
+    split = " ".join(f"{phase}={share[phase] * 100:4.1f}%" for phase in PHASES)
+    return (
+        f"{cell['shape']:<8} c={cell['concurrency']:<3} "
+        f"done={cell['completed']}/{cell['surveys']:<4} "
+        f"p50={cell['p50_s']:6.2f}s p95={cell['p95_s']:6.2f}s "
+        f"{cell['surveys_per_min']:7.1f}/min  {split}"
+    )
+
+
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Regressions of a report against a baseline report
+
+    A cell regresses when its p95 latency grew, or its throughput dropped,
+    by more than `tolerance` (relative), or when it completed fewer surveys.
+
+    Returns:
+        Human readable regression messages (empty when none)
+    """
+    previous = {(cell['shape'], cell['concurrency']): cell for cell in baseline.get('results', [])}
+    regressions = []
+
+    for cell in report['results']:
+        base = previous.get((cell['shape'], cell['concurrency']))
+        if base is None:
+            continue
+
+        label = f"{cell['shape']} c={cell['concurrency']}"
+
+        if cell['p95_s'] > base['p95_s'] * (1 + tolerance):
+            regressions.append(f"{label}: p95 {base['p95_s']:.2f}s → {cell['p95_s']:.2f}s")
+        if cell['surveys_per_min'] < base['surveys_per_min'] * (1 - tolerance):
+            regressions.append(
+                f"{label}: throughput {base['surveys_per_min']:.1f} → {cell['surveys_per_min']:.1f} surveys/min"
+            )
+        if cell['completed'] / cell['surveys'] < base['completed'] / base['surveys']:
+            regressions.append(f"{label}: completed {cell['completed']}/{cell['surveys']}")
+
+    return regressions
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(',') if item.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='End-to-end survey benchmark against the local stub')
+    parser.add_argument(
+        '--shapes',
+        default=','.join(SHAPES),
+        help='Config shapes, comma separated (default: %(default)s)'
+    )
+    parser.add_argument('--concurrency', default='1,4,8', help='Concurrency levels (default: %(default)s)')
+    parser.add_argument('--surveys', type=int, default=8, help='Surveys per cell (default: %(default)s)')
+    parser.add_argument('--latency', type=float, default=0.0, help='Stub latency per request in seconds')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Random extra stub latency up to N seconds')
+    parser.add_argument('--block-resources', action='store_true', help='Install the ResourcePolicy on contexts')
+    parser.add_argument('--bulk-fill', action='store_true', help='One ExpressionManager recalculation per page')
+    parser.add_argument('--headed', action='store_true', help='Show the browsers')
+    parser.add_argument('--output', help='Write the JSON report here')
+    parser.add_argument('--baseline', help='Compare against this baseline JSON report')
+    parser.add_argument('--save-baseline', help='Also write the report as a new baseline here')
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.15,
+        help='Allowed relative slowdown before a cell counts as regression (default: %(default)s)'
+    )
+    args = parser.parse_args(argv)
+
+    shapes = [shape.strip().upper() for shape in args.shapes.split(',') if shape.strip()]
+    unknown = [shape for shape in shapes if shape not in SHAPES]
+    if unknown:
+        parser.error(f"unknown shapes: {', '.join(unknown)} (choose from {', '.join(SHAPES)})")
+
+    report = asyncio.run(run_matrix(
+        shapes,
+        _int_list(args.concurrency),
+        args.surveys,
+        args.latency,
+        args.jitter,
+        args.block_resources,
+        bulk_fill=args.bulk_fill,
+        headless=not args.headed
+    ))
+
+    for target in (args.output, args.save_baseline):
+        if target:
+            Path(target).parent.mkdir(parents=True, exist_ok=True)
+            Path(target).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+            print(f"Report written to {target}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+        regressions = compare_to_baseline(report, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) against {args.baseline}:")
+            for message in regressions:
+                print(f"  - {message}")
+            return 1
+        print(f"\n✅ No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+    if any(cell['failed'] for cell in report['results']):
+        print("\n⚠️  Some surveys did not complete (see 'failed' in the report)")
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
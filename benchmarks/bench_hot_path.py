@@ -0,0 +1,426 @@
+"""
+Hot path microbenchmark: text normalization and page detection
+
+Times the pure-Python functions every survey step goes through -
+normalize_czech_text, normalize_for_checkbox_matching, extract_activity_code
+and detect_question_type - on a synthetic corpus of Czech question texts and
+checkbox labels built from the known survey pages (src.survey_pages) with
+the noise real pages have: extra whitespace and non-breaking spaces, help
+text, numbering, case and missing diacritics, plus questions the detector
+must not recognize.
+
+Timing runs in --repeat interleaved rounds: every round times a fixed
+calibration workload and then one pass of every case, so a slow moment of
+the machine slows both. Each case reports its median ns per call and its
+median time relative to the calibration pass of the same round, with the
+interquartile spread of that ratio across rounds. Measured separately under
+tracemalloc, it also reports the peak bytes allocated during one call and
+the bytes still held afterwards (cache growth). Cached functions run 'cold'
+(distinct texts, cache cleared before each pass) and 'warm' (the known page
+texts, already cached, as in a long batch).
+
+The detector must also agree with the known page type of every synthetic
+variant; disagreements fail the run.
+
+Usage:
+    python -m benchmarks.bench_hot_path
+    python -m benchmarks.bench_hot_path --questions 20000 --labels 20000 --repeat 21
+    python -m benchmarks.bench_hot_path --save-baseline benchmarks/baselines/hot_path.json
+    python -m benchmarks.bench_hot_path --baseline benchmarks/baselines/hot_path.json --tolerance 0.25
+"""
+
+import argparse
+import hashlib
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+import unicodedata
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.question_detector import detect_question_type
+from src.survey_pages import COMPLETION_TEXT, TOPIC_LABELS, survey_pages_for
+from src.text_normalizer import (
+    extract_activity_code,
+    normalize_czech_text,
+    normalize_for_checkbox_matching
+)
+
+
+# Noise seen around question texts on real LimeSurvey pages
+PREFIXES = ("", "", "", "{n}. ", "Otázka {n}: ", "* ", "{n}) ")
+SUFFIXES = (
+    "",
+    "",
+    " Uveďte počet za každý školní rok.",
+    " Pokud se aktivita v daném roce nerealizovala, uveďte 0.",
+    " (povinná otázka)",
+    " Hodnoty za školní rok 2025/2026 nevyplňujte.",
+    " Vyberte všechny odpovídající možnosti.",
+)
+SPACES = ("  ", "\n", "\xa0", "\t", " \n ")
+
+# Building blocks of questions the detector must not recognize
+UNKNOWN_SUBJECTS = (
+    "učitelů", "asistentů pedagoga", "rodičů", "žáků se speciálními vzdělávacími potřebami",
+    "dětí v přípravné třídě", "mentorů", "externích odborníků", "studentů pedagogických fakult",
+)
+UNKNOWN_QUESTIONS = (
+    "Kolik {subject} se zapojilo do projektových dnů v roce {year}?",
+    "Jaký byl průměrný počet hodin podpory {subject} za měsíc?",
+    "{code} Sdílení zkušeností {subject} – kolik setkání proběhlo?",
+    "Popište, jak projekt ovlivnil spolupráci {subject} se školou.",
+)
+UNKNOWN_CODES = ("2.III/5", "1.IV/2", "3.I/9", "1.VI/4", "")
+
+LABEL_SUFFIXES = ("", "", " (nepovinné)", " (např. workshopy, kurzy)", " *")
+
+
+def strip_diacritics(text: str) -> str:
+    """Text as typed without diacritics (case kept)"""
+    return ''.join(c for c in unicodedata.normalize('NFD', text) if unicodedata.category(c) != 'Mn')
+
+
+def _noisy_spaces(rng: random.Random, text: str) -> str:
+    words = text.split(' ')
+    return ''.join(
+        word + (rng.choice(SPACES) if rng.random() < 0.1 else ' ')
+        for word in words
+    ).rstrip()
+
+
+def _variant(rng: random.Random, text: str, n: int) -> str:
+    """One noisy rendering of a question text"""
+    text = rng.choice(PREFIXES).format(n=n) + text + rng.choice(SUFFIXES)
+    text = _noisy_spaces(rng, text)
+    roll = rng.random()
+    if roll < 0.10:
+        text = strip_diacritics(text)
+    elif roll < 0.15:
+        text = text.upper()
+    return text
+
+
+def _unknown_question(rng: random.Random) -> str:
+    return rng.choice(UNKNOWN_QUESTIONS).format(
+        subject=rng.choice(UNKNOWN_SUBJECTS),
+        year=rng.choice(("2022/2023", "2023/2024", "2024/2025")),
+        code=rng.choice(UNKNOWN_CODES),
+    )
+
+
+def _label_variant(rng: random.Random, label: str, n: int) -> str:
+    """One noisy rendering of a checkbox label"""
+    label = label + rng.choice(LABEL_SUFFIXES)
+    if rng.random() < 0.3:
+        label = f"{n % 12 + 1}. {label}"
+    label = _noisy_spaces(rng, label)
+    roll = rng.random()
+    if roll < 0.10:
+        label = strip_diacritics(label)
+    elif roll < 0.20:
+        label = label.capitalize()
+    return label
+
+
+def known_texts() -> List[str]:
+    """Question texts of every known survey page, plus the completion text"""
+    return [page.question_text for page in survey_pages_for(['MS', 'ZS', 'SD'])] + [COMPLETION_TEXT]
+
+
+def synthetic_corpus(questions: int, labels: int, seed: int) -> Dict[str, Any]:
+    """
+    Question texts (with the page type the detector must find) and checkbox labels
+
+    About one question in ten is an unknown question (expected None).
+
+    Returns:
+        {'questions': [text], 'expected': [(page_type, activity_code) | None], 'labels': [text]}
+    """
+    rng = random.Random(seed)
+    bases = [(text, detect_question_type(text)) for text in known_texts()]
+
+    corpus: Dict[str, Any] = {'questions': [], 'expected': [], 'labels': []}
+    for n in range(questions):
+        if rng.random() < 0.1:
+            corpus['questions'].append(_unknown_question(rng))
+            corpus['expected'].append(None)
+            continue
+        text, info = rng.choice(bases)
+        corpus['questions'].append(_variant(rng, text, n))
+        corpus['expected'].append((info.page_type, info.activity_code))
+
+    for n in range(labels):
+        corpus['labels'].append(_label_variant(rng, rng.choice(TOPIC_LABELS), n))
+
+    return corpus
+
+
+def corpus_digest(corpus: Dict[str, Any]) -> str:
+    payload = json.dumps([corpus['questions'], corpus['labels']], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:12]
+
+
+def check_detection(corpus: Dict[str, Any]) -> List[str]:
+    """Synthetic questions the detector classifies differently from their source page"""
+    mismatches = []
+    for text, expected in zip(corpus['questions'], corpus['expected']):
+        info = detect_question_type(text)
+        got = (info.page_type, info.activity_code) if info else None
+        if got != expected:
+            mismatches.append(f"{text[:80]!r}: expected {expected}, got {got}")
+    return mismatches
+
+
+def pass_ns(fn: Callable[[str], Any], inputs: List[str], cold: bool) -> int:
+    """
+    Time one pass over the inputs (loop overhead included)
+
+    Cold passes start from an empty normalization cache, warm passes from
+    one filled by an untimed pass right before.
+    """
+    normalize_czech_text.cache_clear()
+    if not cold:
+        for text in inputs:
+            fn(text)
+
+    start = time.perf_counter_ns()
+    for text in inputs:
+        fn(text)
+    return time.perf_counter_ns() - start
+
+
+def allocations(fn: Callable[[str], Any], inputs: List[str], cold: bool) -> Tuple[float, float]:
+    """
+    Memory behaviour per call, under tracemalloc
+
+    Returns:
+        (peak bytes allocated during a call, bytes still held after it), averaged
+    """
+    normalize_czech_text.cache_clear()
+    if not cold:
+        for text in inputs:
+            fn(text)
+
+    tracemalloc.start()
+    try:
+        peak_total = 0
+        start_current, _ = tracemalloc.get_traced_memory()
+        for text in inputs:
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            fn(text)
+            _, peak = tracemalloc.get_traced_memory()
+            peak_total += peak - before
+        end_current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak_total / len(inputs), (end_current - start_current) / len(inputs)
+
+
+def _calibration(text: str) -> int:
+    """Fixed pure-Python workload the timings are related to"""
+    return len(text.lower().split(' '))
+
+
+def _spread(values: List[float]) -> float:
+    """Interquartile range relative to the median"""
+    if len(values) < 4:
+        return 0.0
+    q1, median, q3 = statistics.quantiles(values, n=4)
+    return (q3 - q1) / median if median else 0.0
+
+
+def run_suite(corpus: Dict[str, Any], rounds: int, alloc_sample: int) -> Tuple[float, List[Dict[str, Any]]]:
+    """
+    Time and measure every (function, variant) case
+
+    Returns:
+        (median calibration ns per call, results per case)
+    """
+    texts = corpus['questions'] + corpus['labels']
+    # Same number of calls as the cold case, over the few texts a batch repeats
+    known = known_texts()
+    warm_texts = (known * (len(corpus['questions']) // len(known) + 1))[:len(corpus['questions'])]
+
+    cases = (
+        ('normalize_czech_text', 'cold', normalize_czech_text, texts, True),
+        ('normalize_czech_text', 'warm', normalize_czech_text, warm_texts, False),
+        ('normalize_for_checkbox_matching', 'cold', normalize_for_checkbox_matching, corpus['labels'], True),
+        ('extract_activity_code', '-', extract_activity_code, corpus['questions'], False),
+        ('detect_question_type', 'cold', detect_question_type, corpus['questions'], True),
+        ('detect_question_type', 'warm', detect_question_type, warm_texts, False),
+    )
+
+    calibration: List[float] = []
+    timings: List[List[float]] = [[] for _ in cases]
+    ratios: List[List[float]] = [[] for _ in cases]
+
+    for _ in range(rounds):
+        calibration_round = pass_ns(_calibration, corpus['questions'], cold=False) / len(corpus['questions'])
+        calibration.append(calibration_round)
+        for i, (_, _, fn, inputs, cold) in enumerate(cases):
+            ns = pass_ns(fn, inputs, cold) / len(inputs)
+            timings[i].append(ns)
+            ratios[i].append(ns / calibration_round)
+
+    results = []
+    for i, (name, variant, fn, inputs, cold) in enumerate(cases):
+        peak, retained = allocations(fn, inputs[:alloc_sample], cold)
+        results.append({
+            'function': name,
+            'variant': variant,
+            'calls': len(inputs),
+            'ns_per_call': round(statistics.median(timings[i]), 1),
+            'ratio': round(statistics.median(ratios[i]), 4),
+            'spread': round(_spread(ratios[i]), 4),
+            'peak_bytes_per_call': round(peak, 1),
+            'retained_bytes_per_call': round(retained, 1),
+        })
+
+    return statistics.median(calibration), results
+
+
+# A timing regression must exceed this many interquartile spreads of the
+# case's ratio (the larger of baseline and current run), and --tolerance
+SPREAD_FACTOR = 3.0
+
+
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Regressions of a report against a baseline report
+
+    Timing compares each case's median time relative to the calibration
+    workload (the same-round ratio), so machine speed and load cancel out.
+    It regresses when the ratio grew by more than `tolerance` and by more
+    than SPREAD_FACTOR times its run-to-run spread. Peak/retained bytes per
+    call regress when they grew by more than `tolerance` and 16 bytes
+    (allocation sizes are near-deterministic).
+
+    Returns:
+        Human readable regression messages (empty when none)
+    """
+    previous = {(case['function'], case['variant']): case for case in baseline.get('results', [])}
+    regressions = []
+
+    if baseline.get('corpus') != report['corpus']:
+        regressions.append(
+            f"corpus differs from the baseline ({baseline.get('corpus')} → {report['corpus']}); "
+            f"rerun with the baseline's --questions/--labels/--seed"
+        )
+        return regressions
+
+    for case in report['results']:
+        base = previous.get((case['function'], case['variant']))
+        if base is None:
+            continue
+
+        label = f"{case['function']} ({case['variant']})"
+
+        if 'ratio' not in base:
+            regressions.append(f"{label}: baseline has no calibration ratio, save it again with --save-baseline")
+            continue
+
+        allowed = max(tolerance, SPREAD_FACTOR * max(base['spread'], case['spread']))
+        if case['ratio'] > base['ratio'] * (1 + allowed):
+            regressions.append(
+                f"{label}: {base['ratio']:.2f} → {case['ratio']:.2f} × calibration "
+                f"(+{case['ratio'] / base['ratio'] - 1:.0%}, allowed +{allowed:.0%}; "
+                f"{base['ns_per_call']:.0f} → {case['ns_per_call']:.0f} ns/call)"
+            )
+        for key, what in (('peak_bytes_per_call', 'peak'), ('retained_bytes_per_call', 'retained')):
+            if case[key] > base[key] * (1 + tolerance) and case[key] - base[key] > 16:
+                regressions.append(f"{label}: {what} {base[key]:.0f} → {case[key]:.0f} B/call")
+
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Microbenchmark of text normalization and page detection')
+    parser.add_argument('--questions', type=int, default=10000, help='Synthetic question texts (default: %(default)s)')
+    parser.add_argument('--labels', type=int, default=10000, help='Synthetic checkbox labels (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=0, help='Corpus seed (default: %(default)s)')
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=15,
+        help='Interleaved timing rounds (medians are reported, default: %(default)s)'
+    )
+    parser.add_argument(
+        '--alloc-sample',
+        type=int,
+        default=2000,
+        help='Calls measured under tracemalloc per case (default: %(default)s)'
+    )
+    parser.add_argument('--output', help='Write the JSON report here')
+    parser.add_argument('--baseline', help='Compare against this baseline JSON report')
+    parser.add_argument('--save-baseline', help='Also write the report as a new baseline here')
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.25,
+        help='Allowed relative growth before a case counts as regression (default: %(default)s)'
+    )
+    args = parser.parse_args(argv)
+
+    corpus = synthetic_corpus(args.questions, args.labels, args.seed)
+
+    mismatches = check_detection(corpus)
+    if mismatches:
+        print(f"FAIL: detector disagrees on {len(mismatches)} synthetic questions, e.g.:")
+        for message in mismatches[:5]:
+            print(f"  - {message}")
+        return 1
+    print(f"Detection: {len(corpus['questions'])} synthetic questions classified as their source page")
+
+    report = {
+        'generated': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'corpus': corpus_digest(corpus),
+        'questions': args.questions,
+        'labels': args.labels,
+        'seed': args.seed,
+        'rounds': max(1, args.repeat),
+    }
+    calibration, report['results'] = run_suite(corpus, report['rounds'], max(1, args.alloc_sample))
+    report['calibration_ns'] = round(calibration, 1)
+
+    print(f"\nCalibration: {report['calibration_ns']:.0f} ns/call (median of {report['rounds']} rounds)")
+    print(
+        f"{'function':<32} {'variant':<5} {'calls':>7} {'ns/call':>9} {'×calib':>7} {'spread':>7} "
+        f"{'peak B':>8} {'held B':>8}"
+    )
+    for case in report['results']:
+        print(
+            f"{case['function']:<32} {case['variant']:<5} {case['calls']:>7} "
+            f"{case['ns_per_call']:>9.0f} {case['ratio']:>7.2f} {case['spread']:>7.1%} "
+            f"{case['peak_bytes_per_call']:>8.0f} {case['retained_bytes_per_call']:>8.0f}"
+        )
+
+    for target in (args.output, args.save_baseline):
+        if target:
+            Path(target).parent.mkdir(parents=True, exist_ok=True)
+            Path(target).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+            print(f"Report written to {target}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+        regressions = compare_to_baseline(report, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) against {args.baseline}:")
+            for message in regressions:
+                print(f"  - {message}")
+            return 1
+        print(f"\n✅ No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""
+Text normalizer benchmark: equivalence and speed of normalize_czech_text
+
+First checks that normalize_czech_text gives exactly the output of the
+reference implementation (_normalize_czech_text_reference) on randomized
+texts: Czech letters, other Latin/Greek/Cyrillic letters, combining marks,
+Unicode whitespace and random code points. Then times both on large page
+texts built from the survey stub pages, cold (empty cache) and warm.
+
+Usage:
+    python -m benchmarks.bench_text_normalizer
+    python -m benchmarks.bench_text_normalizer --cases 100000 --seed 7
+    python -m benchmarks.bench_text_normalizer --page-kb 64 --repeat 50
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from typing import Callable, List
+
+from src.survey_pages import TOPIC_LABELS
+from src.text_normalizer import (
+    normalize_czech_text,
+    normalize_many,
+    _normalize_czech_text_reference
+)
+
+
+# Building blocks for randomized texts; heavy on what LimeSurvey pages contain
+ALPHABETS = [
+    'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789./-()',
+    'áčďéěíňóřšťúůýžÁČĎÉĚÍŇÓŘŠŤÚŮÝŽ',
+    'äöüßàâçèêëîïôùûÿñåøæœÄÖÜÀÇÈÑÅØÆŒ',
+    'αβγδεσςΣΑΒΓΔΕΩάέήίόύώΆΈΉΊΌΎΏ',
+    'абвгдеёжзийклмнопрстуфхцчшщъыьэюяЁЙ',
+    'İıǅǈǋﬁﬂ',
+    'ְཱི̧̨̣̀́̌̊ͅ',
+    ' \t\n\r\f\v\xa0     　\x1c\x1f\x85',
+    '가각힣ㄱㅏ',
+    '\U0001d165\U0001d166\U0001d16dำຳཷཹ',
+]
+
+
+def random_text(rng: random.Random, max_len: int = 40) -> str:
+    """One random text mixing the alphabets and arbitrary code points"""
+    chars = []
+    for _ in range(rng.randint(0, max_len)):
+        if rng.random() < 0.05:
+            chars.append(chr(rng.randint(0, 0x2FFFF)))
+        else:
+            chars.append(rng.choice(rng.choice(ALPHABETS)))
+    return ''.join(chars)
+
+
+def check_equivalence(cases: int, seed: int) -> List[str]:
+    """
+    Compare the fast and reference implementations on random texts
+
+    Returns:
+        Inputs whose outputs differ (empty when equivalent)
+    """
+    rng = random.Random(seed)
+    texts = [random_text(rng) for _ in range(cases)]
+    texts += TOPIC_LABELS + [label.upper() for label in TOPIC_LABELS]
+
+    mismatches = [text for text in texts if normalize_czech_text(text) != _normalize_czech_text_reference(text)]
+
+    if normalize_many(texts) != [_normalize_czech_text_reference(text) for text in texts]:
+        mismatches.append('<normalize_many>')
+
+    return mismatches
+
+
+def page_texts(count: int, size_kb: int, seed: int) -> List[str]:
+    """Distinct whole-page texts of about size_kb KiB each"""
+    rng = random.Random(seed)
+    texts = []
+    for i in range(count):
+        parts = [f"Stránka {i}: Kolik dětí/žáků se v jednotlivých letech zapojilo do šablony 1.I/4?"]
+        while sum(len(part) for part in parts) < size_kb * 1024:
+            label = rng.choice(TOPIC_LABELS)
+            parts.append(rng.choice([label, label.upper(), f"  {label}\n\t"]))
+        texts.append('\n'.join(parts))
+    return texts
+
+
+def best_time(fn: Callable[[], None], repeat: int) -> float:
+    """Best wall time of repeat runs"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark normalize_czech_text against the reference')
+    parser.add_argument('--cases', type=int, default=20000, help='Random texts for the equivalence check')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    parser.add_argument('--pages', type=int, default=20, help='Distinct page texts to time')
+    parser.add_argument('--page-kb', type=int, default=16, help='Size of each page text in KiB')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing repetitions (best is reported)')
+    args = parser.parse_args()
+
+    mismatches = check_equivalence(args.cases, args.seed)
+    if mismatches:
+        print(f"FAIL: {len(mismatches)} inputs differ from the reference, e.g. {mismatches[:3]!r}")
+        return 1
+    print(f"Equivalence: {args.cases} random texts identical to the reference")
+
+    pages = page_texts(args.pages, args.page_kb, args.seed)
+    ascii_pages = [re.sub(r'[^\x00-\x7f]', 'a', page) for page in pages]
+
+    def cold(texts):
+        def run():
+            normalize_czech_text.cache_clear()
+            for text in texts:
+                normalize_czech_text(text)
+        return run
+
+    def warm(texts):
+        def run():
+            for text in texts:
+                normalize_czech_text(text)
+        return run
+
+    def reference(texts):
+        def run():
+            for text in texts:
+                _normalize_czech_text_reference(text)
+        return run
+
+    print(f"{args.pages} pages × {args.page_kb} KiB, best of {args.repeat}:")
+    for name, texts in (('czech', pages), ('ascii', ascii_pages)):
+        ref = best_time(reference(texts), args.repeat)
+        fast = best_time(cold(texts), args.repeat)
+        cached = best_time(warm(texts), args.repeat)
+        print(
+            f"  {name:<6} reference {ref * 1000:8.2f} ms   "
+            f"table {fast * 1000:8.2f} ms ({ref / fast:5.1f}×)   "
+            f"cached {cached * 1000:8.3f} ms"
+        )
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
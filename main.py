@@ -6,16 +6,444 @@ Automated form completion for educational evaluation surveys
 """
 
 import sys
+import json
+import time
 import argparse
 from pathlib import Path
 
-from src.form_filler import FormFiller
-from src.config_loader import ConfigValidationError
+from src.config_loader import ConfigValidationError, collect_config_paths
+from src.manifest import parse_shard, select_shard
+from src.metrics import write_chrome_trace, write_prometheus
+
+# Browser modules (playwright) are imported by the modes that need them, so
+# 'validate' and 'plan' run without them
+
+
+def validate_main(argv):
+    """Validate CLI entry point: check many config files without a browser"""
+    from src.config_validator import validate_files
+
+    parser = argparse.ArgumentParser(
+        prog='main.py validate',
+        description='LimeSurvey Form Filler - Validate config files before a batch run',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # All configs in a directory, one process per core
+  python main.py validate data/schools/
+
+  # Manifest file, show warnings as well
+  python main.py validate data/wave_2025.txt --warnings
+        """
+    )
+
+    parser.add_argument(
+        'sources',
+        nargs='+',
+        help='Config directories, glob patterns, manifests (.txt) or config files'
+    )
+
+    parser.add_argument(
+        '--processes', '-p',
+        type=int,
+        default=None,
+        help='Worker processes (default: number of CPUs)'
+    )
+
+    parser.add_argument(
+        '--shard',
+        type=parse_shard,
+        help='Only process shard I of N (round-robin over all configs/records, e.g. 0/4), '
+             'to split one wave across machines'
+    )
+
+    parser.add_argument(
+        '--warnings',
+        action='store_true',
+        help='Also list warnings of valid files'
+    )
+
+    args = parser.parse_args(argv)
+
+    try:
+        config_paths = collect_config_paths(args.sources)
+    except FileNotFoundError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    if args.shard:
+        config_paths = select_shard(config_paths, *args.shard)
+
+    start = time.monotonic()
+    results = validate_files(config_paths, processes=args.processes)
+    duration = time.monotonic() - start
+
+    for result in results:
+        if result.errors:
+            print(f"❌ {result.config_path}")
+            for error in result.errors:
+                print(f"   - {error}")
+        if result.warnings and (args.warnings or result.errors):
+            if not result.errors:
+                print(f"⚠️  {result.config_path}")
+            for warning in result.warnings:
+                print(f"   ~ {warning}")
+
+    invalid = sum(1 for result in results if not result.valid)
+    print(f"\n{len(results) - invalid}/{len(results)} configs valid ({duration:.1f}s)")
+
+    sys.exit(1 if invalid else 0)
+
+
+def plan_main(argv):
+    """Plan CLI entry point: per-page fill plan of many configs without a browser"""
+    from src.plan_preview import plan_files
+
+    parser = argparse.ArgumentParser(
+        prog='main.py plan',
+        description='LimeSurvey Form Filler - Preview what every survey page will get',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Fill plan of one school, readable
+  python main.py plan data/schools/skola.json --pretty
+
+  # Whole wave as JSONL (one config per line), reproducible random counts
+  python main.py plan data/wave_2025.jsonl --seed 1 --out logs/wave_2025.plan.jsonl
+        """
+    )
+
+    parser.add_argument(
+        'sources',
+        nargs='+',
+        help='Config directories, glob patterns, manifests or config files'
+    )
+
+    parser.add_argument(
+        '--out', '-o',
+        help='Write the plans to this JSONL file (default: stdout)'
+    )
+
+    parser.add_argument(
+        '--pretty',
+        action='store_true',
+        help='Indented JSON instead of one line per config'
+    )
+
+    parser.add_argument(
+        '--seed',
+        type=int,
+        help='Seed for the random counts (same seed and access code = same values)'
+    )
+
+    parser.add_argument(
+        '--processes', '-p',
+        type=int,
+        default=None,
+        help='Worker processes (default: number of CPUs)'
+    )
+
+    parser.add_argument(
+        '--shard',
+        type=parse_shard,
+        help='Only process shard I of N (round-robin over all configs/records, e.g. 0/4)'
+    )
+
+    args = parser.parse_args(argv)
+
+    try:
+        config_paths = collect_config_paths(args.sources)
+    except FileNotFoundError as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.shard:
+        config_paths = select_shard(config_paths, *args.shard)
+
+    start = time.monotonic()
+    previews = plan_files(config_paths, processes=args.processes, seed=args.seed)
+    duration = time.monotonic() - start
+
+    indent = 2 if args.pretty else None
+    out = open(args.out, 'w', encoding='utf-8') if args.out else sys.stdout
+    try:
+        for preview in previews:
+            out.write(json.dumps(preview, ensure_ascii=False, indent=indent) + '\n')
+    finally:
+        if args.out:
+            out.close()
+
+    # Summary on stderr, so stdout stays valid JSONL
+    failed = sum(1 for preview in previews if 'error' in preview)
+    warned = sum(1 for preview in previews if preview.get('warnings'))
+    for preview in previews:
+        if 'error' in preview:
+            print(f"❌ {preview['config']}: {preview['error']}", file=sys.stderr)
+    print(
+        f"{len(previews) - failed}/{len(previews)} configs planned, {warned} with warnings "
+        f"({duration * 1000:.0f} ms)",
+        file=sys.stderr
+    )
+
+    sys.exit(1 if failed else 0)
+
+
+def batch_main(argv):
+    """Batch CLI entry point: many school configs through a shared worker pool"""
+    from src.form_filler import FormFiller
+    from src.batch_runner import run_batch, batch_exit_code, export_metrics, ENGINES
+
+    parser = argparse.ArgumentParser(
+        prog='main.py batch',
+        description='LimeSurvey Form Filler - Batch mode for many schools',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # All configs in a directory, 4 parallel browser contexts
+  python main.py batch data/schools/ --workers 4
+
+  # Glob pattern (quote it so the shell does not expand it)
+  python main.py batch "data/schools/*.json"
+
+  # Manifest file with one config path per line
+  python main.py batch data/wave_2025.txt --workers 8
+
+  # One config per line (JSONL or CSV), this machine takes shard 0 of 4
+  python main.py batch data/wave_2025.jsonl --shard 0/4
+
+  # Resumable run: rerun the same command after a crash
+  python main.py batch data/wave_2025.jsonl --checkpoint logs/wave_2025.journal
+
+  # Use every core: 4 processes × 8 contexts
+  python main.py batch data/schools/ --processes 4 --workers 8
+
+  # No browser: post the survey forms over HTTP (Chromium only as a fallback)
+  python main.py batch data/schools/ --engine http --workers 32
+
+  # Slow server: up to 16 surveys, fewer while pages slow down, max 10 requests/s
+  python main.py batch data/schools/ --workers 16 --adaptive --max-rate 10
+
+  # Step timings of all schools: trace timeline + Prometheus histograms
+  python main.py batch data/schools/ --trace-out logs/batch_trace.json --metrics-out logs/batch.prom
+        """
+    )
+
+    parser.add_argument(
+        'sources',
+        nargs='+',
+        help='Config directories, glob patterns, manifests (.txt) or config files'
+    )
+
+    parser.add_argument(
+        '--shard',
+        type=parse_shard,
+        help='Only process shard I of N (round-robin over all configs/records, e.g. 0/4), '
+             'to split one wave across machines'
+    )
+
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=4,
+        help='Number of schools filled in parallel (default: %(default)s)'
+    )
+
+    parser.add_argument(
+        '--processes', '-p',
+        type=int,
+        default=1,
+        help='Shard configs across N worker processes, each with its own browser '
+             'and --workers contexts (default: %(default)s)'
+    )
+
+    parser.add_argument(
+        '--browsers',
+        type=int,
+        default=1,
+        help='Chromium processes per worker process for the async engine (default: %(default)s)'
+    )
+
+    parser.add_argument(
+        '--context-max-uses',
+        type=int,
+        default=20,
+        help='Recycle a pooled browser context after N surveys (default: %(default)s)'
+    )
+
+    parser.add_argument(
+        '--context-max-heap-mb',
+        type=float,
+        default=256,
+        help='Recycle a pooled browser context above this JS heap size (default: %(default)s)'
+    )
+
+    parser.add_argument(
+        '--engine',
+        choices=ENGINES,
+        default='async',
+        help="'async': one shared Chromium with N contexts, "
+             "'threads': one Chromium per worker thread, "
+             "'http': plain HTTP form posts, Chromium only for surveys that need it (default: %(default)s)"
+    )
+
+    parser.add_argument(
+        '--headed',
+        action='store_true',
+        help='Run browser in headed (visible) mode for debugging'
+    )
+
+    parser.add_argument(
+        '--verbose', '-v',
+        action='store_true',
+        help='Enable verbose/debug logging'
+    )
+
+    parser.add_argument(
+        '--url',
+        type=str,
+        help='Survey URL override, e.g. a local stub from "python -m src.survey_stub"'
+    )
+
+    parser.add_argument(
+        '--block-resources',
+        action='store_true',
+        help='Skip images, fonts, stylesheets and third-party requests (faster page loads)'
+    )
+
+    parser.add_argument(
+        '--bulk-fill',
+        action='store_true',
+        help='Set all fields of a page first and run one ExpressionManager recalculation '
+             '(falls back to per-field events automatically)'
+    )
+
+    parser.add_argument(
+        '--detection-cache',
+        type=str,
+        help='JSONL file caching page detection results across runs (e.g. logs/detection_cache.jsonl)'
+    )
+
+    parser.add_argument(
+        '--capture-dir',
+        type=str,
+        help='Save every visited step, anonymized, into this page corpus for offline '
+             'regression checks (see benchmarks/bench_corpus.py)'
+    )
+
+    parser.add_argument(
+        '--plan-cache',
+        type=str,
+        help='Directory caching parsed configs and their compiled fill plans (e.g. logs/plans)'
+    )
+
+    parser.add_argument(
+        '--checkpoint',
+        type=str,
+        help='Journal of per-code progress: rerun with the same file to skip completed codes '
+             'and resume interrupted surveys (e.g. logs/wave.journal)'
+    )
+
+    parser.add_argument(
+        '--adaptive',
+        action='store_true',
+        help='Adapt the number of parallel surveys (up to --workers) to page latency and '
+             'error rate: slow growth, sharp cut when the server is overloaded (async engine)'
+    )
+
+    parser.add_argument(
+        '--latency-target',
+        type=float,
+        help='With --adaptive: page latency in seconds treated as overload '
+             '(default: 2× the best latency seen)'
+    )
+
+    parser.add_argument(
+        '--max-rate',
+        type=float,
+        help='Ceiling of page requests per second for the whole batch (all workers and processes)'
+    )
+
+    parser.add_argument(
+        '--transition-timeout',
+        type=float,
+        default=FormFiller.TRANSITION_TIMEOUT,
+        help='Max seconds to wait for the next survey page (default: %(default)s)'
+    )
+
+    parser.add_argument(
+        '--trace-out',
+        type=str,
+        help='Write per-step timing spans as Chrome trace-event JSON (chrome://tracing, Perfetto)'
+    )
+
+    parser.add_argument(
+        '--metrics-out',
+        type=str,
+        help='Write step and survey durations in Prometheus text format'
+    )
+
+    args = parser.parse_args(argv)
+
+    try:
+        config_paths = collect_config_paths(args.sources)
+    except FileNotFoundError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    if args.shard:
+        config_paths = select_shard(config_paths, *args.shard)
+
+    try:
+        results = run_batch(
+            config_paths,
+            workers=args.workers,
+            headless=not args.headed,
+            verbose=args.verbose,
+            transition_timeout=args.transition_timeout,
+            engine=args.engine,
+            block_resources=args.block_resources,
+            form_url=args.url,
+            bulk_fill=args.bulk_fill,
+            detection_cache=args.detection_cache,
+            plan_cache=args.plan_cache,
+            checkpoint=args.checkpoint,
+            adaptive=args.adaptive,
+            latency_target=args.latency_target,
+            max_rate=args.max_rate,
+            capture_dir=args.capture_dir,
+            processes=args.processes,
+            pool_options={
+                'browsers': args.browsers,
+                'max_uses': args.context_max_uses,
+                'max_heap_mb': args.context_max_heap_mb,
+            }
+        )
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Interrupted by user")
+        sys.exit(130)
+
+    export_metrics(results, trace_out=args.trace_out, metrics_out=args.metrics_out)
+
+    sys.exit(batch_exit_code(results))
 
 
 def main():
     """Main CLI entry point"""
 
+    if len(sys.argv) > 1 and sys.argv[1] == 'batch':
+        batch_main(sys.argv[2:])
+        return
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'validate':
+        validate_main(sys.argv[2:])
+        return
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'plan':
+        plan_main(sys.argv[2:])
+        return
+
+    from src.form_filler import FormFiller
+
     parser = argparse.ArgumentParser(
         description='LimeSurvey Form Filler - Automated form completion',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -33,8 +461,26 @@ Examples:
   # Verbose logging
   python main.py path/to/config.json --verbose
 
+  # Offline run against the local survey stub (python -m src.survey_stub)
+  python main.py path/to/config.json --url http://127.0.0.1:8765/index.php/262621
+
+  # Without a browser (plain HTTP, Chromium only if a page needs it)
+  python main.py path/to/config.json --http
+
   # All options combined
   python main.py path/to/config.json --headed --code XYZ789 --verbose
+
+  # Timeline of every step (open in chrome://tracing or ui.perfetto.dev)
+  python main.py path/to/config.json --trace-out logs/trace.json
+
+  # Batch mode (see: python main.py batch --help)
+  python main.py batch path/to/configs/ --workers 4
+
+  # Check configs without a browser (see: python main.py validate --help)
+  python main.py validate path/to/configs/
+
+  # Per-page fill plan without a browser (see: python main.py plan --help)
+  python main.py plan path/to/config.json --pretty
         """
     )
 
@@ -61,6 +507,77 @@ Examples:
         help='Enable verbose/debug logging'
     )
 
+    parser.add_argument(
+        '--url',
+        type=str,
+        help='Survey URL override, e.g. a local stub from "python -m src.survey_stub"'
+    )
+
+    parser.add_argument(
+        '--block-resources',
+        action='store_true',
+        help='Skip images, fonts, stylesheets and third-party requests (faster page loads)'
+    )
+
+    parser.add_argument(
+        '--bulk-fill',
+        action='store_true',
+        help='Set all fields of a page first and run one ExpressionManager recalculation '
+             '(falls back to per-field events automatically)'
+    )
+
+    parser.add_argument(
+        '--http',
+        action='store_true',
+        help='Post the survey forms over plain HTTP without a browser; '
+             'continues in Chromium if a page needs it'
+    )
+
+    parser.add_argument(
+        '--detection-cache',
+        type=str,
+        help='JSONL file caching page detection results across runs (e.g. logs/detection_cache.jsonl)'
+    )
+
+    parser.add_argument(
+        '--capture-dir',
+        type=str,
+        help='Save every visited step, anonymized, into this page corpus for offline '
+             'regression checks (see benchmarks/bench_corpus.py)'
+    )
+
+    parser.add_argument(
+        '--plan-cache',
+        type=str,
+        help='Directory caching parsed configs and their compiled fill plans (e.g. logs/plans)'
+    )
+
+    parser.add_argument(
+        '--checkpoint',
+        type=str,
+        help='Journal of per-code progress: rerun with the same file to skip completed codes '
+             'and resume interrupted surveys (e.g. logs/wave.journal)'
+    )
+
+    parser.add_argument(
+        '--transition-timeout',
+        type=float,
+        default=FormFiller.TRANSITION_TIMEOUT,
+        help='Max seconds to wait for the next survey page (default: %(default)s)'
+    )
+
+    parser.add_argument(
+        '--trace-out',
+        type=str,
+        help='Write per-step timing spans as Chrome trace-event JSON (chrome://tracing, Perfetto)'
+    )
+
+    parser.add_argument(
+        '--metrics-out',
+        type=str,
+        help='Write step and survey durations in Prometheus text format'
+    )
+
     args = parser.parse_args()
 
     # Validate config file exists
@@ -71,15 +588,35 @@ Examples:
 
     try:
         # Create form filler
-        filler = FormFiller(
+        if args.http:
+            from src.http_engine import HttpFormFiller as filler_class
+        else:
+            filler_class = FormFiller
+
+        filler = filler_class(
             config_path=str(config_path),
             headless=not args.headed,
             verbose=args.verbose,
-            code_override=args.code
+            code_override=args.code,
+            transition_timeout=args.transition_timeout,
+            block_resources=args.block_resources,
+            form_url=args.url,
+            bulk_fill=args.bulk_fill,
+            detection_cache=args.detection_cache,
+            plan_cache=args.plan_cache,
+            checkpoint=args.checkpoint,
+            capture_dir=args.capture_dir
         )
 
         # Run form filling
+        start = time.monotonic()
         success = filler.run()
+        duration = time.monotonic() - start
+
+        if args.trace_out:
+            write_chrome_trace(args.trace_out, [filler.tracer])
+        if args.metrics_out:
+            write_prometheus(args.metrics_out, [filler.tracer], [(success, duration)])
 
         # Exit with appropriate code
         if success:
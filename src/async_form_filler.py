@@ -0,0 +1,471 @@
+"""Asyncio form filler built on playwright.async_api"""
+
+import asyncio
+import time
+from typing import Optional
+
+from playwright.async_api import async_playwright, Page, Browser, BrowserContext
+
+from src.form_filler import FormFiller
+from src.checkpoint import IN_PROGRESS, COMPLETED, FAILED
+from src.concurrency import RetriesExhausted
+from src.question_detector import QuestionInfo
+from src.page_transition import async_arm_transition, async_wait_for_transition
+from src.page_snapshot import PageSnapshot, async_take_snapshot
+from src.page_scripts import (
+    FILL_ALL_ZERO_JS,
+    SELECT_TOPICS_JS,
+    FILL_VISIBLE_INPUTS_JS
+)
+from src.config_loader import get_school_types
+from src.logger_config import (
+    log_section,
+    log_field_fill,
+    log_success,
+    log_error,
+    log_warning,
+    log_skip
+)
+
+
+class AsyncFormFiller(FormFiller):
+    """
+    Async counterpart of FormFiller
+
+    Same configuration, detection and value planning as FormFiller; only the
+    browser I/O is awaited, so many surveys can progress in one event loop.
+    """
+
+    async def run(self) -> bool:
+        """
+        Main execution method
+
+        Returns:
+            True if form completed successfully, False otherwise
+        """
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=self.headless)
+
+            try:
+                return await self.run_in_browser(browser)
+
+            finally:
+                if not self.headless:
+                    self.logger.info("Browser will close in 10 seconds...")
+                    await asyncio.sleep(10)
+                await browser.close()
+
+    async def run_in_browser(self, browser: Browser) -> bool:
+        """Fill the survey in a fresh, isolated context of a running browser"""
+        context = await browser.new_context()
+
+        if self.resource_policy:
+            await self.resource_policy.install_async(context)
+
+        try:
+            return await self.run_in_context(context)
+
+        finally:
+            if self.resource_policy:
+                self.logger.debug(f"Blocked requests: {self.resource_policy.summary()}")
+            await context.close()
+
+    async def run_in_context(self, context: BrowserContext) -> bool:
+        """
+        Fill the survey in a new page of a clean context (e.g. from ContextPool)
+
+        The page is left open; the context owner cleans it up. Request
+        routing is also up to the owner (ContextPool installs it once per context).
+        """
+        page = await context.new_page()
+        return await self.fill(page)
+
+    async def fill(self, page: Page) -> bool:
+        """Fill the whole survey in the given page"""
+        log_section(self.logger, "LimeSurvey Form Filler Started")
+        self.logger.info(f"School: {self.config.get('school_name', 'Unknown')}")
+        self.logger.info(f"Code: {self.config['code']}")
+        self.logger.info(f"School types: {', '.join(get_school_types(self.config))}")
+
+        if self.already_completed():
+            log_skip(self.logger, "survey", "Already completed according to the checkpoint journal")
+            return True
+
+        try:
+            page.on('response', self._on_response)
+
+            # Login (or continue the session of an interrupted run)
+            with self._timed('login', 'login'):
+                resumed = await self.resume_session(page)
+                if not resumed:
+                    await self.login(page)
+
+            # After the resume decision (see FormFiller.fill)
+            if not resumed:
+                self._journal(IN_PROGRESS)
+
+            # Process pages until completion
+            max_pages = self.MAX_PAGES
+            page_count = 0
+
+            while page_count < max_pages:
+                page_count += 1
+
+                # Read the whole step in one round trip
+                with self._timed('detection', 'page_snapshot'):
+                    snapshot = await self.take_snapshot(page)
+
+                if self.corpus is not None:
+                    self._capture(await page.content(), snapshot)
+
+                # Check if completion page
+                if snapshot.completed:
+                    log_success(self.logger, "Form completed successfully!")
+                    log_section(self.logger, "✅ DONE")
+                    self._journal(COMPLETED, page=page_count - 1)
+                    return True
+
+                # Validation messages mean the previous "Další" did not go through
+                if snapshot.errors:
+                    log_warning(self.logger, f"Validation messages on page: {'; '.join(snapshot.errors)}")
+
+                # Process current page
+                success = await self.process_current_page(page, snapshot)
+
+                if not success:
+                    log_warning(self.logger, "Page processing failed, but continuing...")
+
+                # Click "Další" button (waits for the next page)
+                with self._timed('navigation', 'click_next'):
+                    await self.click_next(page)
+
+                await self.save_progress(page, page_count)
+
+            log_error(self.logger, f"Max pages ({max_pages}) reached without completion")
+            self._journal(FAILED, error=f"Max pages ({max_pages}) reached")
+            return False
+
+        except Exception as e:
+            log_error(self.logger, "Fatal error during form filling", e)
+            self._journal(FAILED, error=f"{type(e).__name__}: {e}")
+            return False
+
+    async def resume_session(self, page: Page) -> bool:
+        """Continue a handed-over session or an interrupted survey saved in the checkpoint journal"""
+        state = self._session_to_resume()
+        if not state or not state.get('cookies'):
+            return False
+
+        await page.context.add_cookies(state['cookies'])
+        await self._throttle()
+        await page.goto(self.form_url, timeout=60000, wait_until='domcontentloaded')
+
+        if self._resumed(await self.take_snapshot(page)):
+            return True
+
+        await page.context.clear_cookies()
+        return False
+
+    async def save_progress(self, page: Page, page_count: int) -> None:
+        """Save the session cookies and journal the last submitted page"""
+        if not self.checkpoint:
+            return
+
+        try:
+            cookies = await page.context.cookies()
+            self.checkpoint.save_storage_state(self.config['code'], {'cookies': cookies, 'origins': []})
+            self._journal(IN_PROGRESS, page=page_count)
+        except Exception as e:
+            log_warning(self.logger, f"Could not save checkpoint: {e}")
+
+    async def _throttle(self) -> None:
+        """Wait for the request-rate ceiling before a page request"""
+        if self.rate_limiter:
+            await self.rate_limiter.wait_async()
+
+    async def recover(self, page: Page, delay: Optional[float]) -> None:
+        """Back off and reload the current step after a failed navigation"""
+        while delay is not None:
+            log_warning(self.logger, f"Retrying in {delay:.1f}s (attempt {self.retries}/{self.MAX_RETRIES})")
+            await asyncio.sleep(delay)
+
+            await self._throttle()
+            errors_before = self.server_errors
+            started = time.perf_counter()
+            try:
+                await page.goto(self.form_url, timeout=self.transition_timeout_ms, wait_until='domcontentloaded')
+                ok = self._reloaded(await self.take_snapshot(page), errors_before)
+            except Exception as e:
+                self.logger.debug(f"Reload failed: {e}")
+                ok = False
+
+            delay = self._next_delay(started, ok)
+
+    async def login(self, page: Page) -> None:
+        """Login to survey with access code (retried like FormFiller.login)"""
+        log_section(self.logger, "Login")
+        self.logger.info(f"Navigating to {self.form_url}")
+
+        delay = None
+        while True:
+            if delay is not None:
+                log_warning(self.logger, f"Retrying login in {delay:.1f}s (attempt {self.retries}/{self.MAX_RETRIES})")
+                await asyncio.sleep(delay)
+
+            errors_before = self.server_errors
+            started = time.perf_counter()
+            try:
+                ok = await self._submit_access_code(page, retry=delay is not None)
+                ok = ok and self._reloaded(await self.take_snapshot(page), errors_before)
+            except Exception as e:
+                log_warning(self.logger, f"Login attempt failed: {e}")
+                ok = False
+
+            delay = self._next_delay(started, ok)
+            if delay is None:
+                break
+
+        log_success(self.logger, "Logged in")
+
+    async def _submit_access_code(self, page: Page, retry: bool = False) -> bool:
+        """Async variant of FormFiller._submit_access_code()"""
+        await self._throttle()
+        await page.goto(self.form_url, timeout=60000, wait_until='domcontentloaded')
+
+        if retry and (await self.take_snapshot(page)).step is not None:
+            return True
+
+        # Wait until the access code field is rendered
+        await page.wait_for_selector(', '.join(self.TOKEN_SELECTORS), timeout=self.transition_timeout_ms)
+
+        # Fill access code - try multiple selectors
+        filled = False
+        for selector in self.TOKEN_SELECTORS:
+            try:
+                if await page.query_selector(selector):
+                    await page.fill(selector, self.config['code'], timeout=5000)
+                    log_field_fill(self.logger, "Access code", self.config['code'])
+                    filled = True
+                    break
+            except:
+                continue
+
+        if not filled:
+            raise Exception("Could not find access code input field")
+
+        # Click submit - try multiple selectors
+        armed = await async_arm_transition(page)
+        await self._throttle()
+
+        clicked = False
+        for selector in self.SUBMIT_SELECTORS:
+            try:
+                if await page.query_selector(selector):
+                    await page.click(selector, timeout=5000)
+                    clicked = True
+                    break
+            except:
+                continue
+
+        if not clicked:
+            raise Exception("Could not find submit button")
+
+        loaded = await async_wait_for_transition(page, armed, self.transition_timeout_ms)
+        if not loaded:
+            log_warning(self.logger, f"First survey page did not load within {self.transition_timeout_ms / 1000:.0f}s")
+        return loaded
+
+    async def take_snapshot(self, page: Page) -> PageSnapshot:
+        """Snapshot of the current step (empty if the page cannot be read, e.g. mid-navigation)"""
+        try:
+            return await async_take_snapshot(page)
+        except Exception as e:
+            self.logger.debug(f"Could not read page snapshot: {e}")
+            return PageSnapshot()
+
+    async def is_completion_page_check(self, page: Page) -> bool:
+        """Check if current page is completion page"""
+        return (await self.take_snapshot(page)).completed
+
+    async def process_current_page(self, page: Page, snapshot: PageSnapshot = None) -> bool:
+        """Process current page based on detected type"""
+        try:
+            if snapshot is None:
+                snapshot = await self.take_snapshot(page)
+
+            question_text = snapshot.question_text
+
+            # Detect page type
+            with self._timed('detection', 'detect_question_type') as span:
+                question_info = self._detect_page(question_text)
+                if question_info:
+                    span.update(page_type=question_info.page_type, activity_code=question_info.activity_code)
+
+            if question_info is None:
+                return not question_text
+
+            with self._timed(
+                'fill',
+                f"fill_{question_info.page_type}",
+                page_type=question_info.page_type,
+                activity_code=question_info.activity_code,
+                page=self.page_counter
+            ):
+                # Dispatch to appropriate handler
+                page_type = question_info.page_type
+
+                if page_type not in self.PAGE_HANDLERS:
+                    log_warning(self.logger, f"Unhandled page type: {page_type}")
+                    return False
+
+                handler = self.PAGE_HANDLERS[page_type]
+
+                if handler is None:
+                    if page_type == 'skip':
+                        log_skip(self.logger, question_info.description, "Per business rules")
+                    return True  # Just click next
+
+                return await getattr(self, handler)(page, question_info, snapshot)
+
+        except Exception as e:
+            log_error(self.logger, "Error processing page", e)
+            return False
+
+    async def get_question_text(self, page: Page) -> str:
+        """Get question text from page (whole page text if there is no question element)"""
+        return (await self.take_snapshot(page)).question_text
+
+    async def click_next(self, page: Page) -> None:
+        """Click 'Další' (Next) button, backing off on timeouts and 5xx"""
+        try:
+            armed = await async_arm_transition(page)
+            await self._throttle()
+            errors_before = self.server_errors
+            started = time.perf_counter()
+
+            # Try different selectors for "Další" button
+            for selector in self.NEXT_SELECTORS:
+                try:
+                    await page.click(selector, timeout=2000)
+                except:
+                    continue
+
+                # Wait exactly until the next step is rendered
+                loaded = await async_wait_for_transition(page, armed, self.transition_timeout_ms)
+                if not loaded:
+                    log_warning(self.logger, f"Next page did not load within {self.transition_timeout_ms / 1000:.0f}s")
+                elif self.server_errors != errors_before:
+                    log_warning(self.logger, "Server error (5xx) after 'Další'")
+
+                await self.recover(page, self._next_delay(started, loaded and self.server_errors == errors_before))
+                return
+
+            log_warning(self.logger, "Could not find 'Další' button")
+
+        except RetriesExhausted:
+            raise
+
+        except Exception as e:
+            log_error(self.logger, "Error clicking Next button", e)
+
+    async def fill_fixed_zero(self, page: Page, info: QuestionInfo, snapshot: PageSnapshot) -> bool:
+        """Fill all fields with 0"""
+        try:
+            if not snapshot.inputs:
+                log_warning(self.logger, "No input fields found")
+                return False
+
+            result = await page.evaluate(FILL_ALL_ZERO_JS, self.bulk_fill)
+            self._note_fill_mode(result)
+            filled_count = result['filled']
+
+            self.logger.info(f"Filled {filled_count} fields with 0")
+            return True
+
+        except Exception as e:
+            log_error(self.logger, "Error filling fixed zeros", e)
+            return False
+
+    async def fill_simple_inputs(self, page: Page, info: QuestionInfo, snapshot: PageSnapshot) -> bool:
+        """Fill simple year inputs with random values (only first 3 years, 2025/2026 stays empty)"""
+        try:
+            counts = self._simple_input_counts(info)
+
+            num_inputs = len(snapshot.visible_inputs)
+
+            if num_inputs < 3:
+                log_warning(self.logger, f"Expected at least 3 inputs, found {num_inputs}")
+                return False
+
+            # Same single-call path as table/zero pages: values go to visible
+            # inputs in document order, events are dispatched in the page
+            values = self._simple_input_values(counts, num_inputs)
+            result = await page.evaluate(FILL_VISIBLE_INPUTS_JS, {'values': values, 'bulk': self.bulk_fill})
+            self._note_fill_mode(result)
+            filled_count = result['filled']
+
+            if filled_count < len(counts):
+                log_warning(self.logger, f"Filled only {filled_count} of {len(counts)} year inputs")
+                return False
+
+            for year, count in zip(self.SCHOOL_YEARS, counts):
+                log_field_fill(self.logger, f"Školní rok {year}", count)
+
+            # Log that 4th year is intentionally left empty
+            if len(values) > len(counts):
+                self.logger.info(f"Školní rok 2025/2026: (left empty per business rules)")
+
+            return True
+
+        except Exception as e:
+            log_error(self.logger, "Error filling simple inputs", e)
+            return False
+
+    async def fill_checkboxes(self, page: Page, info: QuestionInfo, snapshot: PageSnapshot) -> bool:
+        """Fill checkboxes based on JSON topics"""
+        try:
+            topics = self._checkbox_topics(info)
+
+            if not topics:
+                return False
+
+            if not snapshot.checkboxes:
+                log_warning(self.logger, "No checkboxes found on page")
+                return False
+
+            # All topics resolved and applied in one round trip
+            report = await page.evaluate(
+                SELECT_TOPICS_JS, {'topicNorms': list(topics.normalized), 'bulk': self.bulk_fill}
+            )
+            self._note_fill_mode(report)
+
+            self._log_checkbox_report(topics.topics, report)
+
+            return True
+
+        except Exception as e:
+            log_error(self.logger, "Error filling checkboxes", e)
+            return False
+
+    async def fill_table_counts(self, page: Page, info: QuestionInfo, snapshot: PageSnapshot) -> bool:
+        """Fill table with topic × year counts (only 3 years, 2025/2026 stays empty)"""
+        try:
+            topics, values = self._table_values(info)
+
+            if not snapshot.visible_inputs:
+                # Every row hidden by relevance: nothing to fill
+                self.logger.info("No visible table rows, nothing to fill")
+                return True
+
+            # Use JavaScript to fill fields (only visible rows, skip ls-hidden)
+            result = await page.evaluate(FILL_VISIBLE_INPUTS_JS, {'values': values, 'bulk': self.bulk_fill})
+            self._note_fill_mode(result)
+            filled_count = result['filled']
+
+            self._log_table_fill(topics, values, filled_count)
+
+            return True
+
+        except Exception as e:
+            log_error(self.logger, "Error filling table counts", e)
+            return False
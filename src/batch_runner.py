@@ -0,0 +1,767 @@
+"""Batch execution of many school configurations with a shared browser worker pool"""
+
+import asyncio
+import hashlib
+import logging
+import logging.handlers
+import multiprocessing
+import queue
+import re
+import threading
+import time
+from contextlib import AsyncExitStack
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright
+
+from src.config_loader import ConfigValidationError, collect_config_paths
+from src.manifest import parse_ref
+from src.form_filler import FormFiller
+from src.async_form_filler import AsyncFormFiller
+from src.http_engine import HttpFormFiller, NeedsBrowser
+from src.browser_pool import ContextPool
+from src.resource_policy import ResourcePolicy
+from src.metrics import Tracer, write_chrome_trace, write_prometheus
+from src.checkpoint import Checkpoint
+from src.concurrency import AIMDController
+from src.logger_config import setup_logger, close_logger, log_section, log_success, log_error, log_skip
+
+
+# 'async': warm shared Chromium with a pool of N contexts, one event loop
+# 'threads': N worker threads, each with its own Chromium
+# 'http': N worker threads posting the survey forms without a browser; a
+#         thread launches Chromium only when a survey has to fall back to it
+ENGINES = ('async', 'threads', 'http')
+
+
+class BatchResult:
+    """Outcome of one school in a batch run"""
+
+    def __init__(
+        self,
+        config_path: str,
+        success: bool,
+        duration: float,
+        school_name: str = "",
+        error: str = "",
+        tracer: Optional[Tracer] = None,
+        skipped: bool = False
+    ):
+        self.config_path = config_path
+        self.success = success
+        self.duration = duration
+        self.school_name = school_name
+        self.error = error
+        # Timing spans of the run (None if the filler never started)
+        self.tracer = tracer
+        # Completed in an earlier run (checkpoint journal), not filled again
+        self.skipped = skipped
+
+    def __repr__(self) -> str:
+        return f"BatchResult(config={self.config_path}, success={self.success}, duration={self.duration:.1f}s)"
+
+
+def _school_logger_name(config_path: str) -> str:
+    """
+    Per-school logger name (also the log file prefix)
+
+    The readable stem is followed by a hash of the resolved path, so configs
+    with the same file name in different directories get separate loggers.
+    """
+    ref = parse_ref(config_path)
+    if ref:
+        resolved = f"{Path(ref[0]).resolve()}#{ref[1]}"
+        name = f"{Path(ref[0]).stem}_{ref[1]}"
+    else:
+        resolved = str(Path(config_path).resolve())
+        name = Path(config_path).stem
+    digest = hashlib.sha1(resolved.encode('utf-8')).hexdigest()[:8]
+    return "school_" + re.sub(r'[^\w-]+', '_', name) + "_" + digest
+
+
+def _create_filler(filler_class, config_path: str, filler_options: Dict[str, Any]):
+    """
+    Create a filler with its own file-only logger
+
+    The caller closes the logger (close_logger) once the school finishes.
+
+    Args:
+        filler_class: FormFiller or AsyncFormFiller
+        config_path: Path to the school's JSON configuration
+        filler_options: Keyword arguments for the filler (headless, verbose, ...)
+
+    Returns:
+        (filler, None) or (None, BatchResult) if the config is invalid
+    """
+    school_logger = setup_logger(
+        name=_school_logger_name(config_path),
+        verbose=filler_options.get('verbose', False),
+        console=False
+    )
+
+    try:
+        filler = filler_class(config_path=config_path, logger=school_logger, **filler_options)
+    except (ConfigValidationError, FileNotFoundError, ValueError) as e:
+        close_logger(school_logger)
+        return None, BatchResult(config_path, False, 0.0, error=f"Invalid config: {e}")
+
+    return filler, None
+
+
+def run_school(browser, config_path: str, filler_options: Dict[str, Any]) -> BatchResult:
+    """
+    Fill one school's survey in an isolated context of a shared browser
+
+    Args:
+        browser: Running Playwright browser
+        config_path: Path to the school's JSON configuration
+        filler_options: Keyword arguments for FormFiller (headless, verbose, ...)
+
+    Returns:
+        BatchResult for the school
+    """
+    start = time.monotonic()
+
+    filler, invalid = _create_filler(FormFiller, config_path, filler_options)
+    if invalid:
+        return invalid
+
+    try:
+        school_name = filler.config.get('school_name', Path(config_path).stem)
+
+        if filler.already_completed():
+            return BatchResult(config_path, True, 0.0, school_name, skipped=True)
+
+        try:
+            success = filler.run_in_browser(browser)
+            error = "" if success else "Survey not completed (see school log)"
+        except Exception as e:
+            success = False
+            error = f"{type(e).__name__}: {e}"
+
+        return BatchResult(config_path, success, time.monotonic() - start, school_name, error, filler.tracer)
+    finally:
+        close_logger(filler.logger)
+
+
+async def run_school_async(
+    context,
+    config_path: str,
+    filler_options: Dict[str, Any],
+    controller: Optional[AIMDController] = None
+) -> BatchResult:
+    """
+    Async variant of run_school() using AsyncFormFiller
+
+    Args:
+        context: Clean browser context borrowed from a ContextPool
+        config_path: Path to the school's JSON configuration
+        filler_options: Keyword arguments for AsyncFormFiller
+        controller: Adaptive concurrency controller fed with the page latencies
+
+    Returns:
+        BatchResult for the school
+    """
+    start = time.monotonic()
+
+    filler, invalid = _create_filler(AsyncFormFiller, config_path, filler_options)
+    if invalid:
+        return invalid
+
+    try:
+        school_name = filler.config.get('school_name', Path(config_path).stem)
+
+        if filler.already_completed():
+            return BatchResult(config_path, True, 0.0, school_name, skipped=True)
+
+        if controller:
+            filler.on_navigation = controller.observe
+
+        try:
+            success = await filler.run_in_context(context)
+            error = "" if success else "Survey not completed (see school log)"
+        except Exception as e:
+            success = False
+            error = f"{type(e).__name__}: {e}"
+
+        return BatchResult(config_path, success, time.monotonic() - start, school_name, error, filler.tracer)
+    finally:
+        close_logger(filler.logger)
+
+
+def run_school_http(get_browser: Callable[[], Any], config_path: str, filler_options: Dict[str, Any]) -> BatchResult:
+    """
+    Fill one school's survey over HTTP, continuing in a browser if a step needs it
+
+    Args:
+        get_browser: Returns the worker's running Playwright browser (launched on first use)
+        config_path: Path to the school's JSON configuration
+        filler_options: Keyword arguments for HttpFormFiller
+
+    Returns:
+        BatchResult for the school
+    """
+    start = time.monotonic()
+
+    filler, invalid = _create_filler(HttpFormFiller, config_path, filler_options)
+    if invalid:
+        return invalid
+
+    try:
+        school_name = filler.config.get('school_name', Path(config_path).stem)
+
+        if filler.already_completed():
+            return BatchResult(config_path, True, 0.0, school_name, skipped=True)
+
+        try:
+            try:
+                success = filler.fill_http()
+            except NeedsBrowser as e:
+                filler.hand_over(e)
+                success = filler.run_in_browser(get_browser())
+            error = "" if success else "Survey not completed (see school log)"
+        except Exception as e:
+            success = False
+            error = f"{type(e).__name__}: {e}"
+
+        return BatchResult(config_path, success, time.monotonic() - start, school_name, error, filler.tracer)
+    finally:
+        close_logger(filler.logger)
+
+
+def run_batch(
+    config_paths: List[str],
+    workers: int = 4,
+    headless: bool = True,
+    verbose: bool = False,
+    transition_timeout: float = None,
+    logger=None,
+    engine: str = 'async',
+    block_resources: bool = False,
+    form_url: Optional[str] = None,
+    processes: int = 1,
+    pool_options: Optional[Dict[str, Any]] = None,
+    bulk_fill: bool = False,
+    detection_cache: Optional[str] = None,
+    plan_cache: Optional[str] = None,
+    checkpoint: Optional[str] = None,
+    adaptive: bool = False,
+    latency_target: Optional[float] = None,
+    max_rate: Optional[float] = None,
+    capture_dir: Optional[str] = None
+) -> List[BatchResult]:
+    """
+    Run many school configurations through a pool of browser workers
+
+    Every school is filled in a fresh browser context (separate cookies/session).
+
+    Args:
+        config_paths: Config files to process
+        workers: Number of schools filled in parallel (per process)
+        headless: Run browsers in headless mode
+        verbose: Enable verbose logging
+        transition_timeout: Max seconds to wait for the next page
+        logger: Batch logger (progress and summary)
+        engine: 'async' (one shared Chromium), 'threads' (Chromium per worker
+            thread) or 'http' (no browser unless a survey falls back to it)
+        block_resources: Skip images, fonts, stylesheets and third-party requests
+        form_url: Survey URL override (e.g. a local survey stub)
+        processes: Number of worker processes; configs are sharded across them,
+            each process runs its own browser(s) with `workers` parallel schools
+        pool_options: ContextPool tuning for the async engine
+            (browsers, max_uses, max_heap_mb)
+        bulk_fill: One ExpressionManager recalculation per page instead of per field
+        detection_cache: JSONL detection cache shared by all workers and processes
+        plan_cache: Directory of compiled fill plans keyed by config content hash
+        checkpoint: Journal of per-code state; completed codes are skipped and
+            interrupted surveys resume their saved session (see src.checkpoint)
+        adaptive: Adapt the number of concurrent surveys (up to `workers`) to
+            page latency and error rate (AIMDController, async engine only)
+        latency_target: Seconds of page latency treated as overload by the
+            adaptive controller (default: relative to the best latency seen)
+        max_rate: Page requests per second for the whole batch, split evenly
+            across processes
+        capture_dir: Page corpus all workers and processes save visited steps
+            into, anonymized (see src.page_corpus)
+
+    Returns:
+        Results in the order of config_paths
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown batch engine: {engine} (expected one of {', '.join(ENGINES)})")
+
+    filler_options = {
+        'headless': headless,
+        'verbose': verbose,
+        'transition_timeout': transition_timeout,
+        'block_resources': block_resources,
+        'form_url': form_url,
+        'bulk_fill': bulk_fill,
+        'detection_cache': detection_cache,
+        'plan_cache': plan_cache,
+        'checkpoint': checkpoint,
+        'capture_dir': capture_dir,
+    }
+
+    pool_options = pool_options or {}
+
+    logger = logger or setup_logger(name='batch', verbose=verbose)
+
+    if checkpoint:
+        # Done before any worker appends to it
+        journal = Checkpoint.shared(checkpoint)
+        journal.compact()
+        states = journal.summary()
+        if states:
+            logger.info(f"Checkpoint {checkpoint}: {', '.join(f'{state} {count}' for state, count in sorted(states.items()))}")
+    processes = max(1, min(processes, len(config_paths)))
+
+    if max_rate:
+        # Every process has its own token bucket
+        filler_options['max_rate'] = max_rate / processes
+
+    adaptive_options = None
+    if adaptive:
+        if engine == 'async':
+            adaptive_options = {'latency_target': latency_target}
+        else:
+            logger.warning("Adaptive concurrency needs the async engine, running a fixed number of workers")
+
+    if processes > 1:
+        log_section(logger, f"Batch: {len(config_paths)} schools, {processes} processes × {workers} workers ({engine})")
+        results = _run_batch_processes(
+            config_paths, processes, workers, engine, filler_options, pool_options, logger, adaptive_options
+        )
+    else:
+        log_section(logger, f"Batch: {len(config_paths)} schools, {workers} workers ({engine})")
+        results = _run_engine(engine, config_paths, workers, filler_options, pool_options, logger,
+                              adaptive_options=adaptive_options)
+
+    log_summary(logger, results)
+    return results
+
+
+def _run_engine(
+    engine: str,
+    config_paths: List[str],
+    workers: int,
+    filler_options: Dict[str, Any],
+    pool_options: Dict[str, Any],
+    logger,
+    on_result: Callable[[int, BatchResult], None] = None,
+    adaptive_options: Optional[Dict[str, Any]] = None
+) -> List[BatchResult]:
+    """Run config_paths in this process with the selected engine"""
+    if engine == 'async':
+        return asyncio.run(
+            run_batch_async(config_paths, workers, filler_options, logger, on_result, pool_options, adaptive_options)
+        )
+
+    if engine == 'http':
+        return _run_batch_http(config_paths, workers, filler_options, logger, on_result)
+
+    return _run_batch_threads(config_paths, workers, filler_options, logger, on_result)
+
+
+async def run_batch_async(
+    config_paths: List[str],
+    workers: int,
+    filler_options: Dict[str, Any],
+    logger,
+    on_result: Callable[[int, BatchResult], None] = None,
+    pool_options: Optional[Dict[str, Any]] = None,
+    adaptive_options: Optional[Dict[str, Any]] = None
+) -> List[BatchResult]:
+    """
+    Fill all schools from one event loop in shared, warm Chromium browsers
+
+    Contexts come from a ContextPool of `workers` pre-created contexts, so
+    at most `workers` surveys are in progress at once and browser launch
+    and context creation stay out of the per-survey critical path. With
+    adaptive_options, an AIMDController lets fewer surveys run while the
+    server is slow or failing.
+
+    Args:
+        config_paths: Config files to process
+        workers: Max concurrent surveys (pool size)
+        filler_options: Keyword arguments for AsyncFormFiller
+        logger: Batch logger
+        on_result: Optional callback(index, result) called as soon as a school finishes
+        pool_options: ContextPool keyword arguments (browsers, max_uses, max_heap_mb)
+        adaptive_options: AIMDController keyword arguments, None = fixed concurrency
+
+    Returns:
+        Results in the order of config_paths
+    """
+    form_url = filler_options.get('form_url') or AsyncFormFiller.FORM_URL
+
+    # Routing is installed once per pooled context, not per survey
+    policy = ResourcePolicy(form_url) if filler_options.get('block_resources') else None
+
+    size = min(workers, len(config_paths))
+
+    async with async_playwright() as p:
+        pool = ContextPool(
+            p,
+            size=size,
+            headless=filler_options.get('headless', True),
+            clear_origins=[form_url],
+            logger=logger,
+            on_context_created=policy.install_async if policy else None,
+            **(pool_options or {})
+        )
+
+        try:
+            await pool.start()
+        except Exception as e:
+            log_error(logger, "Could not launch browser", e)
+            await pool.close()
+            return [
+                BatchResult(path, False, 0.0, error="Not processed (browser failed to launch)")
+                for path in config_paths
+            ]
+
+        # Start at half the pool and let the server's answers decide
+        controller = AIMDController(
+            initial=max(1, size // 2), maximum=size, **adaptive_options
+        ) if adaptive_options is not None else None
+
+        async def run_one(index: int, config_path: str) -> BatchResult:
+            try:
+                async with AsyncExitStack() as stack:
+                    if controller:
+                        await stack.enter_async_context(controller.slot())
+                    context = await stack.enter_async_context(pool.acquire())
+                    logger.info(f"▶️  {config_path}")
+                    result = await run_school_async(context, config_path, filler_options, controller)
+            except RuntimeError as e:
+                result = BatchResult(config_path, False, 0.0, error=f"Not processed ({e})")
+
+            _log_result(logger, result)
+            if on_result:
+                on_result(index, result)
+            return result
+
+        try:
+            return list(await asyncio.gather(
+                *(run_one(index, path) for index, path in enumerate(config_paths))
+            ))
+        finally:
+            logger.debug(
+                f"Context pool: {pool.browsers_launched} browsers launched, "
+                f"{pool.contexts_created} contexts created, {pool.contexts_recycled} recycled"
+            )
+            if policy:
+                logger.info(f"Blocked requests: {policy.summary()}")
+            if controller:
+                logger.info(f"Adaptive {controller.summary()}")
+            await pool.close()
+
+
+def _run_batch_threads(
+    config_paths: List[str],
+    workers: int,
+    filler_options: Dict[str, Any],
+    logger,
+    on_result: Callable[[int, BatchResult], None] = None
+) -> List[BatchResult]:
+    """
+    Fill schools from worker threads, each launching Chromium once
+
+    Returns:
+        Results in the order of config_paths
+    """
+    jobs = queue.Queue()
+    for index, config_path in enumerate(config_paths):
+        jobs.put((index, config_path))
+
+    results: List[Optional[BatchResult]] = [None] * len(config_paths)
+
+    def worker() -> None:
+        # Playwright's sync API is bound to the thread that started it,
+        # so every worker owns its Playwright instance and browser
+        with sync_playwright() as p:
+            try:
+                browser = p.chromium.launch(headless=filler_options.get('headless', True))
+            except Exception as e:
+                log_error(logger, "Could not launch browser", e)
+                return
+
+            try:
+                while True:
+                    try:
+                        index, config_path = jobs.get_nowait()
+                    except queue.Empty:
+                        return
+
+                    logger.info(f"▶️  {config_path}")
+                    result = run_school(browser, config_path, filler_options)
+                    results[index] = result
+                    _log_result(logger, result)
+                    if on_result:
+                        on_result(index, result)
+
+            finally:
+                browser.close()
+
+    threads = [
+        threading.Thread(target=worker, name=f"batch-worker-{i}", daemon=True)
+        for i in range(max(1, min(workers, len(config_paths))))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return _fill_missing_results(config_paths, results)
+
+
+def _run_batch_http(
+    config_paths: List[str],
+    workers: int,
+    filler_options: Dict[str, Any],
+    logger,
+    on_result: Callable[[int, BatchResult], None] = None
+) -> List[BatchResult]:
+    """
+    Fill schools over HTTP from worker threads
+
+    Keep-alive connections are shared by all threads (ConnectionPool). A
+    thread starts Playwright and Chromium only for its first survey that
+    needs the browser, and keeps them for later ones.
+
+    Returns:
+        Results in the order of config_paths
+    """
+    jobs = queue.Queue()
+    for index, config_path in enumerate(config_paths):
+        jobs.put((index, config_path))
+
+    results: List[Optional[BatchResult]] = [None] * len(config_paths)
+    fallbacks = []
+
+    def worker() -> None:
+        playwright = browser = None
+
+        def get_browser():
+            # Playwright's sync API is bound to the thread that started it
+            nonlocal playwright, browser
+            if browser is None:
+                playwright = sync_playwright().start()
+                browser = playwright.chromium.launch(headless=filler_options.get('headless', True))
+            fallbacks.append(threading.current_thread().name)
+            return browser
+
+        try:
+            while True:
+                try:
+                    index, config_path = jobs.get_nowait()
+                except queue.Empty:
+                    return
+
+                logger.info(f"▶️  {config_path}")
+                result = run_school_http(get_browser, config_path, filler_options)
+                results[index] = result
+                _log_result(logger, result)
+                if on_result:
+                    on_result(index, result)
+
+        finally:
+            if browser:
+                browser.close()
+            if playwright:
+                playwright.stop()
+
+    threads = [
+        threading.Thread(target=worker, name=f"http-worker-{i}", daemon=True)
+        for i in range(max(1, min(workers, len(config_paths))))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if fallbacks:
+        logger.info(f"HTTP engine: {len(fallbacks)} surveys continued in the browser (see school logs)")
+
+    return _fill_missing_results(config_paths, results)
+
+
+def _fill_missing_results(config_paths: List[str], results: List[Optional[BatchResult]]) -> List[BatchResult]:
+    """Replace results of schools that were never processed with failures"""
+    return [
+        result or BatchResult(config_path, False, 0.0, error="Not processed (browser failed to launch)")
+        for config_path, result in zip(config_paths, results)
+    ]
+
+
+def _run_batch_processes(
+    config_paths: List[str],
+    processes: int,
+    workers: int,
+    engine: str,
+    filler_options: Dict[str, Any],
+    pool_options: Dict[str, Any],
+    logger,
+    adaptive_options: Optional[Dict[str, Any]] = None
+) -> List[BatchResult]:
+    """
+    Shard configs round-robin across worker processes
+
+    Every process runs its own engine (browser + contexts). Log records and
+    per-school results stream back to the parent through queues, so the
+    console shows one consolidated progress log and summary. Each process
+    adapts its own concurrency (adaptive_options).
+
+    Returns:
+        Results in the order of config_paths
+    """
+    # Spawn: Playwright's driver and threads must not be forked
+    mp_context = multiprocessing.get_context('spawn')
+    log_queue = mp_context.Queue()
+    result_queue = mp_context.Queue()
+
+    listener = logging.handlers.QueueListener(log_queue, *logger.handlers, respect_handler_level=True)
+    listener.start()
+
+    shards = [list(range(shard, len(config_paths), processes)) for shard in range(processes)]
+    shard_procs = [
+        mp_context.Process(
+            target=_shard_worker,
+            args=(
+                shard_index,
+                [(index, config_paths[index]) for index in shard],
+                workers,
+                engine,
+                filler_options,
+                pool_options,
+                logger.level,
+                log_queue,
+                result_queue,
+                adaptive_options
+            ),
+            name=f"batch-shard-{shard_index}"
+        )
+        for shard_index, shard in enumerate(shards)
+    ]
+
+    for proc in shard_procs:
+        proc.start()
+
+    results: List[Optional[BatchResult]] = [None] * len(config_paths)
+    received = 0
+
+    try:
+        while received < len(config_paths):
+            try:
+                index, result = result_queue.get(timeout=1.0)
+            except queue.Empty:
+                # Stop waiting once every shard has exited
+                if not any(proc.is_alive() for proc in shard_procs) and result_queue.empty():
+                    break
+                continue
+
+            results[index] = result
+            received += 1
+
+        for proc in shard_procs:
+            proc.join()
+
+    finally:
+        listener.stop()
+
+    for proc in shard_procs:
+        if proc.exitcode:
+            log_error(logger, f"{proc.name} exited with code {proc.exitcode}")
+
+    return _fill_missing_results(config_paths, results)
+
+
+def _shard_worker(
+    shard_index: int,
+    jobs: List[Tuple[int, str]],
+    workers: int,
+    engine: str,
+    filler_options: Dict[str, Any],
+    pool_options: Dict[str, Any],
+    log_level: int,
+    log_queue,
+    result_queue,
+    adaptive_options: Optional[Dict[str, Any]] = None
+) -> None:
+    """Entry point of a shard process: run its configs and stream results back"""
+    logger = logging.getLogger(f'batch.shard{shard_index}')
+    logger.handlers.clear()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(log_level)
+    logger.propagate = False
+
+    indexes = [index for index, _ in jobs]
+    config_paths = [config_path for _, config_path in jobs]
+
+    def on_result(local_index: int, result: BatchResult) -> None:
+        result_queue.put((indexes[local_index], result))
+
+    try:
+        _run_engine(engine, config_paths, workers, filler_options, pool_options, logger, on_result, adaptive_options)
+    except Exception as e:
+        log_error(logger, f"Shard {shard_index} failed", e)
+
+
+def _log_result(logger, result: BatchResult) -> None:
+    """Log outcome of one school"""
+    label = result.school_name or result.config_path
+    if result.skipped:
+        log_skip(logger, label, "already completed")
+    elif result.success:
+        log_success(logger, f"{label} ({result.duration:.1f}s)")
+    else:
+        log_error(logger, f"{label} ({result.duration:.1f}s): {result.error}")
+
+
+def log_summary(logger, results: List[BatchResult]) -> None:
+    """
+    Log aggregate batch summary
+
+    Args:
+        logger: Logger instance
+        results: Results of all schools
+    """
+    succeeded = sum(1 for r in results if r.success)
+    skipped = sum(1 for r in results if r.skipped)
+    failed = [r for r in results if not r.success]
+
+    log_section(logger, "Batch summary")
+    logger.info(f"Completed: {succeeded}/{len(results)}" + (f" ({skipped} in earlier runs)" if skipped else ""))
+
+    for result in failed:
+        logger.info(f"  ❌ {result.config_path}: {result.error}")
+
+
+def batch_exit_code(results: List[BatchResult]) -> int:
+    """
+    Aggregate exit code of a batch run
+
+    Returns:
+        0 if every school completed, 1 otherwise
+    """
+    return 0 if results and all(r.success for r in results) else 1
+
+
+def export_metrics(results: List[BatchResult], trace_out: Optional[str] = None, metrics_out: Optional[str] = None) -> None:
+    """
+    Write timing spans of a batch run
+
+    Args:
+        results: Results of all schools
+        trace_out: Chrome trace-event JSON path (one timeline row per school)
+        metrics_out: Prometheus text format path (step and survey histograms)
+    """
+    tracers = [r.tracer for r in results if r.tracer is not None]
+
+    if trace_out:
+        write_chrome_trace(trace_out, tracers)
+    if metrics_out:
+        write_prometheus(metrics_out, tracers, [(r.success, r.duration) for r in results])
@@ -0,0 +1,233 @@
+"""Pool of warm browsers and reusable, isolated browser contexts"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from playwright.async_api import Playwright, Browser, BrowserContext
+
+
+# Heap usage of all pages of a context (Chromium-only performance.memory)
+JS_HEAP_USED_JS = """() => (performance.memory ? performance.memory.usedJSHeapSize : 0)"""
+
+
+class _PooledContext:
+    """Context handed out by the pool, with its usage bookkeeping"""
+
+    def __init__(self, browser_slot: int, context: BrowserContext):
+        self.browser_slot = browser_slot
+        self.context = context
+        self.uses = 0
+
+
+class ContextPool:
+    """
+    Warm Chromium browsers with pre-created contexts ready to hand out
+
+    A context is reused for several surveys and recycled (closed and
+    replaced by a fresh one) after `max_uses` surveys or when its pages'
+    JS heap grew over `max_heap_mb`. Between two surveys all pages are
+    closed and cookies, permissions and origin storage are cleared, so no
+    session leaks from one school to the next.
+
+    Examples:
+        >>> async with async_playwright() as p:
+        ...     pool = ContextPool(p, size=4, clear_origins=[FormFiller.FORM_URL])
+        ...     await pool.start()
+        ...     async with pool.acquire() as context:
+        ...         page = await context.new_page()
+        ...     await pool.close()
+    """
+
+    def __init__(
+        self,
+        playwright: Playwright,
+        size: int = 4,
+        browsers: int = 1,
+        max_uses: int = 20,
+        max_heap_mb: float = 256,
+        headless: bool = True,
+        context_options: Optional[Dict[str, Any]] = None,
+        clear_origins: Optional[List[str]] = None,
+        logger: Optional[logging.Logger] = None,
+        on_context_created: Optional[Callable[[BrowserContext], Awaitable[None]]] = None
+    ):
+        """
+        Args:
+            playwright: Started async Playwright instance
+            size: Number of contexts (max concurrent surveys)
+            browsers: Number of Chromium processes the contexts are spread over
+            max_uses: Recycle a context after this many surveys
+            max_heap_mb: Recycle a context whose pages use more JS heap than this
+            headless: Launch browsers in headless mode
+            context_options: Keyword arguments for browser.new_context()
+            clear_origins: URLs whose origin storage is wiped between surveys
+            logger: Logger for recycle/relaunch messages
+            on_context_created: Coroutine called once for every new context
+                (e.g. ResourcePolicy.install_async)
+        """
+        self.playwright = playwright
+        self.size = max(1, size)
+        self.num_browsers = max(1, min(browsers, self.size))
+        self.max_uses = max(1, max_uses)
+        self.max_heap_bytes = max_heap_mb * 1024 * 1024
+        self.headless = headless
+        self.context_options = context_options or {}
+        self.clear_origins = sorted({
+            f"{parts.scheme}://{parts.netloc}"
+            for parts in (urlsplit(url) for url in (clear_origins or []))
+        })
+        self.logger = logger or logging.getLogger('batch')
+        self.on_context_created = on_context_created
+
+        self.browsers: List[Optional[Browser]] = [None] * self.num_browsers
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._browser_locks = [asyncio.Lock() for _ in range(self.num_browsers)]
+        self._alive = 0
+
+        # Statistics
+        self.contexts_created = 0
+        self.contexts_recycled = 0
+        self.browsers_launched = 0
+
+    async def start(self) -> None:
+        """Launch browsers and pre-create all contexts"""
+        for slot in range(self.num_browsers):
+            await self._ensure_browser(slot)
+
+        # Spread contexts round-robin over browsers
+        created = await asyncio.gather(*(
+            self._new_context(index % self.num_browsers) for index in range(self.size)
+        ))
+        for pooled in created:
+            self._idle.put_nowait(pooled)
+        self._alive = len(created)
+
+    async def close(self) -> None:
+        """Close all contexts and browsers"""
+        while not self._idle.empty():
+            pooled = self._idle.get_nowait()
+            if pooled is not None:
+                await self._close_context(pooled)
+
+        for slot, browser in enumerate(self.browsers):
+            if browser is not None:
+                try:
+                    await browser.close()
+                except Exception:
+                    pass
+                self.browsers[slot] = None
+
+    @asynccontextmanager
+    async def acquire(self):
+        """
+        Borrow a clean context for one survey
+
+        Waits until a context is free, so the pool size bounds concurrency.
+
+        Yields:
+            BrowserContext with no pages, cookies or origin storage
+        """
+        pooled = await self._idle.get()
+
+        if pooled is None:
+            # Pool is exhausted; pass the marker on to other waiters
+            self._idle.put_nowait(None)
+            raise RuntimeError("No browser contexts left in the pool")
+
+        try:
+            yield pooled.context
+
+        finally:
+            pooled.uses += 1
+            try:
+                self._idle.put_nowait(await self._release(pooled))
+            except Exception as e:
+                self.logger.error(f"❌ Could not replace browser context: {type(e).__name__}: {e}")
+                self._alive -= 1
+                if self._alive <= 0:
+                    self._idle.put_nowait(None)
+
+    async def _release(self, pooled: _PooledContext) -> _PooledContext:
+        """Reset a used context, or replace it when it is due for recycling"""
+        reason = None
+
+        if pooled.uses >= self.max_uses:
+            reason = f"{pooled.uses} surveys"
+        else:
+            try:
+                heap = await self._heap_used(pooled.context)
+                if heap > self.max_heap_bytes:
+                    reason = f"JS heap {heap / 1024 / 1024:.0f} MB"
+                else:
+                    await self._reset(pooled.context)
+            except Exception as e:
+                reason = f"reset failed ({type(e).__name__}: {e})"
+
+        if reason is None:
+            return pooled
+
+        self.logger.debug(f"♻️  Recycling browser context after {reason}")
+        self.contexts_recycled += 1
+        await self._close_context(pooled)
+        return await self._new_context(pooled.browser_slot)
+
+    async def _heap_used(self, context: BrowserContext) -> float:
+        """Total JS heap of the context's open pages in bytes"""
+        total = 0
+        for page in context.pages:
+            try:
+                total += await page.evaluate(JS_HEAP_USED_JS)
+            except Exception:
+                continue
+        return total
+
+    async def _reset(self, context: BrowserContext) -> None:
+        """Remove everything one survey left behind in the context"""
+        pages = list(context.pages)
+
+        # Origin storage (localStorage, IndexedDB, cache storage, ...) is
+        # cleared over CDP while a page still exists to open a session on
+        if pages and self.clear_origins:
+            cdp = await context.new_cdp_session(pages[0])
+            for origin in self.clear_origins:
+                await cdp.send('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': 'all'})
+            await cdp.detach()
+
+        for page in pages:
+            await page.close()
+
+        await context.clear_cookies()
+        await context.clear_permissions()
+
+    async def _ensure_browser(self, slot: int) -> Browser:
+        """Return the browser of a slot, relaunching it if it crashed"""
+        async with self._browser_locks[slot]:
+            browser = self.browsers[slot]
+
+            if browser is None or not browser.is_connected():
+                if browser is not None:
+                    self.logger.warning(f"⚠️  Browser {slot} disconnected, relaunching")
+                browser = await self.playwright.chromium.launch(headless=self.headless)
+                self.browsers[slot] = browser
+                self.browsers_launched += 1
+
+            return browser
+
+    async def _new_context(self, slot: int) -> _PooledContext:
+        """Create a fresh context on the browser of a slot"""
+        browser = await self._ensure_browser(slot)
+        context = await browser.new_context(**self.context_options)
+        if self.on_context_created:
+            await self.on_context_created(context)
+        self.contexts_created += 1
+        return _PooledContext(slot, context)
+
+    async def _close_context(self, pooled: _PooledContext) -> None:
+        """Close a context, ignoring errors of an already dead browser"""
+        try:
+            await pooled.context.close()
+        except Exception:
+            pass
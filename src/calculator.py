@@ -4,13 +4,14 @@ import random
 from typing import List, Optional
 
 
-def random_multiplier(min_val: float = 0.30, max_val: float = 0.50) -> float:
+def random_multiplier(min_val: float = 0.30, max_val: float = 0.50, rng: Optional[random.Random] = None) -> float:
     """
     Generate random multiplier between min and max values
 
     Args:
         min_val: Minimum multiplier value (default: 0.30)
         max_val: Maximum multiplier value (default: 0.50)
+        rng: Random generator to draw from (default: the global one)
 
     Returns:
         Random float between min_val and max_val
@@ -20,16 +21,17 @@ def random_multiplier(min_val: float = 0.30, max_val: float = 0.50) -> float:
         >>> 0.30 <= multiplier <= 0.50
         True
     """
-    return random.uniform(min_val, max_val)
+    return (rng or random).uniform(min_val, max_val)
 
 
-def calculate_count(base_count: int, multiplier: Optional[float] = None) -> int:
+def calculate_count(base_count: int, multiplier: Optional[float] = None, rng: Optional[random.Random] = None) -> int:
     """
     Calculate count with multiplier and round to nearest integer
 
     Args:
         base_count: Base student/child count (MS, ZS, or SD)
         multiplier: Optional specific multiplier (if None, generates random)
+        rng: Random generator for the multiplier (default: the global one)
 
     Returns:
         Rounded count (integer)
@@ -41,12 +43,12 @@ def calculate_count(base_count: int, multiplier: Optional[float] = None) -> int:
         40
     """
     if multiplier is None:
-        multiplier = random_multiplier()
+        multiplier = random_multiplier(rng=rng)
 
     return round(base_count * multiplier)
 
 
-def generate_counts_for_years(base_count: int, num_years: int = 4) -> List[int]:
+def generate_counts_for_years(base_count: int, num_years: int = 4, rng: Optional[random.Random] = None) -> List[int]:
     """
     Generate random counts for multiple school years
 
@@ -55,6 +57,7 @@ def generate_counts_for_years(base_count: int, num_years: int = 4) -> List[int]:
     Args:
         base_count: Base student/child count
         num_years: Number of years to generate (default: 4)
+        rng: Random generator (default: the global one)
 
     Returns:
         List of calculated counts for each year
@@ -66,13 +69,14 @@ def generate_counts_for_years(base_count: int, num_years: int = 4) -> List[int]:
         >>> all(29 <= c <= 49 for c in counts)  # 0.30*97 to 0.50*97
         True
     """
-    return [calculate_count(base_count) for _ in range(num_years)]
+    return [calculate_count(base_count, rng=rng) for _ in range(num_years)]
 
 
 def generate_counts_for_topics(
     base_count: int,
     num_topics: int,
-    num_years: int = 4
+    num_years: int = 4,
+    rng: Optional[random.Random] = None
 ) -> List[int]:
     """
     Generate random counts for multiple topics and years
@@ -83,6 +87,7 @@ def generate_counts_for_topics(
         base_count: Base student/child count
         num_topics: Number of topics (rows)
         num_years: Number of years (columns, default: 4)
+        rng: Random generator (default: the global one)
 
     Returns:
         Flat list of counts in row-major order (topic1_year1, topic1_year2, ...)
@@ -96,7 +101,7 @@ def generate_counts_for_topics(
 
     for _ in range(num_topics):
         for _ in range(num_years):
-            counts.append(calculate_count(base_count))
+            counts.append(calculate_count(base_count, rng=rng))
 
     return counts
 
@@ -0,0 +1,238 @@
+"""Append-only journal of per access code survey state, for resumable batches"""
+
+import atexit
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+# Lifecycle of one access code
+PENDING = 'pending'          # Config loaded, waiting for a browser
+IN_PROGRESS = 'in_progress'  # Survey started; 'page' is the last page submitted
+COMPLETED = 'completed'      # "Děkujeme Vám" reached
+FAILED = 'failed'            # Gave up ('error' says why)
+
+STATES = (PENDING, IN_PROGRESS, COMPLETED, FAILED)
+
+
+class Checkpoint:
+    """
+    Crash-safe journal of survey state per access code
+
+    Every state change is one JSON line appended with a single write() to an
+    O_APPEND file, so a crashed process loses nothing and batch threads and
+    worker processes can share the journal. fsync (needed only to survive an
+    OS crash or power loss) is batched: after `fsync_every` records or
+    `fsync_interval` seconds, and when the journal is closed. The last line
+    of a code wins; a torn last line is ignored on load and the next record
+    starts on a new line after it.
+
+    In-progress codes keep the browser storage state (cookies) of their
+    session in <journal>.states/, so a restarted run can continue the same
+    LimeSurvey session instead of logging in again.
+
+    Examples:
+        >>> journal = Checkpoint.shared("logs/wave_2025.journal")
+        >>> journal.record("ABC123", IN_PROGRESS, page=4)
+        >>> journal.state("ABC123")
+        'in_progress'
+    """
+
+    # One instance per journal and process, shared by all fillers of a batch
+    _instances: Dict[str, 'Checkpoint'] = {}
+    _instances_lock = threading.Lock()
+
+    FSYNC_EVERY = 32
+    FSYNC_INTERVAL = 1.0
+
+    def __init__(self, path: str, fsync_every: int = FSYNC_EVERY, fsync_interval: float = FSYNC_INTERVAL):
+        """
+        Args:
+            path: Journal file (JSONL, created if missing)
+            fsync_every: fsync after this many unsynced records
+            fsync_interval: fsync when the oldest unsynced record is this many seconds old
+        """
+        self.path = Path(path)
+        self.state_dir = self.path.with_name(self.path.name + '.states')
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+
+        # Latest record per access code
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._lock = threading.Lock()
+        # A crash mid-write leaves a line without '\n'; don't glue the next record onto it
+        self._torn_tail = self._ends_torn()
+        self._unsynced = 0
+        self._first_unsynced = 0.0
+
+    @classmethod
+    def shared(cls, path: str) -> 'Checkpoint':
+        """Journal for the path, opened once per process and synced at exit"""
+        key = os.path.abspath(path)
+        with cls._instances_lock:
+            if key not in cls._instances:
+                journal = cls(path)
+                atexit.register(journal.close)
+                cls._instances[key] = journal
+            return cls._instances[key]
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    self.entries[entry['code']] = entry
+                except (ValueError, KeyError, TypeError):
+                    continue
+
+    def _ends_torn(self) -> bool:
+        """Whether the journal's last line is unterminated"""
+        with open(self.path, 'rb') as f:
+            if f.seek(0, os.SEEK_END) == 0:
+                return False
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b'\n'
+
+    def record(
+        self,
+        code: str,
+        state: str,
+        config: Optional[str] = None,
+        page: Optional[int] = None,
+        error: Optional[str] = None
+    ) -> None:
+        """
+        Append a state change of an access code
+
+        Args:
+            code: Access code
+            state: One of STATES
+            config: Config path or manifest record of the code
+            page: Last page submitted (in_progress) or pages filled (completed)
+            error: Reason of a failure
+        """
+        if state not in STATES:
+            raise ValueError(f"Unknown checkpoint state: {state} (expected one of {', '.join(STATES)})")
+
+        entry = {'code': code, 'state': state, 'ts': round(time.time(), 3)}
+        previous = self.entries.get(code, {})
+        if config or previous.get('config'):
+            entry['config'] = config or previous['config']
+        if page is not None:
+            entry['page'] = page
+        if error:
+            entry['error'] = error
+
+        line = (json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8')
+
+        with self._lock:
+            if self._torn_tail:
+                line = b'\n' + line
+                self._torn_tail = False
+            os.write(self._fd, line)
+            self.entries[code] = entry
+
+            now = time.monotonic()
+            if not self._unsynced:
+                self._first_unsynced = now
+            self._unsynced += 1
+
+            if self._unsynced >= self.fsync_every or now - self._first_unsynced >= self.fsync_interval:
+                self._sync()
+
+    def _sync(self) -> None:
+        os.fsync(self._fd)
+        self._unsynced = 0
+
+    def sync(self) -> None:
+        """Flush pending records to disk"""
+        with self._lock:
+            if self._unsynced and self._fd is not None:
+                self._sync()
+
+    def close(self) -> None:
+        """Sync and close the journal"""
+        with self._lock:
+            if self._fd is None:
+                return
+            if self._unsynced:
+                self._sync()
+            os.close(self._fd)
+            self._fd = None
+
+    def state(self, code: str) -> Optional[str]:
+        """Latest state of an access code (None if never seen)"""
+        return self.entries.get(code, {}).get('state')
+
+    def is_completed(self, code: str) -> bool:
+        return self.state(code) == COMPLETED
+
+    def storage_state_path(self, code: str) -> Path:
+        """Where the browser storage state of an in-progress code is kept"""
+        return self.state_dir / (re.sub(r'[^\w-]+', '_', code) + '.json')
+
+    def resume_state(self, code: str) -> Optional[Dict[str, Any]]:
+        """
+        Saved storage state of an interrupted survey
+
+        Returns:
+            Playwright storage state (cookies, origins) if the code was in
+            progress and its state file is readable, else None
+        """
+        if self.state(code) != IN_PROGRESS:
+            return None
+
+        try:
+            with open(self.storage_state_path(code), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save_storage_state(self, code: str, storage_state: Dict[str, Any]) -> None:
+        """Atomically replace the saved storage state of a code"""
+        path = self.storage_state_path(code)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(storage_state, f)
+        os.replace(tmp_path, path)
+
+    def discard_storage_state(self, code: str) -> None:
+        try:
+            self.storage_state_path(code).unlink()
+        except FileNotFoundError:
+            pass
+
+    def summary(self) -> Counter:
+        """Number of codes per state"""
+        return Counter(entry['state'] for entry in self.entries.values())
+
+    def compact(self) -> None:
+        """Rewrite the journal with only the latest record per code"""
+        with self._lock:
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for entry in self.entries.values():
+                    f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+
+            # Keep appending to the new file
+            if self._fd is not None:
+                os.close(self._fd)
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            self._unsynced = 0
+            self._torn_tail = False
@@ -0,0 +1,253 @@
+"""Load control for many surveys against one server: AIMD concurrency, backoff, rate ceiling"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+
+class RetriesExhausted(Exception):
+    """Navigation kept failing after all backoff retries"""
+
+
+class AIMDController:
+    """
+    Number of concurrent surveys adapted to the server (additive increase, multiplicative decrease)
+
+    Every page navigation reports its latency and whether it failed (timeout,
+    5xx). While the server keeps up the limit grows by `increase` per round
+    of `limit` good pages; when the smoothed latency exceeds `tolerance` ×
+    the best latency seen (or `latency_target`), or the error rate over the
+    last `window` pages exceeds `max_error_rate`, the limit is multiplied by
+    `decrease`. The next cut waits until the surveys above the new limit
+    have finished and a round of pages was seen, so one slow burst is not
+    punished repeatedly; the error window starts over after each cut.
+
+    Examples:
+        >>> controller = AIMDController(initial=4, maximum=16)
+        >>> async with controller.slot():
+        ...     ...  # one survey
+        >>> controller.observe(0.8)           # page took 0.8 s
+        >>> controller.observe(30.0, error=True)
+    """
+
+    def __init__(
+        self,
+        initial: int = 2,
+        minimum: int = 1,
+        maximum: int = 16,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        tolerance: float = 2.0,
+        latency_target: Optional[float] = None,
+        window: int = 20,
+        max_error_rate: float = 0.1,
+        smoothing: float = 0.2
+    ):
+        """
+        Args:
+            initial: Starting number of concurrent surveys
+            minimum: Never go below this many
+            maximum: Never go above this many (e.g. the context pool size)
+            increase: Added to the limit per round of good pages
+            decrease: Factor applied to the limit on congestion
+            tolerance: Congested when smoothed latency > tolerance × best smoothed latency
+            latency_target: Also congested above this many seconds (None = baseline only)
+            window: Number of recent pages for the error rate
+            max_error_rate: Congested when the error rate over the window is above this
+            smoothing: EWMA weight of the newest latency
+        """
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.increase = increase
+        self.decrease = decrease
+        self.tolerance = tolerance
+        self.latency_target = latency_target
+        self.max_error_rate = max_error_rate
+        self.smoothing = smoothing
+
+        self.latency: Optional[float] = None   # EWMA of page latency
+        self.baseline: Optional[float] = None  # Best EWMA seen
+        self.outcomes = deque(maxlen=window)   # True = error
+        self.in_flight = 0
+        self.cuts = 0
+        self._since_cut = 0
+        self._changed: Optional[asyncio.Condition] = None
+
+    @property
+    def concurrency(self) -> int:
+        """Current number of surveys allowed to run at once"""
+        return int(self.limit)
+
+    @property
+    def error_rate(self) -> float:
+        return sum(self.outcomes) / len(self.outcomes) if self.outcomes else 0.0
+
+    def _condition(self) -> asyncio.Condition:
+        # Created lazily inside the running event loop
+        if self._changed is None:
+            self._changed = asyncio.Condition()
+        return self._changed
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one of the currently allowed survey slots"""
+        changed = self._condition()
+
+        async with changed:
+            await changed.wait_for(lambda: self.in_flight < self.concurrency)
+            self.in_flight += 1
+
+        try:
+            yield
+
+        finally:
+            async with changed:
+                self.in_flight -= 1
+                changed.notify_all()
+
+    def congested(self) -> bool:
+        """Whether the latest observations show an overloaded server"""
+        # Error rate only once the window is half full (since the last cut)
+        if len(self.outcomes) * 2 >= self.outcomes.maxlen and self.error_rate > self.max_error_rate:
+            return True
+        if self.latency is None:
+            return False
+        if self.latency_target and self.latency > self.latency_target:
+            return True
+        return self.baseline is not None and self.latency > self.baseline * self.tolerance
+
+    def observe(self, latency: float, error: bool = False) -> None:
+        """
+        Report one page navigation
+
+        Args:
+            latency: Seconds from submit to the next page (or to the failure)
+            error: Navigation timed out or the server answered 5xx
+        """
+        self.outcomes.append(error)
+        if not error:
+            self.latency = latency if self.latency is None else (
+                self.smoothing * latency + (1 - self.smoothing) * self.latency
+            )
+            if len(self.outcomes) >= 5:
+                self.baseline = self.latency if self.baseline is None else min(self.baseline, self.latency)
+
+        self._since_cut += 1
+        previous = self.concurrency
+
+        if self.congested():
+            # Once per round, and only after the last cut has taken effect
+            # (surveys started under the old limit hold their slots to the end)
+            settled = self.in_flight <= self.concurrency and self._since_cut >= self.limit
+            if settled and self.limit > self.minimum:
+                self.limit = max(self.minimum, self.limit * self.decrease)
+                self._since_cut = 0
+                self.cuts += 1
+                # Judge the new limit by its own pages
+                self.outcomes.clear()
+        elif not error:
+            self.limit = min(self.maximum, self.limit + self.increase / self.limit)
+
+        if self.concurrency > previous and self._changed is not None:
+            # Waiting slot() calls re-check the grown limit
+            asyncio.get_running_loop().create_task(self._wake())
+
+    async def _wake(self) -> None:
+        async with self._condition():
+            self._condition().notify_all()
+
+    def summary(self) -> str:
+        latency = f"{self.latency:.2f}s" if self.latency is not None else "-"
+        return (
+            f"concurrency {self.concurrency} (range {self.minimum}-{self.maximum}), "
+            f"page latency {latency}, error rate {self.error_rate:.0%}, {self.cuts} cuts"
+        )
+
+
+class Backoff:
+    """
+    Jittered exponential backoff ("full jitter")
+
+    Examples:
+        >>> backoff = Backoff(base=1.0, cap=30.0)
+        >>> 0 <= backoff.delay(3) <= 8.0
+        True
+    """
+
+    def __init__(self, base: float = 1.0, cap: float = 30.0, factor: float = 2.0):
+        """
+        Args:
+            base: Upper bound of the first delay (seconds)
+            cap: Upper bound of any delay
+            factor: Growth of the bound per attempt
+        """
+        self.base = base
+        self.cap = cap
+        self.factor = factor
+
+    def delay(self, attempt: int) -> float:
+        """Random delay before retry number `attempt` (0-based)"""
+        return random.uniform(0, min(self.cap, self.base * self.factor ** attempt))
+
+
+class RateLimiter:
+    """
+    Token bucket capping page requests per second for all workers of a process
+
+    Thread-safe; sync fillers sleep in wait(), async fillers await
+    wait_async(). Requests beyond the burst are scheduled one 1/rate apart.
+
+    Examples:
+        >>> limiter = RateLimiter(rate=5.0, burst=5)
+        >>> limiter.reserve()
+        0.0
+    """
+
+    # One bucket per rate and process, shared by all fillers
+    _instances: Dict[float, 'RateLimiter'] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        """
+        Args:
+            rate: Requests per second
+            burst: Requests allowed at once after an idle period (default: max(1, rate))
+        """
+        if rate <= 0:
+            raise ValueError(f"Rate must be positive, got {rate}")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, rate: float) -> 'RateLimiter':
+        with cls._instances_lock:
+            if rate not in cls._instances:
+                cls._instances[rate] = cls(rate)
+            return cls._instances[rate]
+
+    def reserve(self) -> float:
+        """Take a token; returns seconds to wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def wait(self) -> None:
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def wait_async(self) -> None:
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
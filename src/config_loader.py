@@ -1,8 +1,18 @@
 """Configuration loader and validator for JSON input files"""
 
+import glob
 import json
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional, Tuple, TYPE_CHECKING
+
+from src.manifest import RECORD_SUFFIXES, ManifestIndex, parse_ref
+
+if TYPE_CHECKING:
+    from src.fill_plan import FillPlan
+
+
+# Manifest file suffixes (one config path per line)
+MANIFEST_SUFFIXES = ('.txt', '.lst')
 
 
 class ConfigValidationError(Exception):
@@ -15,7 +25,8 @@ def load_config(filepath: str) -> Dict[str, Any]:
     Load and validate JSON configuration file
 
     Args:
-        filepath: Path to JSON configuration file
+        filepath: Path to JSON configuration file, or a manifest record
+            reference ("wave.jsonl#17", see collect_config_paths)
 
     Returns:
         Validated configuration dictionary
@@ -24,17 +35,69 @@ def load_config(filepath: str) -> Dict[str, Any]:
         ConfigValidationError: If validation fails
         FileNotFoundError: If file doesn't exist
     """
+    raw, parse = _read_source(filepath)
+    return parse(raw)
+
+
+def load_config_and_plan(
+    filepath: str,
+    plan_cache_dir: Optional[str] = None
+) -> Tuple[Dict[str, Any], 'FillPlan']:
+    """
+    Load and validate a configuration and compile its FillPlan (see src.fill_plan)
+
+    Args:
+        filepath: Path to JSON configuration file or manifest record reference
+        plan_cache_dir: Directory caching (config, plan) by file content hash,
+            so unchanged configs skip parsing and compilation
+
+    Returns:
+        (validated configuration dictionary, FillPlan)
+
+    Raises:
+        ConfigValidationError: If validation fails
+        FileNotFoundError: If file doesn't exist
+    """
+    # fill_plan builds on the getters below
+    from src.fill_plan import load_plan
+
+    raw, parse = _read_source(filepath)
+    return load_plan(raw, parse, plan_cache_dir)
+
+
+def _read_source(filepath: str) -> Tuple[bytes, Callable[[bytes], Dict[str, Any]]]:
+    """Raw content of a config file or manifest record, and its parser"""
+    ref = parse_ref(filepath)
+
+    if ref:
+        manifest_path, record = ref
+        if not Path(manifest_path).exists():
+            raise FileNotFoundError(f"Manifest not found: {manifest_path}")
+
+        # Only this record is read and parsed
+        manifest = ManifestIndex.shared(manifest_path)
+
+        def parse(source: bytes) -> Dict[str, Any]:
+            return _validated(manifest.parse(source))
+
+        return manifest.source(record), parse
+
     path = Path(filepath)
 
     if not path.exists():
         raise FileNotFoundError(f"Configuration file not found: {filepath}")
 
-    with open(path, 'r', encoding='utf-8') as f:
-        config = json.load(f)
+    return path.read_bytes(), _parse_config
+
+
+def _parse_config(raw: bytes) -> Dict[str, Any]:
+    """Parse and validate configuration file content"""
+    return _validated(json.loads(raw.decode('utf-8')))
 
-    # Validate required fields
-    _validate_config(config)
 
+def _validated(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate required fields and return the config"""
+    _validate_config(config)
     return config
 
 
@@ -46,11 +109,38 @@ def _validate_config(config: Dict[str, Any]) -> None:
         config: Configuration dictionary to validate
 
     Raises:
-        ConfigValidationError: If validation fails
+        ConfigValidationError: If validation fails (first problem found)
     """
+    errors = config_errors(config)
+
+    if errors:
+        raise ConfigValidationError(errors[0])
+
+
+def config_errors(config: Dict[str, Any]) -> List[str]:
+    """
+    Collect all structural problems of a configuration
+
+    Args:
+        config: Parsed configuration
+
+    Returns:
+        Error messages in check order (empty if the structure is valid)
+
+    Examples:
+        >>> config_errors({'code': 'ABC', 'MS': 10})
+        []
+        >>> config_errors({'MS': '10'})
+        ["Missing required field: 'code'", "Field 'MS' must be an integer", 'At least one school type (MS, ZS, SD) must have a count > 0']
+    """
+    if not isinstance(config, dict):
+        return ["Configuration must be a JSON object"]
+
+    errors = []
+
     # Required: access code
     if 'code' not in config or not config['code']:
-        raise ConfigValidationError("Missing required field: 'code'")
+        errors.append("Missing required field: 'code'")
 
     # Required: at least one school type with count > 0
     school_types = ['MS', 'ZS', 'SD']
@@ -59,42 +149,37 @@ def _validate_config(config: Dict[str, Any]) -> None:
     for school_type in school_types:
         if school_type in config:
             if not isinstance(config[school_type], int):
-                raise ConfigValidationError(f"Field '{school_type}' must be an integer")
-            if config[school_type] > 0:
+                errors.append(f"Field '{school_type}' must be an integer")
+            elif config[school_type] > 0:
                 has_school = True
 
     if not has_school:
-        raise ConfigValidationError(
-            "At least one school type (MS, ZS, SD) must have a count > 0"
-        )
+        errors.append("At least one school type (MS, ZS, SD) must have a count > 0")
 
     # Optional: dvpp_topics validation
     if 'dvpp_topics' in config:
         if not isinstance(config['dvpp_topics'], dict):
-            raise ConfigValidationError("Field 'dvpp_topics' must be a dictionary")
-
-        for key, topics in config['dvpp_topics'].items():
-            if not isinstance(topics, list):
-                raise ConfigValidationError(
-                    f"dvpp_topics['{key}'] must be a list of strings"
-                )
+            errors.append("Field 'dvpp_topics' must be a dictionary")
+        else:
+            for key, topics in config['dvpp_topics'].items():
+                if not isinstance(topics, list):
+                    errors.append(f"dvpp_topics['{key}'] must be a list of strings")
 
     # Optional: sdp_zzor validation
     if 'sdp_zzor' in config:
         if not isinstance(config['sdp_zzor'], dict):
-            raise ConfigValidationError("Field 'sdp_zzor' must be a dictionary")
+            errors.append("Field 'sdp_zzor' must be a dictionary")
+        else:
+            for activity, topics in config['sdp_zzor'].items():
+                if not isinstance(topics, dict):
+                    errors.append(f"sdp_zzor['{activity}'] must be a dictionary")
+                    continue
 
-        for activity, topics in config['sdp_zzor'].items():
-            if not isinstance(topics, dict):
-                raise ConfigValidationError(
-                    f"sdp_zzor['{activity}'] must be a dictionary"
-                )
+                for topic, years in topics.items():
+                    if not isinstance(years, dict):
+                        errors.append(f"sdp_zzor['{activity}']['{topic}'] must be a dictionary")
 
-            for topic, years in topics.items():
-                if not isinstance(years, dict):
-                    raise ConfigValidationError(
-                        f"sdp_zzor['{activity}']['{topic}'] must be a dictionary"
-                    )
+    return errors
 
 
 def get_school_types(config: Dict[str, Any]) -> list[str]:
@@ -158,3 +243,72 @@ def get_sdp_zzor_topics(config: Dict[str, Any], activity_key: str) -> Dict[str,
     """
     sdp_zzor = config.get('sdp_zzor', {})
     return sdp_zzor.get(activity_key, {})
+
+
+def collect_config_paths(sources: List[str]) -> List[str]:
+    """
+    Expand batch sources into a list of config file paths
+
+    Each source may be:
+    - a directory (all *.json files in it)
+    - a glob pattern (e.g. "data/*.json")
+    - a manifest file (.txt/.lst) with one config path per line, '#' starts a comment;
+      relative paths are resolved against the manifest's directory
+    - a single JSON config file
+    - a JSONL/CSV manifest with one config per line (see src.manifest); each
+      record becomes a reference like "wave.jsonl#17" that load_config accepts
+
+    Args:
+        sources: List of directories, globs, manifests or files
+
+    Returns:
+        Config paths (or record references) in order, duplicates removed
+
+    Raises:
+        FileNotFoundError: If a source matches nothing
+    """
+    paths = []
+
+    for source in sources:
+        source_path = Path(source)
+
+        if source_path.is_dir():
+            matched = sorted(str(p) for p in source_path.glob('*.json'))
+        elif glob.has_magic(source):
+            matched = sorted(glob.glob(source))
+        elif source_path.suffix in MANIFEST_SUFFIXES and source_path.exists():
+            matched = _read_manifest(source_path)
+        elif source_path.exists():
+            matched = [str(source_path)]
+        else:
+            matched = []
+
+        if not matched:
+            raise FileNotFoundError(f"No configuration files found for: {source}")
+
+        for path in matched:
+            if path.endswith(RECORD_SUFFIXES):
+                paths.extend(ManifestIndex.shared(path).refs())
+            else:
+                paths.append(path)
+
+    # Keep first occurrence only
+    return list(dict.fromkeys(paths))
+
+
+def _read_manifest(manifest_path: Path) -> List[str]:
+    """Read config paths listed in a manifest file"""
+    paths = []
+
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+
+            path = Path(line)
+            if not path.is_absolute():
+                path = manifest_path.parent / path
+            paths.append(str(path))
+
+    return paths
@@ -0,0 +1,193 @@
+"""Bulk validation of school configurations (no browser needed)"""
+
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.config_loader import config_errors
+from src.fill_plan import JSON_YEARS
+from src.manifest import parse_ref, read_record
+from src.question_detector import RULES
+from src.survey_pages import TOPIC_LABELS
+from src.text_normalizer import normalize_for_checkbox_matching
+
+
+# Accepted year keys of sdp_zzor topics; 2025/2026 is always left empty
+EMPTY_YEAR = "2025-2026"
+YEAR_KEYS = JSON_YEARS + (EMPTY_YEAR,)
+
+
+def _known_keys() -> Tuple[Dict[str, str], Dict[str, str]]:
+    """json_key → school type of DVPP and SDP/ŽZOR activities known to the detector"""
+    sdp_zzor = {rule.info.json_key: rule.info.school_type for rule in RULES if rule.info.calculation == 'from_json'}
+    dvpp = {
+        rule.info.json_key: rule.info.school_type
+        for rule in RULES
+        if rule.info.json_key and rule.info.json_key not in sdp_zzor
+    }
+    return dvpp, sdp_zzor
+
+
+DVPP_KEYS, SDP_ZZOR_KEYS = _known_keys()
+
+# Checkbox labels as matched by SELECT_TOPICS_JS: exact normalized label,
+# or first word when it is longer than 3 characters. TOPIC_LABELS is the
+# survey stub's copy of the live labels, which may differ, so a topic that
+# misses them is only a warning
+_LABELS = frozenset(normalize_for_checkbox_matching(label) for label in TOPIC_LABELS)
+_LABEL_FIRST_WORDS = frozenset(label.split(' ')[0] for label in _LABELS)
+
+
+def topic_matches_label(topic: str) -> bool:
+    """
+    Check that a topic finds its checkbox among the known labels (TOPIC_LABELS)
+
+    Examples:
+        >>> topic_matches_label("inkluze")
+        True
+        >>> topic_matches_label("EVVO")
+        True
+        >>> topic_matches_label("robotika")
+        False
+    """
+    normalized = normalize_for_checkbox_matching(topic)
+    if normalized in _LABELS:
+        return True
+    first_word = normalized.split(' ')[0]
+    return len(first_word) > 3 and first_word in _LABEL_FIRST_WORDS
+
+
+class ValidationResult:
+    """Problems found in one config file"""
+
+    def __init__(self, config_path: str, errors: List[str], warnings: List[str]):
+        self.config_path = config_path
+        self.errors = errors
+        self.warnings = warnings
+
+    @property
+    def valid(self) -> bool:
+        return not self.errors
+
+    def __repr__(self) -> str:
+        return f"ValidationResult(config={self.config_path}, errors={len(self.errors)}, warnings={len(self.warnings)})"
+
+
+def _check_topics(section: str, key: str, topics: Iterable, errors: List[str], warnings: List[str]) -> None:
+    for topic in topics:
+        if not isinstance(topic, str):
+            errors.append(f"{section}['{key}']: topic {topic!r} must be a string")
+        elif not topic_matches_label(topic):
+            warnings.append(f"{section}['{key}']: topic '{topic}' matches no known checkbox label, check it against the survey")
+
+
+def _entries(config: Dict, section: str, types) -> List[Tuple[str, object]]:
+    """Items of a config section whose values have the expected type"""
+    entries = config.get(section, {})
+    if not isinstance(entries, dict):
+        return []
+    return [(key, value) for key, value in entries.items() if isinstance(value, types)]
+
+
+def _count(config: Dict, school_type: str) -> Optional[int]:
+    """Count of a school type, None if it is not an integer"""
+    count = config.get(school_type, 0)
+    return count if isinstance(count, int) else None
+
+
+def cross_check(config: Dict) -> Tuple[List[str], List[str]]:
+    """
+    Check a config against what the survey offers
+
+    Parts with a wrong structure (reported by config_errors) are skipped.
+
+    - dvpp_topics / sdp_zzor keys must be json_keys known to question_detector
+    - topics must be strings
+    - sdp_zzor year keys must be YEAR_KEYS with non-negative integer counts
+    - topics that match no known checkbox label (TOPIC_LABELS) (warning)
+    - activities of a school type with count 0 are never shown (warning)
+    - non-zero 2025-2026 counts are ignored, the year stays empty (warning)
+
+    Returns:
+        (errors, warnings)
+    """
+    errors, warnings = [], []
+
+    sections = (
+        ('dvpp_topics', DVPP_KEYS),
+        ('sdp_zzor', SDP_ZZOR_KEYS),
+    )
+
+    for section, known in sections:
+        for key, topics in _entries(config, section, (list, dict)):
+            if key not in known:
+                errors.append(f"{section}: unknown activity key '{key}' (expected one of: {', '.join(known)})")
+            elif _count(config, known[key]) == 0:
+                warnings.append(f"{section}['{key}']: {known[key]} count is 0, the section is never shown")
+
+            _check_topics(section, key, topics, errors, warnings)
+
+    for key, topics in _entries(config, 'sdp_zzor', dict):
+        for topic, years in topics.items():
+            if not isinstance(years, dict):
+                continue
+            for year, count in years.items():
+                where = f"sdp_zzor['{key}']['{topic}']['{year}']"
+                if year not in YEAR_KEYS:
+                    errors.append(f"{where}: unknown school year (expected one of: {', '.join(YEAR_KEYS)})")
+                elif not isinstance(count, int) or isinstance(count, bool) or count < 0:
+                    errors.append(f"{where}: count must be a non-negative integer, got {count!r}")
+                elif year == EMPTY_YEAR and count:
+                    warnings.append(f"{where}: ignored, {EMPTY_YEAR} always stays empty")
+
+    return errors, warnings
+
+
+def validate_file(config_path: str) -> ValidationResult:
+    """Collect all errors and warnings of one config file"""
+    try:
+        if parse_ref(config_path):
+            _, config = read_record(config_path)
+        else:
+            with open(config_path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+    except FileNotFoundError:
+        return ValidationResult(config_path, ["File not found"], [])
+    except IndexError as e:
+        return ValidationResult(config_path, [str(e)], [])
+    except (ValueError, UnicodeDecodeError) as e:
+        kind = 'record' if parse_ref(config_path) else 'JSON'
+        return ValidationResult(config_path, [f"Invalid {kind}: {e}"], [])
+
+    errors = config_errors(config)
+    if not isinstance(config, dict):
+        return ValidationResult(config_path, errors, [])
+
+    cross_errors, warnings = cross_check(config)
+    return ValidationResult(config_path, errors + cross_errors, warnings)
+
+
+def validate_files(config_paths: List[str], processes: Optional[int] = None) -> List[ValidationResult]:
+    """
+    Validate many config files in parallel worker processes
+
+    Args:
+        config_paths: Config files to check
+        processes: Worker processes (default: CPU count; 1 = in this process)
+
+    Returns:
+        Results in the order of config_paths
+    """
+    processes = max(1, min(processes or os.cpu_count() or 1, len(config_paths)))
+
+    if processes == 1:
+        return [validate_file(path) for path in config_paths]
+
+    # Files are cheap to check, so hand them out in large chunks
+    chunksize = max(1, len(config_paths) // (processes * 4))
+
+    mp_context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=processes, mp_context=mp_context) as executor:
+        return list(executor.map(validate_file, config_paths, chunksize=chunksize))
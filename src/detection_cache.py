@@ -0,0 +1,148 @@
+"""Persistent cache of page detection results keyed by question text hash"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from src.question_detector import QuestionInfo, RULES_VERSION, detect_question_type
+
+
+def text_digest(question_text: str) -> str:
+    """
+    Content hash of a raw question text
+
+    Examples:
+        >>> text_digest("Kolik dětí")[:12]
+        '146507add2de'
+    """
+    return hashlib.sha256(question_text.encode('utf-8')).hexdigest()
+
+
+def _info_to_dict(info: Optional[QuestionInfo]) -> Optional[Dict[str, Optional[str]]]:
+    if info is None:
+        return None
+    return {name: getattr(info, name) for name in QuestionInfo.__slots__}
+
+
+class DetectionCache:
+    """
+    Question text hash → detected QuestionInfo, stored as JSONL on disk
+
+    Question texts are the same for every school, so after the first survey
+    every page is known and detection is skipped. Each line holds the rules
+    version, the hash and the result (null for unknown pages, with a text
+    sample for triage). Lines from another RULES_VERSION are ignored and
+    dropped from the file when it is loaded, so changing the detection rules
+    invalidates the cache.
+
+    Lines are appended one write at a time, so batch threads and worker
+    processes can share one file; a torn or foreign line is skipped on load.
+
+    Examples:
+        >>> cache = DetectionCache.shared("logs/detection_cache.jsonl")
+        >>> info, digest, known = cache.detect("... šablony 1.I/4 ... témata ...")
+    """
+
+    # One instance per path and process, shared by all fillers of a batch
+    _instances: Dict[str, 'DetectionCache'] = {}
+    _instances_lock = threading.Lock()
+
+    SAMPLE_CHARS = 200
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: JSONL cache file (created on first write)
+        """
+        self.path = Path(path)
+        self.entries: Dict[str, Optional[QuestionInfo]] = {}
+        self.samples: Dict[str, str] = {}  # Text samples of unknown pages
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    @classmethod
+    def shared(cls, path: str) -> 'DetectionCache':
+        """Cache instance for the path, loaded once per process"""
+        key = os.path.abspath(path)
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(path)
+            return cls._instances[key]
+
+    def _load(self) -> None:
+        """Read current-version entries; rewrite the file if it holds stale ones"""
+        if not self.path.exists():
+            return
+
+        stale = 0
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    if record['rules'] != RULES_VERSION:
+                        stale += 1
+                        continue
+                    info = record['info']
+                    self.entries[record['hash']] = QuestionInfo(**info) if info is not None else None
+                    if 'sample' in record:
+                        self.samples[record['hash']] = record['sample']
+                except (ValueError, KeyError, TypeError):
+                    stale += 1
+
+        if stale:
+            self._rewrite()
+
+    def _rewrite(self) -> None:
+        """Replace the file with the current entries only"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for digest, info in self.entries.items():
+                f.write(self._record(digest, info, self.samples.get(digest)) + '\n')
+        os.replace(tmp_path, self.path)
+
+    def _record(self, digest: str, info: Optional[QuestionInfo], question_text: str = None) -> str:
+        record = {'rules': RULES_VERSION, 'hash': digest, 'info': _info_to_dict(info)}
+        if info is None and question_text:
+            record['sample'] = question_text[:self.SAMPLE_CHARS]
+        return json.dumps(record, ensure_ascii=False)
+
+    def _append(self, line: str) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+
+    def detect(self, question_text: str) -> Tuple[Optional[QuestionInfo], str, bool]:
+        """
+        Detect the page type, from the cache when the text is known
+
+        Args:
+            question_text: Raw question text of the page
+
+        Returns:
+            (QuestionInfo or None for unknown pages, text hash, True if the
+            result came from the cache)
+        """
+        digest = text_digest(question_text)
+
+        with self._lock:
+            if digest in self.entries:
+                self.hits += 1
+                return self.entries[digest], digest, True
+
+        info = detect_question_type(question_text)
+
+        with self._lock:
+            self.misses += 1
+            if digest not in self.entries:
+                self.entries[digest] = info
+                if info is None:
+                    self.samples[digest] = question_text[:self.SAMPLE_CHARS]
+                self._append(self._record(digest, info, question_text))
+
+        return info, digest, False
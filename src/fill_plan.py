@@ -0,0 +1,232 @@
+"""Compiled, immutable fill plan of a school configuration"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from src.config_loader import get_school_types, get_base_count, get_dvpp_topics, get_sdp_zzor_topics
+from src.text_normalizer import normalize_many, normalize_for_checkbox_matching
+
+
+# Bump when compile_plan or the cache file layout changes, so cached plans are recompiled
+PLAN_FORMAT = 2
+
+# School years with values in JSON ("2022-2023" keys); 2025/2026 is always 0
+JSON_YEARS = ("2022-2023", "2023-2024", "2024-2025")
+
+
+class _Frozen:
+    """Slots-based immutable value (same contract as QuestionInfo)"""
+
+    __slots__ = ()
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            object.__setattr__(self, name, fields[name])
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable (cannot set '{name}')")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable (cannot delete '{name}')")
+
+    def _key(self) -> Tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other) -> bool:
+        return type(other) is type(self) and self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __reduce__(self):
+        return (_rebuild, (type(self), dict(zip(self.__slots__, self._key()))))
+
+
+def _rebuild(cls, fields):
+    return cls(**fields)
+
+
+class TopicPlan(_Frozen):
+    """
+    Topics of one activity, ready to ship into the page
+
+    Attributes:
+        topics: Topic names as in JSON (for logging and the count page)
+        normalized: Topics normalized for checkbox label matching (SELECT_TOPICS_JS)
+        values: Row-major table values, 4 per topic (JSON_YEARS, then 0 for
+            2025/2026); empty for DVPP activities, whose counts are random per
+            run, and for activities missing in the config
+    """
+
+    __slots__ = ('topics', 'normalized', 'values')
+
+    def __init__(self, topics: Tuple[str, ...] = (), normalized: Tuple[str, ...] = (),
+                 values: Tuple[Any, ...] = ()):
+        super().__init__(topics=topics, normalized=normalized, values=values)
+
+    def __len__(self) -> int:
+        return len(self.topics)
+
+    def __repr__(self) -> str:
+        return f"TopicPlan(topics={len(self.topics)}, values={len(self.values)})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'topics': list(self.topics), 'normalized': list(self.normalized), 'values': list(self.values)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TopicPlan':
+        return cls(tuple(data['topics']), tuple(data['normalized']), tuple(data['values']))
+
+
+NO_TOPICS = TopicPlan()
+
+
+class FillPlan(_Frozen):
+    """
+    Everything the page handlers need from a config, precomputed
+
+    Activities are keyed like the config (QuestionInfo.json_key): `dvpp` by
+    the dvpp_topics keys, `sdp_zzor` by the sdp_zzor keys.
+
+    Examples:
+        >>> plan = compile_plan({'code': 'X', 'MS': 20, 'dvpp_topics': {'k': ['Inkluze (IKAP)']}})
+        >>> plan.dvpp_topics('k').normalized
+        ('inkluze',)
+        >>> plan.base_count('MS'), plan.base_count('ZS')
+        (20, 0)
+    """
+
+    __slots__ = ('school_types', 'base_counts', 'dvpp', 'sdp_zzor', 'content_hash')
+
+    def __init__(self, school_types: Tuple[str, ...], base_counts: Tuple[Tuple[str, int], ...],
+                 dvpp: Tuple[Tuple[str, TopicPlan], ...], sdp_zzor: Tuple[Tuple[str, TopicPlan], ...],
+                 content_hash: str = ''):
+        super().__init__(school_types=school_types, base_counts=base_counts,
+                         dvpp=dvpp, sdp_zzor=sdp_zzor, content_hash=content_hash)
+
+    def base_count(self, school_type: str) -> int:
+        """Base student/child count for a school type (0 if missing)"""
+        return dict(self.base_counts).get(school_type, 0)
+
+    def dvpp_topics(self, activity_key: str) -> TopicPlan:
+        """DVPP topics of an activity (empty TopicPlan if not in config)"""
+        return dict(self.dvpp).get(activity_key, NO_TOPICS)
+
+    def sdp_zzor_topics(self, activity_key: str) -> TopicPlan:
+        """SDP/ŽZOR topics with JSON values of an activity (empty TopicPlan if not in config)"""
+        return dict(self.sdp_zzor).get(activity_key, NO_TOPICS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready form of the plan (plan cache files)"""
+        return {
+            'school_types': list(self.school_types),
+            'base_counts': [list(pair) for pair in self.base_counts],
+            'dvpp': [[key, topics.to_dict()] for key, topics in self.dvpp],
+            'sdp_zzor': [[key, topics.to_dict()] for key, topics in self.sdp_zzor],
+            'content_hash': self.content_hash,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FillPlan':
+        """
+        Rebuild a plan from to_dict() output
+
+        Raises:
+            KeyError, TypeError, ValueError: If the data is not a plan
+        """
+        return cls(
+            school_types=tuple(data['school_types']),
+            base_counts=tuple((school_type, count) for school_type, count in data['base_counts']),
+            dvpp=tuple((key, TopicPlan.from_dict(topics)) for key, topics in data['dvpp']),
+            sdp_zzor=tuple((key, TopicPlan.from_dict(topics)) for key, topics in data['sdp_zzor']),
+            content_hash=data['content_hash'],
+        )
+
+    def __repr__(self) -> str:
+        return f"FillPlan(schools={','.join(self.school_types)}, dvpp={len(self.dvpp)}, sdp_zzor={len(self.sdp_zzor)})"
+
+
+def _topic_plan(topics, values=()) -> TopicPlan:
+    topics = tuple(topics)
+    normalized = tuple(normalize_many(normalize_for_checkbox_matching(topic) for topic in topics))
+    return TopicPlan(topics, normalized, values)
+
+
+def compile_plan(config: Dict[str, Any], content_hash: str = '') -> FillPlan:
+    """
+    Compile a validated config into a FillPlan
+
+    Args:
+        config: Configuration dictionary (see load_config)
+        content_hash: Hash of the config file content, recorded in the plan
+
+    Returns:
+        Immutable fill plan
+    """
+    dvpp = tuple(
+        (key, _topic_plan(get_dvpp_topics(config, key)))
+        for key in config.get('dvpp_topics', {})
+    )
+
+    sdp_zzor = []
+    for key in config.get('sdp_zzor', {}):
+        topics_data = get_sdp_zzor_topics(config, key)
+        values = []
+        for years_data in topics_data.values():
+            values.extend(years_data.get(year, 0) for year in JSON_YEARS)
+            values.append(0)
+        sdp_zzor.append((key, _topic_plan(topics_data, tuple(values))))
+
+    school_types = tuple(get_school_types(config))
+    base_counts = tuple((school_type, get_base_count(config, school_type)) for school_type in ('MS', 'ZS', 'SD'))
+
+    return FillPlan(school_types, base_counts, dvpp, tuple(sdp_zzor), content_hash)
+
+
+def load_plan(raw: bytes, parse: Callable[[bytes], Dict[str, Any]],
+              cache_dir: Optional[str] = None) -> Tuple[Dict[str, Any], FillPlan]:
+    """
+    Parse and compile a config file content, through the on-disk plan cache
+
+    The cache file is keyed by the sha256 of the content and PLAN_FORMAT, so
+    an edited config or a new plan format is compiled again. Cache files are
+    plain JSON (never executed on load); unreadable or mismatching ones are
+    ignored and rewritten.
+
+    Args:
+        raw: Config file content
+        parse: Parser and validator of the content (config_loader)
+        cache_dir: Directory of JSON (config, plan) files, None = no cache
+
+    Returns:
+        (config dictionary, FillPlan)
+    """
+    content_hash = hashlib.sha256(raw).hexdigest()
+
+    cache_path = Path(cache_dir) / f"plan_v{PLAN_FORMAT}_{content_hash}.json" if cache_dir else None
+
+    if cache_path and cache_path.exists():
+        try:
+            with open(cache_path, encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached['format'] == PLAN_FORMAT and isinstance(cached['config'], dict):
+                plan = FillPlan.from_dict(cached['plan'])
+                if plan.content_hash == content_hash:
+                    return cached['config'], plan
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    config = parse(raw)
+    plan = compile_plan(config, content_hash)
+
+    if cache_path:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'format': PLAN_FORMAT, 'config': config, 'plan': plan.to_dict()}, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+
+    return config, plan
@@ -1,19 +1,28 @@
 """Main form filler automation using Playwright"""
 
 import time
-from typing import Dict, List, Any
-from playwright.sync_api import sync_playwright, Page, Browser, TimeoutError
-
-from src.config_loader import (
-    load_config,
-    get_school_types,
-    get_base_count,
-    get_dvpp_topics,
-    get_sdp_zzor_topics
+import logging
+from contextlib import contextmanager
+from collections import Counter
+from typing import Callable, Dict, List, Any, Optional
+from playwright.sync_api import sync_playwright, Page, Browser
+
+from src.config_loader import load_config_and_plan, get_school_types
+from src.question_detector import detect_question_type, QuestionInfo
+from src.detection_cache import DetectionCache
+from src.page_corpus import PageCorpus
+from src.checkpoint import Checkpoint, PENDING, IN_PROGRESS, COMPLETED, FAILED
+from src.concurrency import Backoff, RateLimiter, RetriesExhausted
+from src.page_transition import arm_transition, wait_for_transition
+from src.page_snapshot import PageSnapshot, take_snapshot
+from src.resource_policy import ResourcePolicy
+from src.metrics import Tracer
+from src.page_scripts import (
+    FILL_ALL_ZERO_JS,
+    SELECT_TOPICS_JS,
+    FILL_VISIBLE_INPUTS_JS
 )
-from src.question_detector import detect_question_type, is_completion_page, QuestionInfo
-from src.calculator import generate_counts_for_years, generate_counts_for_topics
-from src.text_normalizer import normalize_czech_text, normalize_for_checkbox_matching, compare_texts, convert_year_format
+from src.value_planner import ValuePlanner
 from src.logger_config import (
     setup_logger,
     log_section,
@@ -28,18 +37,69 @@ from src.logger_config import (
 )
 
 
-class FormFiller:
+class FormFiller(ValuePlanner):
     """Main form filler class"""
 
     FORM_URL = "https://evaluace.opjak.cz/index.php/262621"
     SCHOOL_YEARS = ["2022/2023", "2023/2024", "2024/2025"]  # 2025/2026 always stays empty!
+    TRANSITION_TIMEOUT = 30.0  # Upper bound (seconds) for waiting on the next page
+    MAX_PAGES = 50  # Safety limit
+
+    # Failed navigations (timeout, 5xx) are retried after a jittered,
+    # exponentially growing pause; the survey fails after MAX_RETRIES in a row
+    BACKOFF = Backoff(base=1.0, cap=30.0)
+    MAX_RETRIES = 5
+
+    # Access code input on the login page
+    TOKEN_SELECTORS = [
+        'input[type="text"]',
+        'input[name="token"]',
+        '#token',
+        'input.form-control',
+    ]
+
+    # Submit button on the login page
+    SUBMIT_SELECTORS = [
+        'button:has-text("Pokračovat")',
+        'button[type="submit"]',
+        'input[type="submit"]',
+        '.btn-primary',
+    ]
+
+    # "Další" (Next) button on survey pages
+    NEXT_SELECTORS = [
+        'button:has-text("Další")',
+        'input[type="submit"][value*="Další"]',
+        '.ls-move-forward',
+    ]
+
+    # Page type -> handler method (None: nothing to fill, just click Next).
+    # Handlers take (page, info, snapshot); AsyncFormFiller overrides them as coroutines.
+    PAGE_HANDLERS = {
+        'intro': None,
+        'skip': None,
+        'fixed_zero': 'fill_fixed_zero',
+        'simple_inputs': 'fill_simple_inputs',
+        'checkboxes': 'fill_checkboxes',
+        'table_counts': 'fill_table_counts',
+    }
 
     def __init__(
         self,
         config_path: str,
         headless: bool = True,
         verbose: bool = False,
-        code_override: str = None
+        code_override: str = None,
+        transition_timeout: float = None,
+        logger: logging.Logger = None,
+        block_resources: bool = False,
+        form_url: str = None,
+        bulk_fill: bool = False,
+        detection_cache: str = None,
+        plan_cache: str = None,
+        checkpoint: str = None,
+        max_rate: float = None,
+        capture_dir: str = None
     ):
         """
         Initialize form filler
@@ -49,11 +109,36 @@ class FormFiller:
             headless: Run browser in headless mode
             verbose: Enable verbose logging
             code_override: Override access code from JSON
+            transition_timeout: Max seconds to wait for the next page (default: TRANSITION_TIMEOUT)
+            logger: Logger to use instead of the default 'form_filler' logger
+            block_resources: Skip images, fonts, stylesheets and third-party requests
+                in contexts this filler creates (see ResourcePolicy)
+            form_url: Survey URL override (e.g. a local survey stub), default FORM_URL
+            bulk_fill: Set all fields of a page first and let LimeSurvey's
+                ExpressionManager recalculate once, instead of once per field
+                (falls back to per-field events when EM does not pick it up)
+            detection_cache: JSONL file caching detection results by question
+                text hash across runs and batch workers (see DetectionCache)
+            plan_cache: Directory caching the parsed config and its compiled
+                FillPlan by file content hash (see src.fill_plan)
+            checkpoint: Journal file of per-code state (see Checkpoint); completed
+                codes are skipped and interrupted ones resume their saved session
+            max_rate: Ceiling of page requests per second, shared by all fillers
+                of the process (see RateLimiter)
+            capture_dir: Save every visited step, anonymized, into this page
+                corpus (see PageCorpus) for offline regression checks
         """
-        self.config = load_config(config_path)
+        self.config_path = config_path
+        self.config, self.plan = load_config_and_plan(config_path, plan_cache_dir=plan_cache)
         self.headless = headless
         self.verbose = verbose
-        self.logger = setup_logger(verbose=verbose)
+        self.transition_timeout_ms = (transition_timeout or self.TRANSITION_TIMEOUT) * 1000
+        self.logger = logger or setup_logger(verbose=verbose)
+        self.form_url = form_url or self.FORM_URL
+        self.resource_policy = ResourcePolicy(self.form_url) if block_resources else None
+        self.bulk_fill = bulk_fill
+        self.detection_cache = DetectionCache.shared(detection_cache) if detection_cache else None
+        self.corpus = PageCorpus.shared(capture_dir) if capture_dir else None
 
         # Override code if provided
         if code_override:
@@ -61,13 +146,86 @@ class FormFiller:
 
         self.page_counter = 0
 
+        # Accumulated wall time per phase (login, detection, fill, navigation)
+        self.phase_times: Dict[str, float] = {}
+
+        # How page fills were applied: 'events', 'bulk' or 'fallback'
+        self.fill_modes = Counter()
+
+        # Per-step timing spans (see src.metrics for the exports)
+        self.tracer = Tracer(school=self.config.get('school_name') or self.config['code'])
+
         # Track checked topics for subsequent count pages
         self.last_checked_topics = []
 
+        # Crash-safe progress journal shared by all fillers of the process
+        self.checkpoint = Checkpoint.shared(checkpoint) if checkpoint else None
+        if self.checkpoint and self.checkpoint.state(self.config['code']) is None:
+            self._journal(PENDING)
+
+        # Storage state of a session to continue instead of logging in
+        # (handed over by the HTTP engine); checked before the checkpoint
+        self.session_state: Optional[Dict[str, Any]] = None
+
+        # Load control: request-rate ceiling, navigation outcome callback
+        # (latency seconds, failed) e.g. AIMDController.observe, 5xx counter
+        self.rate_limiter = RateLimiter.shared(max_rate) if max_rate else None
+        self.on_navigation: Optional[Callable[[float, bool], None]] = None
+        self.server_errors = 0
+        self.retries = 0
+
     def run(self) -> bool:
         """
         Main execution method
 
+        Returns:
+            True if form completed successfully, False otherwise
+        """
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=self.headless)
+
+            try:
+                return self.run_in_browser(browser)
+
+            finally:
+                if not self.headless:
+                    self.logger.info("Browser will close in 10 seconds...")
+                    time.sleep(10)
+                browser.close()
+
+    def run_in_browser(self, browser: Browser) -> bool:
+        """
+        Fill the survey in a fresh, isolated context of an already running browser
+
+        Used by batch runs, where one browser is shared by many schools.
+
+        Args:
+            browser: Running Playwright browser
+
+        Returns:
+            True if form completed successfully, False otherwise
+        """
+        context = browser.new_context()
+
+        if self.resource_policy:
+            self.resource_policy.install(context)
+
+        try:
+            page = context.new_page()
+            return self.fill(page)
+
+        finally:
+            if self.resource_policy:
+                self.logger.debug(f"Blocked requests: {self.resource_policy.summary()}")
+            context.close()
+
+    def fill(self, page: Page) -> bool:
+        """
+        Fill the whole survey in the given page
+
+        Args:
+            page: Blank Playwright page
+
         Returns:
             True if form completed successfully, False otherwise
         """
@@ -76,73 +234,278 @@ class FormFiller:
         self.logger.info(f"Code: {self.config['code']}")
         self.logger.info(f"School types: {', '.join(get_school_types(self.config))}")
 
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=self.headless)
-            page = browser.new_page()
+        if self.already_completed():
+            log_skip(self.logger, "survey", "Already completed according to the checkpoint journal")
+            return True
 
-            try:
-                # Login
-                self.login(page)
+        try:
+            page.on('response', self._on_response)
+
+            # Login (or continue the session of an interrupted run)
+            with self._timed('login', 'login'):
+                resumed = self.resume_session(page)
+                if not resumed:
+                    self.login(page)
 
-                # Process pages until completion
-                max_pages = 50  # Safety limit
-                page_count = 0
+            # Journaled only after the resume decision: a resumed code is
+            # already in progress and its record says where it stopped
+            if not resumed:
+                self._journal(IN_PROGRESS)
 
-                while page_count < max_pages:
-                    page_count += 1
+            # Process pages until completion
+            max_pages = self.MAX_PAGES
+            page_count = 0
 
-                    # Check if completion page
-                    if self.is_completion_page_check(page):
-                        log_success(self.logger, "Form completed successfully!")
-                        log_section(self.logger, "✅ DONE")
-                        return True
+            while page_count < max_pages:
+                page_count += 1
 
-                    # Process current page
-                    success = self.process_current_page(page)
+                # Read the whole step in one round trip
+                with self._timed('detection', 'page_snapshot'):
+                    snapshot = self.take_snapshot(page)
 
-                    if not success:
-                        log_warning(self.logger, "Page processing failed, but continuing...")
+                if self.corpus is not None:
+                    self._capture(page.content(), snapshot)
 
-                    # Click "Další" button
+                # Check if completion page
+                if snapshot.completed:
+                    log_success(self.logger, "Form completed successfully!")
+                    log_section(self.logger, "✅ DONE")
+                    self._journal(COMPLETED, page=page_count - 1)
+                    return True
+
+                # Validation messages mean the previous "Další" did not go through
+                if snapshot.errors:
+                    log_warning(self.logger, f"Validation messages on page: {'; '.join(snapshot.errors)}")
+
+                # Process current page
+                success = self.process_current_page(page, snapshot)
+
+                if not success:
+                    log_warning(self.logger, "Page processing failed, but continuing...")
+
+                # Click "Další" button (waits for the next page)
+                with self._timed('navigation', 'click_next'):
                     self.click_next(page)
 
-                    # Wait for page transition
-                    time.sleep(2)
+                self.save_progress(page, page_count)
 
-                log_error(self.logger, f"Max pages ({max_pages}) reached without completion")
-                return False
+            log_error(self.logger, f"Max pages ({max_pages}) reached without completion")
+            self._journal(FAILED, error=f"Max pages ({max_pages}) reached")
+            return False
+
+        except Exception as e:
+            log_error(self.logger, "Fatal error during form filling", e)
+            self._journal(FAILED, error=f"{type(e).__name__}: {e}")
+            return False
+
+    @contextmanager
+    def _timed(self, phase: str, step: str, **attrs):
+        """
+        Record the block as a tracer span and add its time to phase_times[phase]
+
+        Yields:
+            Span attribute dict (e.g. to add page_type once it is detected)
+        """
+        start = time.perf_counter()
+        try:
+            with self.tracer.span(step, phase=phase, **attrs) as span_attrs:
+                yield span_attrs
+        finally:
+            self.phase_times[phase] = self.phase_times.get(phase, 0.0) + time.perf_counter() - start
+
+    def _on_response(self, response) -> None:
+        """Count 5xx answers to page loads (not to images, scripts, ...)"""
+        if response.status >= 500 and response.request.resource_type == 'document':
+            self.server_errors += 1
+
+    def _throttle(self) -> None:
+        """Wait for the request-rate ceiling before a page request"""
+        if self.rate_limiter:
+            self.rate_limiter.wait()
+
+    def _report_navigation(self, started: float, ok: bool) -> None:
+        """Pass the outcome of a page request to the load controller (if any)"""
+        if self.on_navigation:
+            self.on_navigation(time.perf_counter() - started, not ok)
+
+    def _next_delay(self, started: float, ok: bool) -> Optional[float]:
+        """
+        Report a navigation and plan the retry of a failed one
+
+        Returns:
+            None if the navigation succeeded, else seconds to back off
+
+        Raises:
+            RetriesExhausted: After MAX_RETRIES failed navigations in a row
+        """
+        self._report_navigation(started, ok)
+
+        if ok:
+            self.retries = 0
+            return None
+
+        if self.retries >= self.MAX_RETRIES:
+            raise RetriesExhausted(f"Server did not respond after {self.MAX_RETRIES} retries")
+
+        delay = self.BACKOFF.delay(self.retries)
+        self.retries += 1
+        return delay
 
+    def _reloaded(self, snapshot: PageSnapshot, errors_before: int) -> bool:
+        """Whether a reload rendered a survey step without a server error"""
+        return self.server_errors == errors_before and (snapshot.step is not None or snapshot.completed)
+
+    def recover(self, page: Page, delay: Optional[float]) -> None:
+        """
+        Back off and reload the current step after a failed navigation
+
+        LimeSurvey keeps the step in the session, so a GET of the survey URL
+        renders the page the server last accepted; the main loop then fills
+        it again if the failed submit never arrived.
+
+        Args:
+            page: Playwright page
+            delay: Backoff from _next_delay() (None: nothing to recover)
+
+        Raises:
+            RetriesExhausted: If the server keeps failing
+        """
+        while delay is not None:
+            log_warning(self.logger, f"Retrying in {delay:.1f}s (attempt {self.retries}/{self.MAX_RETRIES})")
+            time.sleep(delay)
+
+            self._throttle()
+            errors_before = self.server_errors
+            started = time.perf_counter()
+            try:
+                page.goto(self.form_url, timeout=self.transition_timeout_ms, wait_until='domcontentloaded')
+                ok = self._reloaded(self.take_snapshot(page), errors_before)
             except Exception as e:
-                log_error(self.logger, "Fatal error during form filling", e)
-                return False
+                self.logger.debug(f"Reload failed: {e}")
+                ok = False
 
-            finally:
-                if not self.headless:
-                    self.logger.info("Browser will close in 10 seconds...")
-                    time.sleep(10)
-                browser.close()
+            delay = self._next_delay(started, ok)
+
+    def already_completed(self) -> bool:
+        """True if the checkpoint journal has this code as completed"""
+        return bool(self.checkpoint) and self.checkpoint.is_completed(self.config['code'])
+
+    def _journal(self, state: str, page: int = None, error: str = None) -> None:
+        """Record a state change of this code in the checkpoint journal (if any)"""
+        if self.checkpoint:
+            self.checkpoint.record(self.config['code'], state, config=self.config_path, page=page, error=error)
+
+            if state in (COMPLETED, FAILED):
+                self.checkpoint.discard_storage_state(self.config['code'])
+
+    def _resumed(self, snapshot: PageSnapshot) -> bool:
+        """Whether the page opened with a saved session is a survey step (not the login)"""
+        if snapshot.step is None and not snapshot.completed:
+            self.logger.info("Saved session is no longer valid, logging in again")
+            return False
+
+        log_success(self.logger, f"Resumed saved session at step {snapshot.step}")
+        return True
+
+    def _session_to_resume(self) -> Optional[Dict[str, Any]]:
+        """Handed-over session state, else the one saved in the checkpoint journal"""
+        if self.session_state is not None:
+            return self.session_state
+        return self.checkpoint.resume_state(self.config['code']) if self.checkpoint else None
+
+    def resume_session(self, page: Page) -> bool:
+        """
+        Continue a handed-over session or an interrupted survey saved in the checkpoint journal
+
+        Returns:
+            True if the page now shows a survey step of the saved session,
+            False if there is nothing to resume (then log in as usual)
+        """
+        state = self._session_to_resume()
+        if not state or not state.get('cookies'):
+            return False
+
+        page.context.add_cookies(state['cookies'])
+        self._throttle()
+        page.goto(self.form_url, timeout=60000, wait_until='domcontentloaded')
+
+        if self._resumed(self.take_snapshot(page)):
+            return True
+
+        page.context.clear_cookies()
+        return False
+
+    def save_progress(self, page: Page, page_count: int) -> None:
+        """Save the session cookies and journal the last submitted page"""
+        if not self.checkpoint:
+            return
+
+        try:
+            cookies = page.context.cookies()
+            self.checkpoint.save_storage_state(self.config['code'], {'cookies': cookies, 'origins': []})
+            self._journal(IN_PROGRESS, page=page_count)
+        except Exception as e:
+            log_warning(self.logger, f"Could not save checkpoint: {e}")
 
     def login(self, page: Page) -> None:
-        """Login to survey with access code"""
+        """
+        Login to survey with access code
+
+        A timeout or a 5xx answer is backed off like click_next() and the
+        access code is submitted again from a fresh login page; if the failed
+        submit did reach the server, that page is already the first step.
+
+        Raises:
+            RetriesExhausted: If the server keeps failing
+        """
         log_section(self.logger, "Login")
-        self.logger.info(f"Navigating to {self.FORM_URL}")
+        self.logger.info(f"Navigating to {self.form_url}")
 
-        page.goto(self.FORM_URL, timeout=60000)
-        page.wait_for_load_state('networkidle', timeout=60000)
+        delay = None
+        while True:
+            if delay is not None:
+                log_warning(self.logger, f"Retrying login in {delay:.1f}s (attempt {self.retries}/{self.MAX_RETRIES})")
+                time.sleep(delay)
 
-        # Wait for page to be ready
-        time.sleep(2)
+            errors_before = self.server_errors
+            started = time.perf_counter()
+            try:
+                ok = self._submit_access_code(page, retry=delay is not None)
+                ok = ok and self._reloaded(self.take_snapshot(page), errors_before)
+            except Exception as e:
+                log_warning(self.logger, f"Login attempt failed: {e}")
+                ok = False
 
-        # Fill access code - try multiple selectors
-        selectors = [
-            'input[type="text"]',
-            'input[name="token"]',
-            '#token',
-            'input.form-control',
-        ]
+            delay = self._next_delay(started, ok)
+            if delay is None:
+                break
 
+        log_success(self.logger, "Logged in")
+
+    def _submit_access_code(self, page: Page, retry: bool = False) -> bool:
+        """
+        Open the login page, fill the access code and submit it
+
+        Args:
+            page: Playwright page
+            retry: A previous submit failed; if it still logged in, the survey
+                URL shows a step and nothing is submitted
+
+        Returns:
+            True if the next page loaded within the transition timeout
+        """
+        self._throttle()
+        page.goto(self.form_url, timeout=60000, wait_until='domcontentloaded')
+
+        if retry and self.take_snapshot(page).step is not None:
+            return True
+
+        # Wait until the access code field is rendered
+        page.wait_for_selector(', '.join(self.TOKEN_SELECTORS), timeout=self.transition_timeout_ms)
+
+        # Fill access code - try multiple selectors
         filled = False
-        for selector in selectors:
+        for selector in self.TOKEN_SELECTORS:
             try:
                 if page.query_selector(selector):
                     page.fill(selector, self.config['code'], timeout=5000)
@@ -156,15 +519,11 @@ class FormFiller:
             raise Exception("Could not find access code input field")
 
         # Click submit - try multiple selectors
-        submit_selectors = [
-            'button:has-text("Pokračovat")',
-            'button[type="submit"]',
-            'input[type="submit"]',
-            '.btn-primary',
-        ]
+        armed = arm_transition(page)
+        self._throttle()
 
         clicked = False
-        for selector in submit_selectors:
+        for selector in self.SUBMIT_SELECTORS:
             try:
                 if page.query_selector(selector):
                     page.click(selector, timeout=5000)
@@ -176,128 +535,173 @@ class FormFiller:
         if not clicked:
             raise Exception("Could not find submit button")
 
-        page.wait_for_load_state('networkidle', timeout=60000)
+        loaded = wait_for_transition(page, armed, self.transition_timeout_ms)
+        if not loaded:
+            log_warning(self.logger, f"First survey page did not load within {self.transition_timeout_ms / 1000:.0f}s")
+        return loaded
 
-        log_success(self.logger, "Logged in")
+    def take_snapshot(self, page: Page) -> PageSnapshot:
+        """Snapshot of the current step (empty if the page cannot be read, e.g. mid-navigation)"""
+        try:
+            return take_snapshot(page)
+        except Exception as e:
+            self.logger.debug(f"Could not read page snapshot: {e}")
+            return PageSnapshot()
 
     def is_completion_page_check(self, page: Page) -> bool:
         """Check if current page is completion page"""
-        try:
-            page_text = page.inner_text('body')
-            return is_completion_page(page_text)
-        except:
-            return False
+        return self.take_snapshot(page).completed
 
-    def process_current_page(self, page: Page) -> bool:
+    def process_current_page(self, page: Page, snapshot: PageSnapshot = None) -> bool:
         """
         Process current page based on detected type
 
+        Args:
+            page: Playwright page
+            snapshot: Snapshot of the page (taken here if not given)
+
         Returns:
             True if page processed successfully
         """
         try:
-            # Get question text
-            question_text = self.get_question_text(page)
+            if snapshot is None:
+                snapshot = self.take_snapshot(page)
 
-            if not question_text:
-                log_warning(self.logger, "No question text found, might be intro page")
-                return True
+            question_text = snapshot.question_text
 
             # Detect page type
-            question_info = detect_question_type(question_text)
+            with self._timed('detection', 'detect_question_type') as span:
+                question_info = self._detect_page(question_text)
+                if question_info:
+                    span.update(page_type=question_info.page_type, activity_code=question_info.activity_code)
 
-            if not question_info:
-                log_warning(self.logger, f"Unknown page type: {question_text[:200]}...")
-                self.logger.debug(f"Full question text: {question_text}")
-                return False
-
-            self.page_counter += 1
-            log_page(self.logger, question_info.description, self.page_counter)
-
-            # Dispatch to appropriate handler
-            if question_info.page_type == 'intro':
-                return True  # Just click next
+            if question_info is None:
+                return not question_text
 
-            elif question_info.page_type == 'skip':
-                log_skip(self.logger, question_info.description, "Per business rules")
-                return True  # Just click next
+            with self._timed(
+                'fill',
+                f"fill_{question_info.page_type}",
+                page_type=question_info.page_type,
+                activity_code=question_info.activity_code,
+                page=self.page_counter
+            ):
+                # Dispatch to appropriate handler
+                page_type = question_info.page_type
 
-            elif question_info.page_type == 'fixed_zero':
-                return self.fill_fixed_zero(page, question_info)
+                if page_type not in self.PAGE_HANDLERS:
+                    log_warning(self.logger, f"Unhandled page type: {page_type}")
+                    return False
 
-            elif question_info.page_type == 'simple_inputs':
-                return self.fill_simple_inputs(page, question_info)
+                handler = self.PAGE_HANDLERS[page_type]
 
-            elif question_info.page_type == 'checkboxes':
-                return self.fill_checkboxes(page, question_info)
+                if handler is None:
+                    if page_type == 'skip':
+                        log_skip(self.logger, question_info.description, "Per business rules")
+                    return True  # Just click next
 
-            elif question_info.page_type == 'table_counts':
-                return self.fill_table_counts(page, question_info)
-
-            else:
-                log_warning(self.logger, f"Unhandled page type: {question_info.page_type}")
-                return False
+                return getattr(self, handler)(page, question_info, snapshot)
 
         except Exception as e:
             log_error(self.logger, "Error processing page", e)
             return False
 
-    def get_question_text(self, page: Page) -> str:
-        """Get question text from page"""
-        try:
-            # Try to find ls-question-text-* element
-            question_elem = page.query_selector('[id^="ls-question-text-"]')
-            if question_elem:
-                return question_elem.inner_text()
+    def _detect_page(self, question_text: str) -> QuestionInfo:
+        """
+        Detect page type from question text and log the page header
 
-            # Fallback: get entire page text
-            return page.inner_text('body')
+        Returns:
+            QuestionInfo, or None if there is no question text or the page is unknown
+        """
+        if not question_text:
+            log_warning(self.logger, "No question text found, might be intro page")
+            return None
+
+        if self.detection_cache:
+            question_info, digest, cached = self.detection_cache.detect(question_text)
+        else:
+            question_info, digest, cached = detect_question_type(question_text), None, False
+
+        if not question_info:
+            if cached:
+                # Reported when the page was first seen; triage by hash in the cache file
+                self.logger.debug(f"Unknown page type (known hash {digest[:12]})")
+                return None
+            hash_note = f" [hash {digest[:12]}]" if digest else ""
+            log_warning(self.logger, f"Unknown page type{hash_note}: {question_text[:200]}...")
+            self.logger.debug(f"Full question text: {question_text}")
+            return None
+
+        self.page_counter += 1
+        log_page(self.logger, question_info.description, self.page_counter)
+
+        return question_info
+
+    def _capture(self, html: str, snapshot: PageSnapshot) -> None:
+        """Add the step to the page corpus; a failed capture never fails the survey"""
+        secrets = (self.config['code'], self.config.get('school_name', ''))
+        try:
+            page_id = self.corpus.add(html, snapshot.question_text, snapshot.completed, secrets)
+            if page_id:
+                self.logger.debug(f"Captured new page variant {page_id}")
+        except OSError as e:
+            log_warning(self.logger, f"Could not capture page: {e}")
 
-        except Exception as e:
-            self.logger.debug(f"Could not get question text: {e}")
-            return ""
+    def get_question_text(self, page: Page) -> str:
+        """Get question text from page (whole page text if there is no question element)"""
+        return self.take_snapshot(page).question_text
 
     def click_next(self, page: Page) -> None:
-        """Click 'Další' (Next) button"""
+        """
+        Click 'Další' (Next) button
+
+        A timeout or a 5xx answer is backed off and the current step reloaded
+        (see recover()).
+
+        Raises:
+            RetriesExhausted: If the server keeps failing
+        """
         try:
-            # Wait a bit before clicking
-            time.sleep(1)
+            armed = arm_transition(page)
+            self._throttle()
+            errors_before = self.server_errors
+            started = time.perf_counter()
 
             # Try different selectors for "Další" button
-            selectors = [
-                'button:has-text("Další")',
-                'input[type="submit"][value*="Další"]',
-                '.ls-move-forward',
-            ]
-
-            for selector in selectors:
+            for selector in self.NEXT_SELECTORS:
                 try:
                     page.click(selector, timeout=2000)
-                    page.wait_for_load_state('networkidle', timeout=10000)
-                    return
                 except:
                     continue
 
+                # Wait exactly until the next step is rendered
+                loaded = wait_for_transition(page, armed, self.transition_timeout_ms)
+                if not loaded:
+                    log_warning(self.logger, f"Next page did not load within {self.transition_timeout_ms / 1000:.0f}s")
+                elif self.server_errors != errors_before:
+                    log_warning(self.logger, "Server error (5xx) after 'Další'")
+
+                self.recover(page, self._next_delay(started, loaded and self.server_errors == errors_before))
+                return
+
             log_warning(self.logger, "Could not find 'Další' button")
 
+        except RetriesExhausted:
+            raise
+
         except Exception as e:
             log_error(self.logger, "Error clicking Next button", e)
 
-    def fill_fixed_zero(self, page: Page, info: QuestionInfo) -> bool:
+    def fill_fixed_zero(self, page: Page, info: QuestionInfo, snapshot: PageSnapshot) -> bool:
         """Fill all fields with 0"""
         try:
+            if not snapshot.inputs:
+                log_warning(self.logger, "No input fields found")
+                return False
+
             # Use JavaScript to fill all text inputs with 0 (handles hidden fields)
-            filled_count = page.evaluate("""() => {
-                const inputs = document.querySelectorAll('input[type="text"]');
-                let count = 0;
-                inputs.forEach(inp => {
-                    inp.value = '0';
-                    inp.dispatchEvent(new Event('input', {bubbles: true}));
-                    inp.dispatchEvent(new Event('change', {bubbles: true}));
-                    count++;
-                });
-                return count;
-            }""")
+            result = page.evaluate(FILL_ALL_ZERO_JS, self.bulk_fill)
+            self._note_fill_mode(result)
+            filled_count = result['filled']
 
             self.logger.info(f"Filled {filled_count} fields with 0")
             return True
@@ -306,28 +710,33 @@ class FormFiller:
             log_error(self.logger, "Error filling fixed zeros", e)
             return False
 
-    def fill_simple_inputs(self, page: Page, info: QuestionInfo) -> bool:
+    def fill_simple_inputs(self, page: Page, info: QuestionInfo, snapshot: PageSnapshot) -> bool:
         """Fill simple year inputs with random values (only first 3 years, 2025/2026 stays empty)"""
         try:
-            base_count = get_base_count(self.config, info.school_type)
-            counts = generate_counts_for_years(base_count, num_years=3)
+            counts = self._simple_input_counts(info)
+
+            num_inputs = len(snapshot.visible_inputs)
 
-            inputs = page.query_selector_all('input[type="text"]')
+            if num_inputs < 3:
+                log_warning(self.logger, f"Expected at least 3 inputs, found {num_inputs}")
+                return False
+
+            # Same single-call path as table/zero pages: values go to visible
+            # inputs in document order, events are dispatched in the page
+            values = self._simple_input_values(counts, num_inputs)
+            result = page.evaluate(FILL_VISIBLE_INPUTS_JS, {'values': values, 'bulk': self.bulk_fill})
+            self._note_fill_mode(result)
+            filled_count = result['filled']
 
-            if len(inputs) < 3:
-                log_warning(self.logger, f"Expected at least 3 inputs, found {len(inputs)}")
+            if filled_count < len(counts):
+                log_warning(self.logger, f"Filled only {filled_count} of {len(counts)} year inputs")
                 return False
 
-            # Fill only first 3 years, leave 4th (2025/2026) empty
-            for i, (year, count) in enumerate(zip(self.SCHOOL_YEARS, counts)):
-                inputs[i].fill(str(count))
-                # Dispatch events for validation
-                inputs[i].evaluate('el => el.dispatchEvent(new Event("input", {bubbles: true}))')
-                inputs[i].evaluate('el => el.dispatchEvent(new Event("change", {bubbles: true}))')
+            for year, count in zip(self.SCHOOL_YEARS, counts):
                 log_field_fill(self.logger, f"Školní rok {year}", count)
 
             # Log that 4th year is intentionally left empty
-            if len(inputs) >= 4:
+            if len(values) > len(counts):
                 self.logger.info(f"Školní rok 2025/2026: (left empty per business rules)")
 
             return True
@@ -336,85 +745,26 @@ class FormFiller:
             log_error(self.logger, "Error filling simple inputs", e)
             return False
 
-    def fill_checkboxes(self, page: Page, info: QuestionInfo) -> bool:
+    def fill_checkboxes(self, page: Page, info: QuestionInfo, snapshot: PageSnapshot) -> bool:
         """Fill checkboxes based on JSON topics"""
         try:
-            # Get topics from JSON
-            # Check if this is SDP/ŽZOR or DVPP based on activity code
-            # SDP/ŽZOR codes: 1.I/6 (MŠ), 1.I/7 (ZŠ - old), 1.II/9 (ZŠ - primary), 1.V/3 (ŠD)
-            # DVPP codes: 1.I/4 (MŠ), 1.I/5 (ZŠ - old), 1.II/7 (ZŠ - primary), 1.V/1 (ŠD)
-            if info.activity_code in ['1.I/6', '1.I/7', '1.II/9', '1.V/3']:  # SDP/ŽZOR codes
-                # SDP/ŽZOR - topics are dict keys
-                topics_data = get_sdp_zzor_topics(self.config, info.json_key)
-                topics = list(topics_data.keys())
-            else:
-                # DVPP - topics are list items (includes 1.I/4, 1.I/5, 1.II/7, 1.V/1)
-                topics = get_dvpp_topics(self.config, info.json_key)
+            topics = self._checkbox_topics(info)
 
             if not topics:
-                log_warning(self.logger, f"No topics found for {info.json_key}")
-                log_warning(self.logger, f"Available keys: {list(self.config.get('sdp_zzor', {}).keys())}")
                 return False
 
-            self.logger.info(f"Checking {len(topics)} checkboxes")
-
-            # Store topics for next page (counts page)
-            self.last_checked_topics = topics
-
-            # Use JavaScript to handle checkboxes (fastest and most reliable)
-            # First, uncheck all
-            page.evaluate("""() => {
-                const checkboxes = document.querySelectorAll('input[type="checkbox"]');
-                checkboxes.forEach(cb => {
-                    cb.checked = false;
-                    cb.dispatchEvent(new Event('change', {bubbles: true}));
-                });
-            }""")
-
-            # Then check only required ones
-            for topic in topics:
-                # Use enhanced normalization that removes parentheses
-                normalized_topic = normalize_for_checkbox_matching(topic)
-
-                # Find checkbox by label match (first word comparison)
-                checked = page.evaluate(f"""(topicNorm) => {{
-                    const checkboxes = document.querySelectorAll('input[type="checkbox"]');
-                    const topicFirstWord = topicNorm.split(' ')[0];
-
-                    for (const cb of checkboxes) {{
-                        const label = cb.nextElementSibling;
-                        if (label && label.textContent) {{
-                            // Remove text in parentheses, then normalize
-                            let labelText = label.textContent.replace(/\\([^)]*\\)/g, '');
-                            const labelNorm = labelText.toLowerCase()
-                                .normalize("NFD")
-                                .replace(/[\u0300-\u036f]/g, "")
-                                .replace(/\\s+/g, " ")
-                                .trim();
-                            const labelFirstWord = labelNorm.split(' ')[0];
-
-                            // Try exact match first
-                            if (labelNorm === topicNorm) {{
-                                cb.checked = true;
-                                cb.dispatchEvent(new Event('change', {{bubbles: true}}));
-                                return true;
-                            }}
-
-                            // Fallback: match first word if exact match fails
-                            if (labelFirstWord === topicFirstWord && topicFirstWord.length > 3) {{
-                                cb.checked = true;
-                                cb.dispatchEvent(new Event('change', {{bubbles: true}}));
-                                return true;
-                            }}
-                        }}
-                    }}
-                    return false;
-                }}""", normalized_topic)
-
-                if checked:
-                    log_checkbox_change(self.logger, topic, True)
-                else:
-                    log_warning(self.logger, f"Could not find checkbox for: {topic}")
+            if not snapshot.checkboxes:
+                log_warning(self.logger, "No checkboxes found on page")
+                return False
+
+            # Resolve all topics against one in-page label index and leave
+            # exactly those checked (single round trip)
+            report = page.evaluate(
+                SELECT_TOPICS_JS, {'topicNorms': list(topics.normalized), 'bulk': self.bulk_fill}
+            )
+            self._note_fill_mode(report)
+
+            self._log_checkbox_report(topics.topics, report)
 
             return True
 
@@ -422,89 +772,70 @@ class FormFiller:
             log_error(self.logger, "Error filling checkboxes", e)
             return False
 
-    def fill_table_counts(self, page: Page, info: QuestionInfo) -> bool:
+    def fill_table_counts(self, page: Page, info: QuestionInfo, snapshot: PageSnapshot) -> bool:
         """Fill table with topic × year counts (only 3 years, 2025/2026 stays empty)"""
         try:
-            base_count = get_base_count(self.config, info.school_type)
-
-            # Get topics and determine values
-            if info.calculation == 'from_json':
-                # SDP/ŽZOR - exact values from JSON
-                topics_data = get_sdp_zzor_topics(self.config, info.json_key)
-                topics = list(topics_data.keys())
-
-                # Build flat list of values - only 3 years, then 0 for 2025/2026
-                values = []
-                for topic in topics:
-                    years_data = topics_data[topic]
-                    for year_json in ["2022-2023", "2023-2024", "2024-2025"]:
-                        values.append(years_data.get(year_json, 0))
-                    # Add 0 for 2025/2026 (4th year always empty)
-                    values.append(0)
+            topics, values = self._table_values(info)
 
-            else:
-                # DVPP - random values
-                # Try to get topics from JSON first
-                dvpp_topics = get_dvpp_topics(self.config, info.json_key)
-
-                # If not in JSON, use topics from previous checkbox page
-                if not dvpp_topics and self.last_checked_topics:
-                    self.logger.info("Using topics from previous checkbox page")
-                    dvpp_topics = self.last_checked_topics
-
-                topics = dvpp_topics
-                num_topics = len(topics)
-                # Generate only 3 years of random values
-                random_values = generate_counts_for_topics(base_count, num_topics, num_years=3)
-
-                # Add 0 for every 4th value (2025/2026)
-                values = []
-                for i in range(num_topics):
-                    # Add 3 random values
-                    values.extend(random_values[i*3:(i+1)*3])
-                    # Add 0 for 2025/2026
-                    values.append(0)
-
-            # Fill inputs using JavaScript (handles hidden fields)
-            num_fields = len(topics) * 4
-            self.logger.info(f"Filling {num_fields} fields ({len(topics)} topics × 4 years, last year empty)")
+            if not snapshot.visible_inputs:
+                # Every row hidden by relevance: nothing to fill
+                self.logger.info("No visible table rows, nothing to fill")
+                return True
 
             # Use JavaScript to fill fields (only visible rows, skip ls-hidden)
-            filled_count = page.evaluate("""(values) => {
-                // Find all text inputs that are NOT in ls-hidden rows
-                const allInputs = document.querySelectorAll('input[type="text"]');
-                const visibleInputs = Array.from(allInputs).filter(input => {
-                    // Check if parent row has ls-hidden class
-                    const row = input.closest('tr');
-                    if (row && row.classList.contains('ls-hidden')) {
-                        return false;
-                    }
-                    return true;
-                });
-
-                let count = 0;
-                for (let i = 0; i < Math.min(values.length, visibleInputs.length); i++) {
-                    visibleInputs[i].value = String(values[i]);
-                    visibleInputs[i].dispatchEvent(new Event('input', {bubbles: true}));
-                    visibleInputs[i].dispatchEvent(new Event('change', {bubbles: true}));
-                    count++;
-                }
-                return count;
-            }""", values)
-
-            self.logger.info(f"Filled {filled_count} fields")
-
-            # Log values for debugging
-            all_years = self.SCHOOL_YEARS + ["2025/2026"]  # Include 4th year for logging
-            for i in range(min(num_fields, len(values))):
-                topic_idx = i // 4
-                year_idx = i % 4
-                if topic_idx < len(topics):
-                    year_label = all_years[year_idx] if year_idx < len(all_years) else f"Year {year_idx}"
-                    log_table_fill(self.logger, topics[topic_idx], year_label, values[i])
+            result = page.evaluate(FILL_VISIBLE_INPUTS_JS, {'values': values, 'bulk': self.bulk_fill})
+            self._note_fill_mode(result)
+            filled_count = result['filled']
+
+            self._log_table_fill(topics, values, filled_count)
 
             return True
 
         except Exception as e:
             log_error(self.logger, "Error filling table counts", e)
             return False
+
+    # ------------------------------------------------------------------
+    # Fill reporting (the values themselves come from ValuePlanner)
+    # ------------------------------------------------------------------
+
+    def _note_fill_mode(self, result: Dict[str, Any]) -> None:
+        """Count how a fill script applied its changes (see page_scripts._APPLY_CHANGES_JS)"""
+        mode = result.get('mode', 'events')
+        self.fill_modes[mode] += 1
+
+        if self.bulk_fill and mode == 'fallback':
+            self.logger.debug("ExpressionManager did not take the bulk fill, used per-field events")
+
+    def _log_checkbox_report(self, topics: List[str], report: Dict[str, Any]) -> None:
+        """
+        Log the per-topic match report of SELECT_TOPICS_JS
+
+        Args:
+            topics: Topics in the order they were sent
+            report: {'matches': [{'match': 'exact'|'first_word'|'unmatched', 'label'}], 'unchecked': int}
+        """
+        for topic, result in zip(topics, report['matches']):
+            if result['match'] == 'exact':
+                log_checkbox_change(self.logger, topic, True)
+            elif result['match'] == 'first_word':
+                log_checkbox_change(self.logger, f"{topic} → {result['label']} (first word match)", True)
+            else:
+                log_warning(self.logger, f"Could not find checkbox for: {topic}")
+
+        if report['unchecked']:
+            self.logger.debug(f"Unchecked {report['unchecked']} previously checked checkbox(es)")
+
+    def _log_table_fill(self, topics: List[str], values: List[int], filled_count: int) -> None:
+        """Log filled table values"""
+        self.logger.info(f"Filled {filled_count} fields")
+
+        # Log values for debugging
+        num_fields = len(topics) * 4
+        all_years = self.SCHOOL_YEARS + ["2025/2026"]  # Include 4th year for logging
+        for i in range(min(num_fields, len(values))):
+            topic_idx = i // 4
+            year_idx = i % 4
+            if topic_idx < len(topics):
+                year_label = all_years[year_idx] if year_idx < len(all_years) else f"Year {year_idx}"
+                log_table_fill(self.logger, topics[topic_idx], year_label, values[i])
@@ -0,0 +1,946 @@
+"""Browserless survey engine: LimeSurvey steps as parsed HTML forms over keep-alive HTTP"""
+
+import gzip
+import http.client
+import threading
+import time
+from html.parser import HTMLParser
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlencode, urljoin, urlsplit
+from http.cookies import SimpleCookie
+
+from src.form_filler import FormFiller
+from src.checkpoint import IN_PROGRESS, COMPLETED, FAILED
+from src.question_detector import QuestionInfo, is_completion_page
+from src.page_snapshot import PageSnapshot
+from src.text_normalizer import match_checkbox_labels
+from src.config_loader import get_school_types
+from src.logger_config import (
+    log_section,
+    log_field_fill,
+    log_success,
+    log_error,
+    log_warning,
+    log_skip
+)
+
+
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) evaluace-filler/http"
+MAX_REDIRECTS = 5
+
+# Elements without an end tag
+VOID_TAGS = frozenset({
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'param', 'source', 'track', 'wbr'
+})
+
+# Form controls the engine can answer; anything else goes to the browser
+SUPPORTED_INPUT_TYPES = frozenset({'text', 'hidden', 'checkbox', 'submit', 'button'})
+UNSUPPORTED_TAGS = frozenset({'select', 'textarea'})
+
+# Same elements as the validation messages of SNAPSHOT_JS
+ERROR_CLASSES = frozenset({'ls-em-error', 'errormandatory', 'alert-danger'})
+
+# Script code of relevance evaluated in the browser (conditions between
+# questions of one page); the server-side ls-hidden classes do not cover it
+CLIENT_LOGIC_MARKERS = ('LEMrel',)
+
+
+class NeedsBrowser(Exception):
+    """The step cannot be answered over plain HTTP (unknown page, client-side logic)"""
+
+
+class ConnectionPool:
+    """
+    Keep-alive HTTP(S) connections, reused across requests and sessions
+
+    A connection is borrowed for one request and returned afterwards unless
+    the server closes it, so N concurrent surveys need at most N sockets per
+    host. A request on a reused connection the server has meanwhile closed is
+    retried once on a new connection.
+
+    Examples:
+        >>> pool = ConnectionPool.shared()
+        >>> status, headers, body = pool.request('GET', 'http://127.0.0.1:8765/index.php/262621')
+    """
+
+    _shared: Optional['ConnectionPool'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_idle_per_host: int = 32):
+        """
+        Args:
+            max_idle_per_host: Idle connections kept open per host
+        """
+        self.max_idle_per_host = max_idle_per_host
+        self._idle: Dict[Tuple[str, str], List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+        self.requests_sent = 0
+
+    @classmethod
+    def shared(cls) -> 'ConnectionPool':
+        """Pool shared by all sessions of the process"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def _checkout(self, key: Tuple[str, str], timeout: float) -> Tuple[http.client.HTTPConnection, bool]:
+        """(connection, reused) for scheme and host"""
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                connection = idle.pop()
+                connection.timeout = timeout
+                if connection.sock:
+                    connection.sock.settimeout(timeout)
+                return connection, True
+            self.connections_opened += 1
+
+        scheme, netloc = key
+        connection_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        return connection_class(netloc, timeout=timeout), False
+
+    def _checkin(self, key: Tuple[str, str], connection: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 60.0
+    ) -> Tuple[int, http.client.HTTPMessage, bytes]:
+        """
+        Send one request
+
+        Returns:
+            (status, response headers, body bytes)
+
+        Raises:
+            OSError, http.client.HTTPException: Connection or protocol failure
+        """
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        target = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+
+        while True:
+            connection, reused = self._checkout(key, timeout)
+            try:
+                connection.request(method, target, body=body, headers=headers or {})
+                response = connection.getresponse()
+                content = response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                connection.close()
+                if reused:
+                    # Keep-alive connection closed by the server while idle
+                    continue
+                raise
+            except BaseException:
+                connection.close()
+                raise
+
+            self.requests_sent += 1
+            if response.will_close:
+                connection.close()
+            else:
+                self._checkin(key, connection)
+
+            return response.status, response.headers, content
+
+    def close(self) -> None:
+        """Close all idle connections"""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+
+class HttpResponse:
+    """Decoded answer of a page request"""
+
+    def __init__(self, status: int, url: str, text: str):
+        self.status = status
+        self.url = url
+        self.text = text
+
+    def __repr__(self) -> str:
+        return f"HttpResponse(status={self.status}, url={self.url}, size={len(self.text)})"
+
+
+class HttpSession:
+    """
+    One respondent's cookies over a shared ConnectionPool
+
+    Follows redirects like a browser (303 and POST→GET for 301/302) and keeps
+    the session cookie LimeSurvey needs to remember the step.
+    """
+
+    def __init__(self, pool: Optional[ConnectionPool] = None, timeout: float = 60.0):
+        """
+        Args:
+            pool: Connection pool (default: ConnectionPool.shared())
+            timeout: Socket timeout of one request in seconds
+        """
+        self.pool = pool or ConnectionPool.shared()
+        self.timeout = timeout
+        self.cookies: Dict[str, str] = {}
+
+    def _headers(self, body: Optional[bytes]) -> Dict[str, str]:
+        headers = {
+            'User-Agent': USER_AGENT,
+            'Accept': 'text/html,application/xhtml+xml',
+            'Accept-Language': 'cs,en;q=0.5',
+            'Accept-Encoding': 'gzip',
+        }
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f"{name}={value}" for name, value in self.cookies.items())
+        if body is not None:
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        return headers
+
+    def _store_cookies(self, headers: http.client.HTTPMessage) -> None:
+        for header in headers.get_all('Set-Cookie') or []:
+            cookie = SimpleCookie()
+            try:
+                cookie.load(header)
+            except Exception:
+                continue
+            for name, morsel in cookie.items():
+                if morsel['max-age'] == '0' or not morsel.value:
+                    self.cookies.pop(name, None)
+                else:
+                    self.cookies[name] = morsel.value
+
+    def request(self, method: str, url: str, data: Optional[List[Tuple[str, str]]] = None) -> HttpResponse:
+        """
+        Load a page (GET) or submit a form (POST with data)
+
+        Raises:
+            OSError, http.client.HTTPException: Connection failure or redirect loop
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            body = urlencode(data).encode('utf-8') if data is not None else None
+            status, headers, content = self.pool.request(method, url, body, self._headers(body), self.timeout)
+            self._store_cookies(headers)
+
+            location = headers.get('Location')
+            if status in (301, 302, 303, 307, 308) and location:
+                url = urljoin(url, location)
+                if status in (301, 302, 303):
+                    method, data = 'GET', None
+                continue
+
+            if headers.get('Content-Encoding') == 'gzip':
+                content = gzip.decompress(content)
+            charset = headers.get_content_charset('utf-8')
+            return HttpResponse(status, url, content.decode(charset, errors='replace'))
+
+        raise http.client.HTTPException(f"Too many redirects: {url}")
+
+    def storage_state(self, url: str) -> Dict[str, Any]:
+        """Cookies as Playwright storage state (for the browser fallback and the checkpoint)"""
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        return {
+            'cookies': [{'name': name, 'value': value, 'url': origin} for name, value in self.cookies.items()],
+            'origins': [],
+        }
+
+    def load_storage_state(self, state: Dict[str, Any]) -> None:
+        """Take over cookies of a Playwright storage state"""
+        for cookie in state.get('cookies', []):
+            self.cookies[cookie['name']] = cookie['value']
+
+    def clear_cookies(self) -> None:
+        self.cookies.clear()
+
+
+class _StepParser(HTMLParser):
+    """Collects the survey form, question texts and visibility of one page"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        # Open elements: (tag, inside ls-hidden, inside has-error, captures opened)
+        self.stack: List[Tuple[str, bool, bool, int]] = []
+        self.captures: List[List[str]] = []
+
+        self.action: Optional[str] = None
+        self.in_form = 0
+        self.hidden: List[Tuple[str, str]] = []
+        self.inputs: List[Dict[str, Any]] = []
+        self.checkboxes: List[Dict[str, Any]] = []
+        self.buttons: List[Dict[str, Any]] = []
+        self.questions: List[Dict[str, Any]] = []
+        self.errors: List[Dict[str, Any]] = []
+        self.labels: Dict[str, List[str]] = {}
+        self.body: List[str] = []
+        self.step: Optional[str] = None
+        self.unsupported: List[str] = []
+        self.client_logic = False
+
+        self._row: Optional[Dict[str, Any]] = None
+        self._last_checkbox: Optional[Dict[str, Any]] = None
+        self._in_script = False
+
+    def _capture(self, parts: List[str]) -> List[str]:
+        self.captures.append(parts)
+        return parts
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        attrs = {name: value or '' for name, value in attrs}
+        classes = set(attrs.get('class', '').split())
+        # The element or an ancestor has ls-hidden (IS_HIDDEN_JS of the page scripts)
+        hidden = (self.stack[-1][1] if self.stack else False) or 'ls-hidden' in classes
+        has_error = (self.stack[-1][2] if self.stack else False) or 'has-error' in classes
+        captures = len(self.captures)
+        last_checkbox, self._last_checkbox = self._last_checkbox, None
+
+        if tag == 'form' and self.action is None:
+            self.action = attrs.get('action', '')
+        if tag == 'form':
+            self.in_form += 1
+
+        if tag in ('script', 'style'):
+            self._in_script = tag == 'script'
+            self.stack.append((tag, hidden, has_error, captures))
+            self.captures.append(None)
+            return
+
+        element_id = attrs.get('id', '')
+        if element_id.startswith('ls-question-text-'):
+            self.questions.append({'id': element_id, 'parts': self._capture([])})
+        if classes & ERROR_CLASSES or (has_error and 'help-block' in classes):
+            self.errors.append({'hidden': hidden, 'parts': self._capture([])})
+        if tag == 'label':
+            parts = self._capture([])
+            if attrs.get('for'):
+                self.labels[attrs['for']] = parts
+            if last_checkbox is not None and not last_checkbox['label_parts']:
+                last_checkbox['label_parts'] = parts
+        if tag == 'tr':
+            self._row = {'parts': None}
+        if tag in ('th',) or 'answertext' in classes:
+            if self._row is not None and self._row['parts'] is None:
+                self._row['parts'] = self._capture([])
+
+        if tag == 'input' and self.in_form:
+            self._input(attrs, hidden)
+        elif tag == 'button' and self.in_form:
+            self.buttons.append({
+                'name': attrs.get('name', ''),
+                'value': attrs.get('value', ''),
+                'type': attrs.get('type', 'submit'),
+                'classes': classes,
+                'parts': self._capture([]),
+            })
+        elif tag in UNSUPPORTED_TAGS and self.in_form:
+            self.unsupported.append(tag)
+
+        if tag not in VOID_TAGS:
+            self.stack.append((tag, hidden, has_error, captures))
+        else:
+            # Captures of void elements end right away
+            del self.captures[captures:]
+
+    def _input(self, attrs: Dict[str, str], hidden: bool) -> None:
+        input_type = attrs.get('type', 'text').lower()
+        name = attrs.get('name', '')
+
+        if input_type not in SUPPORTED_INPUT_TYPES:
+            self.unsupported.append(f"input[type={input_type}]")
+        elif input_type == 'hidden':
+            self.hidden.append((name, attrs.get('value', '')))
+            if name == 'thisstep':
+                self.step = attrs.get('value', '')
+        elif input_type == 'text':
+            self.inputs.append({
+                'id': attrs.get('id', ''),
+                'name': name,
+                'value': attrs.get('value', ''),
+                'visible': not hidden,
+                'row_ref': self._row,
+            })
+        elif input_type == 'checkbox':
+            checkbox = {
+                'id': attrs.get('id', ''),
+                'name': name,
+                'value': attrs.get('value', 'on'),
+                'checked': 'checked' in attrs,
+                'visible': not hidden,
+                'label_parts': None,
+            }
+            self.checkboxes.append(checkbox)
+            self._last_checkbox = checkbox
+        elif input_type == 'submit':
+            self.buttons.append({
+                'name': name,
+                'value': attrs.get('value', ''),
+                'type': 'submit',
+                'classes': set(attrs.get('class', '').split()),
+                'parts': [attrs.get('value', '')],
+            })
+
+    def handle_endtag(self, tag: str) -> None:
+        if not any(entry[0] == tag for entry in self.stack):
+            return
+
+        while self.stack:
+            open_tag, _, _, captures = self.stack.pop()
+            del self.captures[captures:]
+            if open_tag == 'form':
+                self.in_form -= 1
+            if open_tag == 'tr':
+                self._row = None
+            if open_tag in ('script', 'style'):
+                self._in_script = False
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data: str) -> None:
+        if self.captures and self.captures[-1] is None:
+            # Inside <script>/<style>
+            if self._in_script and any(marker in data for marker in CLIENT_LOGIC_MARKERS):
+                self.client_logic = True
+            return
+
+        self.body.append(data)
+        for parts in self.captures:
+            if parts is not None:
+                parts.append(data)
+
+
+def _text(parts: Optional[Iterable[str]]) -> str:
+    """Element text with whitespace collapsed (like innerText for this markup)"""
+    return ' '.join(''.join(parts or ()).split())
+
+
+class HtmlStep:
+    """
+    One survey page parsed from HTML, with the values to submit
+
+    `snapshot` has the same shape as the browser's SNAPSHOT_JS result, so
+    detection and the value plans of FormFiller apply unchanged. Handlers
+    change `inputs` values and `checkboxes` checked flags; form_data()
+    serializes the form like a browser submitting it with one button.
+    """
+
+    def __init__(self, url: str, html_text: str, status: int = 200):
+        """
+        Args:
+            url: Final URL of the page (after redirects)
+            html_text: Page HTML
+            status: HTTP status of the page
+        """
+        parser = _StepParser()
+        parser.feed(html_text)
+        parser.close()
+
+        self.url = url
+        self.status = status
+        self.html = html_text
+        self.action = urljoin(url, parser.action) if parser.action is not None else None
+        self.hidden = parser.hidden
+        self.buttons = [dict(button, text=_text(button.pop('parts'))) for button in parser.buttons]
+        self.unsupported = parser.unsupported
+
+        self.inputs = []
+        for field in parser.inputs:
+            row = field.pop('row_ref')
+            self.inputs.append(dict(field, row=_text(row['parts']) if row else ''))
+
+        self.checkboxes = []
+        for box in parser.checkboxes:
+            label_parts = box.pop('label_parts') or parser.labels.get(box['id'])
+            self.checkboxes.append(dict(box, label=_text(label_parts)))
+
+        body_text = _text(parser.body)
+        questions = [{'id': q['id'], 'text': _text(q['parts'])} for q in parser.questions]
+        errors = []
+        for error in parser.errors:
+            message = _text(error['parts'])
+            if message and not error['hidden'] and message not in errors:
+                errors.append(message)
+
+        self.client_logic = "client-side relevance (LEMrel)" if parser.client_logic else None
+        if self.unsupported:
+            self.client_logic = f"unsupported form controls: {', '.join(sorted(set(self.unsupported)))}"
+
+        self.snapshot = PageSnapshot({
+            'step': parser.step,
+            'questions': questions,
+            'body': '' if questions else body_text,
+            'completed': is_completion_page(body_text),
+            'inputs': self.inputs,
+            'checkboxes': self.checkboxes,
+            'errors': errors,
+        })
+
+    @property
+    def visible_inputs(self) -> List[Dict[str, Any]]:
+        return [field for field in self.inputs if field['visible']]
+
+    def fill_visible(self, values: List[Any]) -> int:
+        """Put values into visible text inputs in document order (FILL_VISIBLE_INPUTS_JS)"""
+        visible = self.visible_inputs
+        count = min(len(values), len(visible))
+        for field, value in zip(visible, values):
+            field['value'] = str(value)
+        return count
+
+    def select_topics(self, topic_norms: Iterable[str]) -> Dict[str, Any]:
+        """
+        Check exactly the given topics (SELECT_TOPICS_JS, same matching rules)
+
+        Returns:
+            {matches: [{match, label}], unchecked, mode: 'http'}
+        """
+        labels = [box['label'] for box in self.checkboxes]
+
+        selected = set()
+        matches = []
+        for index, match in match_checkbox_labels(topic_norms, labels):
+            if index < 0:
+                matches.append({'match': 'unmatched', 'label': ''})
+                continue
+            selected.add(index)
+            matches.append({'match': match, 'label': labels[index]})
+
+        unchecked = 0
+        for index, box in enumerate(self.checkboxes):
+            checked = index in selected
+            if box['checked'] and not checked:
+                unchecked += 1
+            box['checked'] = checked
+
+        return {'matches': matches, 'unchecked': unchecked, 'mode': 'http'}
+
+    def submit_button(self, texts: Iterable[str], classes: Iterable[str] = ()) -> Optional[Dict[str, Any]]:
+        """First submit button whose text contains one of texts or that has one of classes"""
+        submits = [button for button in self.buttons if button['type'] == 'submit']
+        for button in submits:
+            if any(text in button['text'] or text in button['value'] for text in texts):
+                return button
+            if button['classes'] & set(classes):
+                return button
+        return submits[0] if len(submits) == 1 else None
+
+    def form_data(self, button: Optional[Dict[str, Any]]) -> List[Tuple[str, str]]:
+        """
+        Fields a browser would submit with the button
+
+        Hidden inputs (CSRF token, thisstep, ...) go as received, except the
+        ExpressionManager mirrors java<SGQA>, which get their field's value
+        as the page scripts would set them.
+        """
+        mirrors = {field['name']: field['value'] for field in self.inputs}
+        mirrors.update({box['name']: ('Y' if box['checked'] else '') for box in self.checkboxes})
+
+        data = []
+        for name, value in self.hidden:
+            if name.startswith('java') and name[4:] in mirrors:
+                value = mirrors[name[4:]]
+            data.append((name, value))
+
+        data.extend((field['name'], field['value']) for field in self.inputs if field['name'])
+        data.extend((box['name'], box['value']) for box in self.checkboxes if box['checked'] and box['name'])
+
+        if button and button['name']:
+            data.append((button['name'], button['value']))
+        return data
+
+    def __repr__(self) -> str:
+        return f"HtmlStep(url={self.url}, status={self.status}, {self.snapshot!r})"
+
+
+class HttpFormFiller(FormFiller):
+    """
+    FormFiller that answers the survey with plain HTTP requests
+
+    Logs in with the access code, parses every step's form and posts the
+    answers directly: detection, value plans, logging, checkpointing and
+    load control are FormFiller's, only the page I/O differs. A survey costs
+    a cookie jar and one page of HTML instead of a browser context.
+
+    Unknown pages, client-side relevance, form controls the engine does not
+    answer or a step the server rejects raise NeedsBrowser; run() (and the
+    'http' batch engine) then continue the same LimeSurvey session in
+    Playwright from the current step.
+
+    Examples:
+        >>> filler = HttpFormFiller("data/config.json", form_url=stub.url)
+        >>> filler.run()
+        True
+    """
+
+    # Page type -> HTTP handler (None: nothing to fill, just submit)
+    HTTP_HANDLERS = {
+        'intro': None,
+        'skip': None,
+        'fixed_zero': 'http_fixed_zero',
+        'simple_inputs': 'http_simple_inputs',
+        'checkboxes': 'http_checkboxes',
+        'table_counts': 'http_table_counts',
+    }
+
+    # Texts/classes of the login and "Další" submit buttons
+    SUBMIT_TEXTS = ('Pokračovat',)
+    NEXT_TEXTS = ('Další', 'movenext')
+    NEXT_CLASSES = ('ls-move-forward',)
+
+    def __init__(self, *args, pool: Optional[ConnectionPool] = None, **kwargs):
+        """
+        Args:
+            pool: Connection pool (default: one per process, shared by all fillers)
+            *args, **kwargs: See FormFiller
+        """
+        super().__init__(*args, **kwargs)
+        self.session = HttpSession(pool, timeout=self.transition_timeout_ms / 1000)
+        # Whether the last http_navigate() had to fall back to reloading the survey URL
+        self.navigation_retried = False
+
+    def run(self) -> bool:
+        """
+        Fill the survey over HTTP, in a browser from the current step if needed
+
+        Returns:
+            True if form completed successfully, False otherwise
+        """
+        try:
+            return self.fill_http()
+        except NeedsBrowser as e:
+            self.hand_over(e)
+            return super().run()
+
+    def hand_over(self, reason: Exception) -> None:
+        """Pass the LimeSurvey session to the Playwright path (see resume_session)"""
+        log_warning(self.logger, f"Continuing in the browser: {reason}")
+        self.session_state = self.session.storage_state(self.form_url)
+
+    def fill_http(self) -> bool:
+        """
+        Fill the whole survey over HTTP
+
+        Returns:
+            True if form completed successfully, False otherwise
+
+        Raises:
+            NeedsBrowser: If a step needs the browser (session is left at that step)
+        """
+        log_section(self.logger, "LimeSurvey Form Filler Started (HTTP)")
+        self.logger.info(f"School: {self.config.get('school_name', 'Unknown')}")
+        self.logger.info(f"Code: {self.config['code']}")
+        self.logger.info(f"School types: {', '.join(get_school_types(self.config))}")
+
+        if self.already_completed():
+            log_skip(self.logger, "survey", "Already completed according to the checkpoint journal")
+            return True
+
+        try:
+            # Login (or continue the session of an interrupted run)
+            with self._timed('login', 'login'):
+                step = self.http_resume()
+                resumed = step is not None
+                if not resumed:
+                    step = self.http_login()
+
+            # After the resume decision (see FormFiller.fill)
+            if not resumed:
+                self._journal(IN_PROGRESS)
+
+            max_pages = self.MAX_PAGES
+            page_count = 0
+            submitted_step = None
+
+            while page_count < max_pages:
+                page_count += 1
+                snapshot = step.snapshot
+
+                if self.corpus is not None:
+                    self._capture(step.html, snapshot)
+
+                if snapshot.completed:
+                    log_success(self.logger, "Form completed successfully!")
+                    log_section(self.logger, "✅ DONE")
+                    self._journal(COMPLETED, page=page_count - 1)
+                    return True
+
+                if snapshot.errors:
+                    log_warning(self.logger, f"Validation messages on page: {'; '.join(snapshot.errors)}")
+                    if snapshot.step is not None and snapshot.step == submitted_step:
+                        raise NeedsBrowser(f"Server did not accept step {snapshot.step}")
+
+                if step.client_logic:
+                    raise NeedsBrowser(f"Step {snapshot.step} has {step.client_logic}")
+
+                self.http_process_page(step)
+
+                with self._timed('navigation', 'submit_step'):
+                    submitted_step = snapshot.step
+                    step = self.http_submit(step)
+
+                self.http_save_progress(page_count)
+
+            log_error(self.logger, f"Max pages ({max_pages}) reached without completion")
+            self._journal(FAILED, error=f"Max pages ({max_pages}) reached")
+            return False
+
+        except NeedsBrowser:
+            raise
+
+        except Exception as e:
+            log_error(self.logger, "Fatal error during form filling", e)
+            self._journal(FAILED, error=f"{type(e).__name__}: {e}")
+            return False
+
+    def http_navigate(self, method: str, url: str, data: Optional[List[Tuple[str, str]]] = None) -> HtmlStep:
+        """
+        Request a page with the rate ceiling and backoff of the browser path
+
+        Connection failures and 5xx answers are retried after a jittered
+        backoff by reloading the survey URL (the step the server last
+        accepted); navigation_retried then tells the caller the original
+        request may not have arrived.
+
+        Raises:
+            RetriesExhausted: If the server keeps failing
+        """
+        self.navigation_retried = False
+
+        while True:
+            self._throttle()
+            started = time.perf_counter()
+            response = None
+            try:
+                response = self.session.request(method, url, data)
+                if response.status >= 500:
+                    self.server_errors += 1
+                    log_warning(self.logger, f"Server error ({response.status}) for {method} {url}")
+            except (OSError, http.client.HTTPException) as e:
+                log_warning(self.logger, f"Request failed: {type(e).__name__}: {e}")
+
+            ok = response is not None and response.status < 500
+            delay = self._next_delay(started, ok)
+            if delay is None:
+                with self._timed('detection', 'parse_step'):
+                    return HtmlStep(response.url, response.text, response.status)
+
+            log_warning(self.logger, f"Retrying in {delay:.1f}s (attempt {self.retries}/{self.MAX_RETRIES})")
+            time.sleep(delay)
+            method, url, data = 'GET', self.form_url, None
+            self.navigation_retried = True
+
+    def http_resume(self) -> Optional[HtmlStep]:
+        """
+        Continue a saved or handed-over session (see FormFiller.resume_session)
+
+        Returns:
+            Current step of the session, or None to log in as usual
+        """
+        state = self._session_to_resume()
+        if not state or not state.get('cookies'):
+            return None
+
+        self.session.load_storage_state(state)
+        step = self.http_navigate('GET', self.form_url)
+
+        if self._resumed(step.snapshot):
+            return step
+
+        self.session.clear_cookies()
+        return None
+
+    def http_login(self) -> HtmlStep:
+        """
+        Login to survey with access code
+
+        If the token POST fails and its retry (a reload of the survey URL)
+        shows the login form again, the access code never reached the server
+        and is submitted again, up to MAX_RETRIES times.
+        """
+        log_section(self.logger, "Login")
+        self.logger.info(f"Navigating to {self.form_url}")
+
+        step = self.http_navigate('GET', self.form_url)
+
+        for attempt in range(self.MAX_RETRIES + 1):
+            token_fields = [field for field in step.inputs if field['name'] == 'token'] or step.inputs[:1]
+            if not token_fields or step.action is None:
+                raise NeedsBrowser("No access code field on the login page")
+
+            token_fields[0]['value'] = self.config['code']
+            log_field_fill(self.logger, "Access code", self.config['code'])
+
+            button = step.submit_button(self.SUBMIT_TEXTS)
+            step = self.http_navigate('POST', step.action, step.form_data(button))
+
+            if step.snapshot.step is not None or step.snapshot.completed:
+                log_success(self.logger, "Logged in")
+                return step
+
+            if not self.navigation_retried or attempt == self.MAX_RETRIES:
+                break
+
+            log_warning(self.logger, "Login page shown again after a failed request, submitting the access code again")
+
+        messages = '; '.join(step.snapshot.errors) or "login page shown again"
+        raise Exception(f"Login failed: {messages}")
+
+    def http_submit(self, step: HtmlStep) -> HtmlStep:
+        """Submit the step with its 'Další' button"""
+        button = step.submit_button(self.NEXT_TEXTS, self.NEXT_CLASSES)
+        if button is None or step.action is None:
+            raise NeedsBrowser(f"No 'Další' button on step {step.snapshot.step}")
+        return self.http_navigate('POST', step.action, step.form_data(button))
+
+    def http_save_progress(self, page_count: int) -> None:
+        """Save the session cookies and journal the last submitted page"""
+        if not self.checkpoint:
+            return
+
+        try:
+            self.checkpoint.save_storage_state(self.config['code'], self.session.storage_state(self.form_url))
+            self._journal(IN_PROGRESS, page=page_count)
+        except Exception as e:
+            log_warning(self.logger, f"Could not save checkpoint: {e}")
+
+    def http_process_page(self, step: HtmlStep) -> None:
+        """
+        Set the answers of the current step
+
+        Raises:
+            NeedsBrowser: If the page is unknown or its type has no HTTP handler
+        """
+        snapshot = step.snapshot
+        question_text = snapshot.question_text
+
+        with self._timed('detection', 'detect_question_type') as span:
+            question_info = self._detect_page(question_text)
+            if question_info:
+                span.update(page_type=question_info.page_type, activity_code=question_info.activity_code)
+
+        if question_info is None:
+            if question_text:
+                raise NeedsBrowser(f"Unknown page on step {snapshot.step}")
+            return
+
+        page_type = question_info.page_type
+        if page_type not in self.HTTP_HANDLERS:
+            raise NeedsBrowser(f"No HTTP handler for page type {page_type}")
+
+        with self._timed(
+            'fill',
+            f"fill_{page_type}",
+            page_type=page_type,
+            activity_code=question_info.activity_code,
+            page=self.page_counter
+        ):
+            handler = self.HTTP_HANDLERS[page_type]
+
+            if handler is None:
+                if page_type == 'skip':
+                    log_skip(self.logger, question_info.description, "Per business rules")
+                return
+
+            if not getattr(self, handler)(step, question_info):
+                log_warning(self.logger, "Page processing failed, but continuing...")
+
+    def http_fixed_zero(self, step: HtmlStep, info: QuestionInfo) -> bool:
+        """Fill all fields with 0"""
+        try:
+            if not step.inputs:
+                log_warning(self.logger, "No input fields found")
+                return False
+
+            for field in step.inputs:
+                field['value'] = '0'
+            self._note_fill_mode({'mode': 'http'})
+
+            self.logger.info(f"Filled {len(step.inputs)} fields with 0")
+            return True
+
+        except Exception as e:
+            log_error(self.logger, "Error filling fixed zeros", e)
+            return False
+
+    def http_simple_inputs(self, step: HtmlStep, info: QuestionInfo) -> bool:
+        """Fill simple year inputs with random values (only first 3 years, 2025/2026 stays empty)"""
+        try:
+            counts = self._simple_input_counts(info)
+
+            num_inputs = len(step.visible_inputs)
+
+            if num_inputs < 3:
+                log_warning(self.logger, f"Expected at least 3 inputs, found {num_inputs}")
+                return False
+
+            values = self._simple_input_values(counts, num_inputs)
+            filled_count = step.fill_visible(values)
+            self._note_fill_mode({'mode': 'http'})
+
+            if filled_count < len(counts):
+                log_warning(self.logger, f"Filled only {filled_count} of {len(counts)} year inputs")
+                return False
+
+            for year, count in zip(self.SCHOOL_YEARS, counts):
+                log_field_fill(self.logger, f"Školní rok {year}", count)
+
+            if len(values) > len(counts):
+                self.logger.info(f"Školní rok 2025/2026: (left empty per business rules)")
+
+            return True
+
+        except Exception as e:
+            log_error(self.logger, "Error filling simple inputs", e)
+            return False
+
+    def http_checkboxes(self, step: HtmlStep, info: QuestionInfo) -> bool:
+        """Fill checkboxes based on JSON topics"""
+        try:
+            topics = self._checkbox_topics(info)
+
+            if not topics:
+                return False
+
+            if not step.checkboxes:
+                log_warning(self.logger, "No checkboxes found on page")
+                return False
+
+            report = step.select_topics(topics.normalized)
+            self._note_fill_mode(report)
+
+            self._log_checkbox_report(topics.topics, report)
+
+            return True
+
+        except Exception as e:
+            log_error(self.logger, "Error filling checkboxes", e)
+            return False
+
+    def http_table_counts(self, step: HtmlStep, info: QuestionInfo) -> bool:
+        """Fill table with topic × year counts (only 3 years, 2025/2026 stays empty)"""
+        try:
+            topics, values = self._table_values(info)
+
+            if not step.visible_inputs:
+                # Every row hidden by relevance: nothing to fill
+                self.logger.info("No visible table rows, nothing to fill")
+                return True
+
+            filled_count = step.fill_visible(values)
+            self._note_fill_mode({'mode': 'http'})
+
+            self._log_table_fill(topics, values, filled_count)
+
+            return True
+
+        except Exception as e:
+            log_error(self.logger, "Error filling table counts", e)
+            return False
@@ -9,15 +9,17 @@ from datetime import datetime
 def setup_logger(
     name: str = 'form_filler',
     log_to_file: bool = True,
-    verbose: bool = False
+    verbose: bool = False,
+    console: bool = True
 ) -> logging.Logger:
     """
     Setup logger with console and optional file output
 
     Args:
-        name: Logger name
+        name: Logger name (also used as log file prefix)
         log_to_file: Whether to also log to file
         verbose: Enable verbose/debug logging
+        console: Whether to log to console (batch runs keep per-school logs in files only)
 
     Returns:
         Configured logger instance
@@ -34,16 +36,17 @@ def setup_logger(
     # Remove existing handlers to avoid duplicates
     logger.handlers.clear()
 
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.DEBUG if verbose else logging.INFO)
+    # Console handler (optional)
+    if console:
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setLevel(logging.DEBUG if verbose else logging.INFO)
 
-    console_formatter = logging.Formatter(
-        '%(asctime)s | %(message)s',
-        datefmt='%H:%M:%S'
-    )
-    console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
+        console_formatter = logging.Formatter(
+            '%(asctime)s | %(message)s',
+            datefmt='%H:%M:%S'
+        )
+        console_handler.setFormatter(console_formatter)
+        logger.addHandler(console_handler)
 
     # File handler (optional)
     if log_to_file:
@@ -51,7 +54,7 @@ def setup_logger(
         logs_dir.mkdir(exist_ok=True)
 
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        log_file = logs_dir / f'form_filler_{timestamp}.log'
+        log_file = logs_dir / f'{name}_{timestamp}.log'
 
         file_handler = logging.FileHandler(log_file, encoding='utf-8')
         file_handler.setLevel(logging.DEBUG)
@@ -68,6 +71,21 @@ def setup_logger(
     return logger
 
 
+def close_logger(logger: logging.Logger) -> None:
+    """
+    Close and remove all handlers of a logger (releases its log file)
+
+    Batch runs create one file logger per school; closing it when the school
+    finishes keeps the number of open files constant over the batch.
+
+    Args:
+        logger: Logger instance
+    """
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
+
 class LogColors:
     """ANSI color codes for terminal output"""
     RESET = '\033[0m'
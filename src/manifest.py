@@ -0,0 +1,291 @@
+"""Single-file manifests of school configs (JSONL or CSV) with a byte-offset index"""
+
+import csv
+import json
+import mmap
+import os
+import struct
+import threading
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+# Manifest suffixes holding the configs themselves (one school per line)
+RECORD_SUFFIXES = ('.jsonl', '.csv')
+
+# CSV columns holding JSON and integer values; other columns are strings
+CSV_JSON_COLUMNS = ('dvpp_topics', 'sdp_zzor')
+CSV_INT_COLUMNS = ('MS', 'ZS', 'SD')
+
+# Index file: magic, manifest size, manifest mtime_ns, record count, then
+# count + 1 little-endian uint64 offsets (start of each record, end of file)
+INDEX_SUFFIX = '.idx'
+_INDEX_MAGIC = b'EFIDX1\0\0'
+_INDEX_HEADER = struct.Struct('<8sQQQ')
+
+# Record references look like "wave_2025.jsonl#17" (0-based record number)
+REF_SEPARATOR = '#'
+
+
+def record_ref(manifest_path: str, index: int) -> str:
+    """
+    Reference of one manifest record, used in place of a config path
+
+    Examples:
+        >>> record_ref("data/wave.jsonl", 17)
+        'data/wave.jsonl#17'
+    """
+    return f"{manifest_path}{REF_SEPARATOR}{index}"
+
+
+def parse_ref(ref: str) -> Optional[Tuple[str, int]]:
+    """
+    Split a record reference into (manifest path, record number)
+
+    Returns:
+        None if ref is a plain config path
+
+    Examples:
+        >>> parse_ref("data/wave.jsonl#17")
+        ('data/wave.jsonl', 17)
+        >>> parse_ref("data/school.json") is None
+        True
+    """
+    path, sep, index = ref.rpartition(REF_SEPARATOR)
+    if not sep or not index.isdigit() or not path.endswith(RECORD_SUFFIXES):
+        return None
+    return path, int(index)
+
+
+class ManifestIndex:
+    """
+    Random access to the records of a JSONL/CSV manifest
+
+    The manifest and its offset index (<manifest>.idx, rebuilt when the
+    manifest's size or mtime changes) are memory-mapped, so a record is read
+    and parsed only when its school runs, and shards of a huge wave touch
+    only their own records. Each record is one line; empty lines and JSONL
+    lines starting with '#' are skipped, the first CSV line is the header.
+
+    Examples:
+        >>> index = ManifestIndex.shared("data/wave_2025.jsonl")
+        >>> len(index), index.config(0)['code']
+        (12000, 'ABC123')
+    """
+
+    # One instance per manifest and process (batch threads share it)
+    _instances: Dict[str, 'ManifestIndex'] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: JSONL or CSV manifest
+
+        Raises:
+            FileNotFoundError: If the manifest does not exist
+            ValueError: If the suffix is not a record manifest
+        """
+        self.path = Path(path)
+        self.is_csv = self.path.suffix == '.csv'
+
+        if self.path.suffix not in RECORD_SUFFIXES:
+            raise ValueError(f"Not a record manifest ({', '.join(RECORD_SUFFIXES)}): {path}")
+
+        with open(self.path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+
+        self._offsets = self._load_index()
+
+        self._header = b''
+        if self.is_csv and len(self._offsets) > 1:
+            # First record is the header row
+            self._header = self.raw(0)
+            self._offsets = self._offsets[1:]
+
+    @classmethod
+    def shared(cls, path: str) -> 'ManifestIndex':
+        """Index of the manifest, opened once per process"""
+        key = os.path.abspath(path)
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(path)
+            return cls._instances[key]
+
+    def __len__(self) -> int:
+        return max(0, len(self._offsets) - 1)
+
+    def _load_index(self):
+        """Offsets from the index file, (re)built if missing or stale"""
+        stat = self.path.stat()
+        index_path = self.path.with_name(self.path.name + INDEX_SUFFIX)
+
+        try:
+            with open(index_path, 'rb') as f:
+                index_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, size, mtime_ns, count = _INDEX_HEADER.unpack_from(index_map)
+            end = _INDEX_HEADER.size + (count + 1) * 8
+            if (magic, size, mtime_ns) == (_INDEX_MAGIC, stat.st_size, stat.st_mtime_ns) and len(index_map) == end:
+                return memoryview(index_map)[_INDEX_HEADER.size:end].cast('Q')
+        except (OSError, ValueError, struct.error):
+            pass
+
+        offsets = self._scan()
+
+        # Best effort: a read-only directory just means rebuilding next time
+        try:
+            tmp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(_INDEX_HEADER.pack(_INDEX_MAGIC, stat.st_size, stat.st_mtime_ns, len(offsets) - 1))
+                offsets.tofile(f)
+            os.replace(tmp_path, index_path)
+        except OSError:
+            pass
+
+        return memoryview(offsets)
+
+    def _scan(self) -> array:
+        """Start offsets of all records plus the end offset, in one streaming pass"""
+        offsets = array('Q')
+        data = self._data
+        size = len(data)
+        position = 0
+
+        while position < size:
+            end = data.find(b'\n', position)
+            end = size if end == -1 else end + 1
+            line = data[position:end].strip()
+            if line and not (not self.is_csv and line.startswith(b'#')):
+                offsets.append(position)
+                # Records end where the next one starts, so keep the end too
+                last_end = end
+            position = end
+
+        if offsets:
+            offsets.append(last_end)
+        return offsets
+
+    def raw(self, index: int) -> bytes:
+        """Bytes of one record (the line, without the newline)"""
+        if not 0 <= index < len(self):
+            raise IndexError(f"{self.path} has no record {index} ({len(self)} records)")
+        start, end = self._offsets[index], self._offsets[index + 1]
+        line = self._data[start:end]
+        return line.split(b'\n', 1)[0].rstrip(b'\r')
+
+    def source(self, index: int) -> bytes:
+        """Bytes that fully determine a record's config (CSV: header + row)"""
+        raw = self.raw(index)
+        if self.is_csv:
+            return self._header + b'\n' + raw
+        return raw
+
+    def parse(self, source: bytes) -> Dict[str, Any]:
+        """
+        Config dictionary of a record source (see source())
+
+        Raises:
+            ValueError: If the record is not valid JSON / CSV
+        """
+        if not self.is_csv:
+            return json.loads(source.decode('utf-8'))
+
+        header_line, row_line = source.decode('utf-8-sig').split('\n', 1)
+        header = next(csv.reader([header_line]))
+        row = next(csv.reader([row_line]))
+        return csv_row_config(header, row)
+
+    def config(self, index: int) -> Dict[str, Any]:
+        """Parsed (not validated) config of one record"""
+        return self.parse(self.source(index))
+
+    def refs(self, start: int = 0, step: int = 1) -> List[str]:
+        """References of every step-th record from start (a shard)"""
+        return [record_ref(str(self.path), index) for index in range(start, len(self), step)]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Stream the parsed configs in file order"""
+        for index in range(len(self)):
+            yield self.config(index)
+
+
+def csv_row_config(header: List[str], row: List[str]) -> Dict[str, Any]:
+    """
+    Build a config dictionary from one CSV row
+
+    Empty cells are left out. CSV_INT_COLUMNS become integers when they are
+    numeric (otherwise validation reports them), CSV_JSON_COLUMNS hold JSON.
+
+    Examples:
+        >>> csv_row_config(['code', 'MS', 'ZS', 'dvpp_topics'], ['ABC', '20', '', '{"k": ["inkluze"]}'])
+        {'code': 'ABC', 'MS': 20, 'dvpp_topics': {'k': ['inkluze']}}
+    """
+    if len(row) > len(header):
+        raise ValueError(f"Row has {len(row)} cells, header has {len(header)} columns")
+
+    config: Dict[str, Any] = {}
+    for column, cell in zip(header, row):
+        column = column.strip()
+        if cell == '':
+            continue
+        if column in CSV_JSON_COLUMNS:
+            try:
+                config[column] = json.loads(cell)
+            except ValueError as e:
+                raise ValueError(f"Invalid JSON in column '{column}': {e}") from e
+        elif column in CSV_INT_COLUMNS and cell.strip().lstrip('-').isdigit():
+            config[column] = int(cell)
+        else:
+            config[column] = cell
+    return config
+
+
+def read_record(ref: str) -> Tuple[bytes, Dict[str, Any]]:
+    """
+    Source bytes and parsed config of a record reference
+
+    Raises:
+        ValueError: If ref is not a record reference or the record does not parse
+        IndexError: If the manifest has no such record
+    """
+    parsed = parse_ref(ref)
+    if parsed is None:
+        raise ValueError(f"Not a manifest record reference: {ref}")
+    index = ManifestIndex.shared(parsed[0])
+    source = index.source(parsed[1])
+    return source, index.parse(source)
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """
+    Parse a shard spec "I/N" (0-based shard I of N)
+
+    Raises:
+        ValueError: If the spec is malformed or I is not below N
+
+    Examples:
+        >>> parse_shard("1/4")
+        (1, 4)
+    """
+    try:
+        shard, count = (int(part) for part in spec.split('/'))
+    except ValueError:
+        raise ValueError(f"Shard must look like I/N (e.g. 0/4), got: {spec}") from None
+
+    if count < 1 or not 0 <= shard < count:
+        raise ValueError(f"Shard index must be in 0..{count - 1}, got: {spec}")
+
+    return shard, count
+
+
+def select_shard(config_paths: List[str], shard: int, count: int) -> List[str]:
+    """
+    Every count-th config from position shard (round-robin, like --processes)
+
+    Examples:
+        >>> select_shard(['a', 'b', 'c', 'd', 'e'], 1, 2)
+        ['b', 'd']
+    """
+    return config_paths[shard::count]
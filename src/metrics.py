@@ -0,0 +1,228 @@
+"""Timing spans of filler steps, exported as Chrome trace JSON and Prometheus text"""
+
+import json
+import os
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+
+# Histogram buckets (seconds) for step and survey durations
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Span attributes exported as Prometheus labels (school is left out on purpose,
+# one series per school would explode the cardinality of batch metrics)
+SPAN_LABELS = ('page_type', 'activity_code')
+
+
+class Span:
+    """One timed step of a survey run"""
+
+    __slots__ = ('name', 'start', 'duration', 'attrs')
+
+    def __init__(self, name: str, start: float, duration: float, attrs: Dict[str, Any]):
+        """
+        Args:
+            name: Step name (login, get_question_text, fill_checkboxes, ...)
+            start: Wall clock start (seconds since epoch)
+            duration: Duration in seconds (monotonic clock)
+            attrs: school, phase, page_type, activity_code, page, error
+        """
+        self.name = name
+        self.start = start
+        self.duration = duration
+        self.attrs = attrs
+
+    def __getstate__(self):
+        return (self.name, self.start, self.duration, self.attrs)
+
+    def __setstate__(self, state):
+        self.name, self.start, self.duration, self.attrs = state
+
+    def __repr__(self) -> str:
+        return f"Span({self.name}, {self.duration * 1000:.1f} ms)"
+
+
+class Tracer:
+    """
+    Collects spans of one survey run
+
+    Tracers are plain picklable objects, so batch worker processes can send
+    them back with their results and all schools end up in one export.
+
+    Examples:
+        >>> tracer = Tracer(school="ZŠ Test")
+        >>> with tracer.span('fill_checkboxes', phase='fill') as attrs:
+        ...     attrs['activity_code'] = '1.II/7'
+        >>> tracer.spans[0].name, tracer.spans[0].attrs['activity_code']
+        ('fill_checkboxes', '1.II/7')
+    """
+
+    def __init__(self, school: str = ""):
+        """
+        Args:
+            school: School name (or access code) attached to every span
+        """
+        self.school = school
+        self.pid = os.getpid()
+        self.spans: List[Span] = []
+
+    @contextmanager
+    def span(self, name: str, **attrs) -> Iterator[Dict[str, Any]]:
+        """
+        Time the enclosed block
+
+        Works around awaits too, as long as the tracer belongs to one survey.
+
+        Args:
+            name: Step name
+            **attrs: Span attributes (phase, page_type, activity_code, ...)
+
+        Yields:
+            The attribute dict, to add attributes known only inside the block
+        """
+        attrs = dict(attrs, school=self.school)
+        start_wall = time.time()
+        start = time.perf_counter()
+
+        try:
+            yield attrs
+        except BaseException as e:
+            attrs['error'] = type(e).__name__
+            raise
+        finally:
+            self.spans.append(Span(name, start_wall, time.perf_counter() - start, attrs))
+
+
+def chrome_trace(tracers: Iterable[Tracer]) -> Dict[str, Any]:
+    """
+    Chrome trace-event JSON (chrome://tracing, Perfetto) of all spans
+
+    Every survey gets its own timeline row, named after the school.
+
+    Args:
+        tracers: Tracers of one or more survey runs
+
+    Returns:
+        Trace dict ready for json.dump
+    """
+    events = []
+
+    for tid, tracer in enumerate(tracers, start=1):
+        events.append({
+            'name': 'thread_name', 'ph': 'M', 'pid': tracer.pid, 'tid': tid,
+            'args': {'name': tracer.school or f"survey {tid}"},
+        })
+        for span in tracer.spans:
+            events.append({
+                'name': span.name,
+                'cat': span.attrs.get('phase', ''),
+                'ph': 'X',
+                'ts': round(span.start * 1_000_000),
+                'dur': round(span.duration * 1_000_000),
+                'pid': tracer.pid,
+                'tid': tid,
+                'args': span.attrs,
+            })
+
+    return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+class _Histogram:
+    """Cumulative Prometheus histogram over DURATION_BUCKETS"""
+
+    def __init__(self):
+        self.buckets = [0] * len(DURATION_BUCKETS)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for index, bound in enumerate(DURATION_BUCKETS):
+            if value <= bound:
+                self.buckets[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def lines(self, metric: str, labels: str) -> List[str]:
+        sep = ',' if labels else ''
+        lines = [
+            f'{metric}_bucket{{{labels}{sep}le="{bound}"}} {count}'
+            for bound, count in zip(DURATION_BUCKETS, self.buckets)
+        ]
+        lines.append(f'{metric}_bucket{{{labels}{sep}le="+Inf"}} {self.count}')
+        plain = f'{{{labels}}}' if labels else ''
+        lines.append(f'{metric}_sum{plain} {self.sum:.6f}')
+        lines.append(f'{metric}_count{plain} {self.count}')
+        return lines
+
+
+def _label_value(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def prometheus_text(tracers: Iterable[Tracer], surveys: Iterable[Tuple[bool, float]] = ()) -> str:
+    """
+    Prometheus text exposition of step and survey durations
+
+    Args:
+        tracers: Tracers of one or more survey runs
+        surveys: (success, duration) per survey, e.g. from batch results
+
+    Returns:
+        Metrics text (for a textfile collector or a pushgateway)
+    """
+    steps: Dict[Tuple[str, ...], _Histogram] = defaultdict(_Histogram)
+    for tracer in tracers:
+        for span in tracer.spans:
+            key = (span.name, span.attrs.get('phase', '')) + tuple(
+                str(span.attrs.get(label) or '') for label in SPAN_LABELS
+            )
+            steps[key].observe(span.duration)
+
+    lines = [
+        '# HELP form_filler_step_duration_seconds Duration of instrumented survey steps',
+        '# TYPE form_filler_step_duration_seconds histogram',
+    ]
+    for key in sorted(steps):
+        labels = ','.join(
+            f'{label}="{_label_value(value)}"'
+            for label, value in zip(('step', 'phase') + SPAN_LABELS, key)
+        )
+        lines.extend(steps[key].lines('form_filler_step_duration_seconds', labels))
+
+    outcomes = {'success': 0, 'failure': 0}
+    survey_durations = _Histogram()
+    for success, duration in surveys:
+        outcomes['success' if success else 'failure'] += 1
+        survey_durations.observe(duration)
+
+    if survey_durations.count:
+        lines.append('# HELP form_filler_surveys_total Finished survey runs by result')
+        lines.append('# TYPE form_filler_surveys_total counter')
+        for result, count in outcomes.items():
+            lines.append(f'form_filler_surveys_total{{result="{result}"}} {count}')
+
+        lines.append('# HELP form_filler_survey_duration_seconds Duration of whole survey runs')
+        lines.append('# TYPE form_filler_survey_duration_seconds histogram')
+        lines.extend(survey_durations.lines('form_filler_survey_duration_seconds', ''))
+
+    return '\n'.join(lines) + '\n'
+
+
+def write_chrome_trace(path: str, tracers: Iterable[Tracer]) -> None:
+    """Write chrome_trace() of the tracers to a JSON file"""
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with open(target, 'w', encoding='utf-8') as f:
+        json.dump(chrome_trace(tracers), f, ensure_ascii=False)
+
+
+def write_prometheus(path: str, tracers: Iterable[Tracer], surveys: Iterable[Tuple[bool, float]] = ()) -> None:
+    """Write prometheus_text() to a file (atomically, for textfile collectors)"""
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(target.name + '.tmp')
+    tmp.write_text(prometheus_text(tracers, surveys), encoding='utf-8')
+    os.replace(tmp, target)
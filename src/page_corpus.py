@@ -0,0 +1,197 @@
+"""Corpus of captured, anonymized survey steps for offline regression checks"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.question_detector import RULES_VERSION, detect_question_type
+
+
+# Bump when the anonymization or the entry format changes; every format
+# version is a separate directory, so older corpora stay readable side by side
+CORPUS_FORMAT = 1
+
+INDEX_NAME = 'index.jsonl'
+
+# Inputs whose value is part of the page structure, not of the answers/session
+_STRUCTURAL_TYPES = ('checkbox', 'radio', 'submit', 'button', 'reset', 'image')
+
+_INPUT_RE = re.compile(r'<input\b[^>]*>', re.IGNORECASE)
+_TYPE_RE = re.compile(r'''\btype\s*=\s*["']?([\w-]+)''', re.IGNORECASE)
+_VALUE_RE = re.compile(r'''(\bvalue\s*=\s*)("[^"]*"|'[^']*'|[^\s>]+)''', re.IGNORECASE)
+_TEXTAREA_RE = re.compile(r'(<textarea\b[^>]*>).*?(</textarea>)', re.IGNORECASE | re.DOTALL)
+_URL_TOKEN_RE = re.compile(r'''([?&](?:amp;)?token=)[^&"'\s<>]+''', re.IGNORECASE)
+_HEX_SECRET_RE = re.compile(r'\b[0-9a-fA-F]{24,}\b')  # CSRF tokens, session ids
+_ICO_RE = re.compile(r'(?<![\w.])\d{8}(?![\w.])')      # IČO is 8 digits
+
+ANONYMIZED = 'ANONYMIZED'
+
+
+def _blank_value(match: 're.Match') -> str:
+    tag = match.group(0)
+    input_type = _TYPE_RE.search(tag)
+    if input_type and input_type.group(1).lower() in _STRUCTURAL_TYPES:
+        return tag
+    return _VALUE_RE.sub(r'\1""', tag)
+
+
+def anonymize_html(html: str, secrets: Iterable[str] = ()) -> str:
+    """
+    Remove answers and session data from a captured page
+
+    - values of text/hidden inputs and textareas are emptied (answers, CSRF
+      token, EM mirrors); checkbox state and button values are kept
+    - the given secrets (access code, school name, ...) and any 8-digit
+      number (IČO) are replaced
+    - long hex strings (tokens in scripts) and token= URL parameters are replaced
+
+    Args:
+        html: Page HTML as captured
+        secrets: Literal strings to remove (empty ones are ignored)
+
+    Returns:
+        HTML with the same structure, question texts and labels
+
+    Examples:
+        >>> anonymize_html('<input type="text" name="a" value="12"><b>ABC123</b>', ["ABC123"])
+        '<input type="text" name="a" value=""><b>ANONYMIZED</b>'
+    """
+    html = _INPUT_RE.sub(_blank_value, html)
+    html = _TEXTAREA_RE.sub(r'\1\2', html)
+
+    # Longest first, so a secret containing another is replaced whole
+    for secret in sorted({secret for secret in secrets if secret and secret.strip()}, key=len, reverse=True):
+        html = html.replace(secret, ANONYMIZED)
+
+    html = _URL_TOKEN_RE.sub(r'\1' + ANONYMIZED, html)
+    html = _HEX_SECRET_RE.sub('0' * 32, html)
+    return _ICO_RE.sub('00000000', html)
+
+
+class PageCorpus:
+    """
+    Versioned corpus of anonymized survey steps, one file per distinct page
+
+    Captured pages are anonymized (see anonymize_html) and stored under
+    <root>/v<CORPUS_FORMAT>/<sha256[:16]>.html, so every page variant is
+    kept once however many surveys see it. <root>/v<N>/index.jsonl lists
+    them with what detection said at capture time (page type, activity
+    code, completion), which the offline replay (benchmarks/bench_corpus.py)
+    checks later rules and page scripts against.
+
+    Index lines are appended one write at a time, so batch threads and
+    worker processes can capture into one corpus; duplicate lines from
+    concurrent captures are merged on load.
+
+    Examples:
+        >>> corpus = PageCorpus.shared("benchmarks/corpus")
+        >>> corpus.add(page.content(), snapshot.question_text, secrets=["ABC123"])
+        'b7c1d0a2e4f59c31'
+    """
+
+    # One instance per corpus and process, shared by all fillers of a batch
+    _instances: Dict[str, 'PageCorpus'] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, root: str, version: int = CORPUS_FORMAT):
+        """
+        Args:
+            root: Corpus directory (created on first capture)
+            version: Corpus format to read/write (default: current)
+        """
+        self.root = Path(root)
+        self.dir = self.root / f"v{version}"
+        self.index_path = self.dir / INDEX_NAME
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    @classmethod
+    def shared(cls, root: str) -> 'PageCorpus':
+        """Corpus for the directory, loaded once per process"""
+        key = os.path.abspath(root)
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(root)
+            return cls._instances[key]
+
+    def _load(self) -> None:
+        if not self.index_path.exists():
+            return
+
+        with open(self.index_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    self.entries.setdefault(entry['id'], entry)
+                except (ValueError, KeyError, TypeError):
+                    continue
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(
+        self,
+        html: str,
+        question_text: str,
+        completed: bool = False,
+        secrets: Iterable[str] = ()
+    ) -> Optional[str]:
+        """
+        Anonymize and store a page unless the corpus already has it
+
+        Args:
+            html: Page HTML (page.content() or the HTTP response body)
+            question_text: Question text the filler detected the page from
+            completed: Whether the page is the completion page
+            secrets: Literal strings to remove (see anonymize_html)
+
+        Returns:
+            Id of the newly stored page, None if it was already known
+        """
+        html = anonymize_html(html, secrets)
+        digest = hashlib.sha256(html.encode('utf-8')).hexdigest()[:16]
+
+        with self._lock:
+            if digest in self.entries:
+                return None
+
+            self.dir.mkdir(parents=True, exist_ok=True)
+            path = self.dir / f"{digest}.html"
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_text(html, encoding='utf-8')
+            os.replace(tmp_path, path)
+
+            info = detect_question_type(question_text) if question_text else None
+            entry = {
+                'id': digest,
+                'file': path.name,
+                'page_type': 'completion' if completed else (info.page_type if info else None),
+                'school_type': info.school_type if info else None,
+                'activity_code': info.activity_code if info else None,
+                'json_key': info.json_key if info else None,
+                'rules': RULES_VERSION,
+                'captured': time.strftime('%Y-%m-%d'),
+            }
+
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self.entries[digest] = entry
+
+        return digest
+
+    def html(self, entry: Dict[str, Any]) -> str:
+        """Stored HTML of an index entry"""
+        return (self.dir / entry['file']).read_text(encoding='utf-8')
+
+    def sorted_entries(self) -> List[Dict[str, Any]]:
+        """Entries grouped by page type and activity code (stable report order)"""
+        return sorted(
+            self.entries.values(),
+            key=lambda entry: (entry['page_type'] or '~', entry['activity_code'] or '', entry['id'])
+        )
@@ -0,0 +1,144 @@
+"""In-page JavaScript shared by the sync and async form fillers"""
+
+
+# Visibility rule of every page script: an element is hidden when it or any
+# ancestor carries LimeSurvey's relevance class ls-hidden (on the row, the
+# question wrapper or any other container). _StepParser in src/http_engine.py
+# applies the same rule to the server HTML. Defines isHidden(el).
+IS_HIDDEN_JS = """
+    const isHidden = (el) => !!el.closest('.ls-hidden');
+"""
+
+# Apply a list of {el, value} changes (value is a string for text inputs and
+# a boolean for checkboxes) and notify LimeSurvey's ExpressionManager.
+#
+# Default ('events'): set each field and dispatch its own input/change events,
+# every one of which makes EM recalculate relevance and validation of the
+# whole page.
+#
+# Bulk (bulk = true): set all fields and their EM mirror inputs (java<SGQA>)
+# first, then run one ExprMgr_process_relevance_and_tailoring() pass. If the
+# page has no EM, a mirror is missing, or the mirrors do not hold the new
+# values after the pass, every field is re-applied with per-field events
+# ('fallback'). Defines applyChanges(changes, bulk) -> mode.
+_APPLY_CHANGES_JS = """
+    const setValue = (el, value) => {
+        if (el.type === 'checkbox') el.checked = value;
+        else el.value = value;
+    };
+    const mirrorValue = (el) => (el.type === 'checkbox' ? (el.checked ? 'Y' : '') : el.value);
+    const withEvents = (changes) => {
+        for (const {el, value} of changes) {
+            setValue(el, value);
+            if (el.type !== 'checkbox') el.dispatchEvent(new Event('input', {bubbles: true}));
+            el.dispatchEvent(new Event('change', {bubbles: true}));
+        }
+    };
+    const applyChanges = (changes, bulk) => {
+        if (!bulk || !changes.length) {
+            withEvents(changes);
+            return 'events';
+        }
+
+        const recalc = window.ExprMgr_process_relevance_and_tailoring;
+        const mirrors = changes.map(({el}) => document.getElementById('java' + el.name));
+        if (typeof recalc !== 'function' || mirrors.some(mirror => !mirror)) {
+            withEvents(changes);
+            return 'fallback';
+        }
+
+        changes.forEach(({el, value}, i) => {
+            setValue(el, value);
+            mirrors[i].value = mirrorValue(el);
+        });
+
+        const last = changes[changes.length - 1].el;
+        try {
+            recalc('onchange', last.name, last.type);
+        } catch (e) {
+            withEvents(changes);
+            return 'fallback';
+        }
+
+        // EM rewrites mirrors it does not accept; then let it see every field
+        if (changes.some(({el}, i) => mirrors[i].value !== mirrorValue(el))) {
+            withEvents(changes);
+            return 'fallback';
+        }
+        return 'bulk';
+    };
+"""
+
+# Fill all text inputs with 0 (handles hidden fields)
+# Returns {filled, mode}
+FILL_ALL_ZERO_JS = """(bulk) => {""" + _APPLY_CHANGES_JS + """
+    const inputs = Array.from(document.querySelectorAll('input[type="text"]'));
+    const mode = applyChanges(inputs.map(el => ({el: el, value: '0'})), bulk);
+    return {filled: inputs.length, mode: mode};
+}"""
+
+# Select exactly the given topics on a checkbox page in one call.
+# The label index (normalized label -> checkbox) is built once; each topic is
+# resolved by exact label match first, then by first word (> 3 chars). All
+# other checkboxes are unchecked; only real changes are applied.
+# Returns {matches: [{match: 'exact'|'first_word'|'unmatched', label}], unchecked, mode}
+SELECT_TOPICS_JS = """({topicNorms, bulk}) => {""" + _APPLY_CHANGES_JS + """
+    const norm = (text) => text.replace(/\\([^)]*\\)/g, '')
+        .toLowerCase()
+        .normalize("NFD")
+        .replace(/[\\u0300-\\u036f]/g, "")
+        .replace(/\\s+/g, " ")
+        .trim();
+
+    const exact = new Map();
+    const byFirstWord = new Map();
+    const checkboxes = Array.from(document.querySelectorAll('input[type="checkbox"]'));
+
+    for (const cb of checkboxes) {
+        const label = cb.nextElementSibling;
+        if (!label || !label.textContent) continue;
+        const labelNorm = norm(label.textContent);
+        const entry = {cb: cb, label: label.textContent.trim()};
+        if (!exact.has(labelNorm)) exact.set(labelNorm, entry);
+        const firstWord = labelNorm.split(' ')[0];
+        if (!byFirstWord.has(firstWord)) byFirstWord.set(firstWord, entry);
+    }
+
+    const selected = new Set();
+    const matches = topicNorms.map(topicNorm => {
+        let entry = exact.get(topicNorm);
+        let match = 'exact';
+        if (!entry) {
+            const topicFirstWord = topicNorm.split(' ')[0];
+            entry = topicFirstWord.length > 3 ? byFirstWord.get(topicFirstWord) : undefined;
+            match = 'first_word';
+        }
+        if (!entry) return {match: 'unmatched', label: ''};
+        selected.add(entry.cb);
+        return {match: match, label: entry.label};
+    });
+
+    const changes = checkboxes
+        .filter(cb => cb.checked !== selected.has(cb))
+        .map(cb => ({el: cb, value: selected.has(cb)}));
+    const unchecked = changes.filter(change => !change.value).length;
+    const mode = applyChanges(changes, bulk);
+
+    return {matches: matches, unchecked: unchecked, mode: mode};
+}"""
+
+# Fill values into text inputs in document order, skipping hidden ones
+# (IS_HIDDEN_JS, the inputs SNAPSHOT_JS reports as visible)
+# Returns {filled, mode}
+FILL_VISIBLE_INPUTS_JS = """({values, bulk}) => {""" + _APPLY_CHANGES_JS + IS_HIDDEN_JS + """
+    const visibleInputs = Array.from(document.querySelectorAll('input[type="text"]'))
+        .filter(input => !isHidden(input));
+
+    const count = Math.min(values.length, visibleInputs.length);
+    const changes = [];
+    for (let i = 0; i < count; i++) {
+        changes.push({el: visibleInputs[i], value: String(values[i])});
+    }
+    const mode = applyChanges(changes, bulk);
+    return {filled: count, mode: mode};
+}"""
@@ -0,0 +1,147 @@
+"""Everything the filler needs from a survey page, read in one round trip"""
+
+from typing import Any, Dict, List, Optional
+
+from src.page_scripts import IS_HIDDEN_JS
+
+
+# Collect question texts, completion flag, inputs, checkboxes and validation
+# messages of the current step. Visibility follows LimeSurvey relevance
+# (IS_HIDDEN_JS, the same rule the fill scripts use).
+SNAPSHOT_JS = """() => {""" + IS_HIDDEN_JS + """
+    const norm = (text) => (text || '').toLowerCase()
+        .normalize('NFD')
+        .replace(/[\\u0300-\\u036f]/g, '')
+        .replace(/\\s+/g, ' ')
+        .trim();
+    const text = (el) => (el ? (el.innerText || el.textContent || '') : '').trim();
+
+    const questions = Array.from(document.querySelectorAll('[id^="ls-question-text-"]'))
+        .map(el => ({id: el.id, text: text(el)}));
+
+    const bodyText = document.body ? text(document.body) : '';
+    const bodyNorm = norm(bodyText);
+    const completed = bodyNorm.includes('dekujeme vam') && bodyNorm.includes('odpovedi byly ulozeny');
+
+    const rowLabel = (el) => {
+        const row = el.closest('tr');
+        if (row) {
+            const head = row.querySelector('.answertext, th');
+            if (head) return text(head);
+        }
+        if (el.id) {
+            const label = document.querySelector(`label[for="${CSS.escape(el.id)}"]`);
+            if (label) return text(label);
+        }
+        const item = el.closest('.question-item, li');
+        const label = item && item.querySelector('label');
+        return text(label);
+    };
+
+    const inputs = Array.from(document.querySelectorAll('input[type="text"]')).map(el => ({
+        id: el.id,
+        name: el.name,
+        visible: !isHidden(el),
+        row: rowLabel(el),
+        value: el.value,
+    }));
+
+    const checkboxes = Array.from(document.querySelectorAll('input[type="checkbox"]')).map(el => {
+        const next = el.nextElementSibling;
+        const label = (next && next.textContent) ? next : (el.id ? document.querySelector(`label[for="${CSS.escape(el.id)}"]`) : null);
+        return {
+            id: el.id,
+            name: el.name,
+            label: label ? label.textContent.trim() : '',
+            checked: el.checked,
+            visible: !isHidden(el),
+        };
+    });
+
+    const errors = [];
+    document.querySelectorAll('.ls-em-error, .errormandatory, .alert-danger, .has-error .help-block').forEach(el => {
+        const message = text(el);
+        if (message && !isHidden(el) && !errors.includes(message)) errors.push(message);
+    });
+
+    const step = document.querySelector('input[name="thisstep"]');
+
+    return {
+        step: step ? step.value : null,
+        questions: questions,
+        body: questions.length ? '' : bodyText,
+        completed: completed,
+        inputs: inputs,
+        checkboxes: checkboxes,
+        errors: errors,
+    };
+}"""
+
+
+class PageSnapshot:
+    """
+    Result of SNAPSHOT_JS for one survey step
+
+    Examples:
+        >>> snapshot = PageSnapshot({'questions': [{'id': 'ls-question-text-1', 'text': '1.I/1 ...'}],
+        ...                          'inputs': [{'name': 'a', 'visible': True}, {'name': 'b', 'visible': False}]})
+        >>> snapshot.question_text, len(snapshot.visible_inputs)
+        ('1.I/1 ...', 1)
+    """
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            data: Object returned by SNAPSHOT_JS (None = page could not be read)
+        """
+        data = data or {}
+        self.step: Optional[str] = data.get('step')
+        self.questions: List[Dict[str, str]] = data.get('questions') or []
+        self.body_text: str = data.get('body') or ''
+        self.completed: bool = bool(data.get('completed'))
+        self.inputs: List[Dict[str, Any]] = data.get('inputs') or []
+        self.checkboxes: List[Dict[str, Any]] = data.get('checkboxes') or []
+        self.errors: List[str] = data.get('errors') or []
+
+    @property
+    def question_text(self) -> str:
+        """Text of the first question, or the whole page text if there is none"""
+        if self.questions:
+            return self.questions[0]['text']
+        return self.body_text
+
+    @property
+    def visible_inputs(self) -> List[Dict[str, Any]]:
+        """Text inputs not hidden by relevance (IS_HIDDEN_JS), in document order"""
+        return [field for field in self.inputs if field.get('visible')]
+
+    @property
+    def checked_labels(self) -> List[str]:
+        """Labels of currently checked checkboxes"""
+        return [box['label'] for box in self.checkboxes if box.get('checked')]
+
+    def __repr__(self) -> str:
+        return (
+            f"PageSnapshot(step={self.step}, questions={len(self.questions)}, "
+            f"inputs={len(self.visible_inputs)}/{len(self.inputs)}, "
+            f"checkboxes={len(self.checkboxes)}, completed={self.completed})"
+        )
+
+
+def take_snapshot(page) -> PageSnapshot:
+    """
+    Read the current step of a sync Playwright page
+
+    Args:
+        page: playwright.sync_api Page
+
+    Returns:
+        PageSnapshot of the page
+    """
+    return PageSnapshot(page.evaluate(SNAPSHOT_JS))
+
+
+async def async_take_snapshot(page) -> PageSnapshot:
+    """Async variant of take_snapshot() for playwright.async_api pages"""
+    return PageSnapshot(await page.evaluate(SNAPSHOT_JS))
+
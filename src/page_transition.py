@@ -0,0 +1,157 @@
+"""Event-driven detection of LimeSurvey page transitions"""
+
+import time
+import uuid
+from typing import Tuple
+
+from playwright.sync_api import Page, TimeoutError, Error
+from playwright.async_api import Page as AsyncPage
+
+
+# Marker of the currently rendered survey step: LimeSurvey's hidden
+# "thisstep" field plus the ids of all question texts on the page
+STEP_MARKER_JS = """() => {
+    const step = document.querySelector('input[name="thisstep"]');
+    const questions = Array.from(document.querySelectorAll('[id^="ls-question-text-"]'))
+        .map(el => el.id)
+        .join(',');
+    return (step ? step.value : '') + '|' + questions;
+}"""
+
+# Stamp the current window so a full page reload is detectable even when
+# LimeSurvey re-renders the same step (e.g. after a validation error)
+ARM_TRANSITION_JS = """(token) => {
+    window.__evaluaceStepToken = token;
+}"""
+
+# True once a different step is in the DOM and ready to be processed
+TRANSITION_DONE_JS = """([previousMarker, token]) => {
+    if (document.readyState === 'loading' || !document.body) {
+        return false;
+    }
+
+    const step = document.querySelector('input[name="thisstep"]');
+    const questions = Array.from(document.querySelectorAll('[id^="ls-question-text-"]'))
+        .map(el => el.id)
+        .join(',');
+    const marker = (step ? step.value : '') + '|' + questions;
+
+    const changed = window.__evaluaceStepToken !== token || marker !== previousMarker;
+    if (!changed) {
+        return false;
+    }
+
+    if (questions) {
+        return true;
+    }
+
+    // Completion page has no question text, only the thank-you message
+    const text = document.body.innerText
+        .normalize('NFD')
+        .replace(/[\\u0300-\\u036f]/g, '')
+        .toLowerCase();
+    if (text.includes('dekujeme vam')) {
+        return true;
+    }
+
+    // Any other page with a navigation/submit control is ready as well
+    return !!document.querySelector('.ls-move-forward, button[type="submit"], input[type="submit"]');
+}"""
+
+ArmedTransition = Tuple[str, str]
+
+
+def arm_transition(page: Page) -> ArmedTransition:
+    """
+    Remember the current step before triggering navigation
+
+    Args:
+        page: Playwright page showing the current step
+
+    Returns:
+        (step marker, window token) to pass to wait_for_transition()
+    """
+    token = uuid.uuid4().hex
+    marker = page.evaluate(STEP_MARKER_JS)
+    page.evaluate(ARM_TRANSITION_JS, token)
+    return marker, token
+
+
+def _is_navigation_error(error: Error) -> bool:
+    """Navigation can destroy the execution context while polling"""
+    return "context was destroyed" in str(error) or "navigat" in str(error)
+
+
+def _remaining_ms(deadline: float) -> float:
+    """Milliseconds left until a time.monotonic() deadline"""
+    return (deadline - time.monotonic()) * 1000
+
+
+def wait_for_transition(page: Page, armed: ArmedTransition, timeout_ms: float) -> bool:
+    """
+    Wait until the next survey step is in the DOM
+
+    Returns as soon as the step marker changes (or the window was reloaded)
+    and the new step content is rendered, instead of sleeping a fixed time.
+    Navigation errors (POST → redirect → GET destroys the polled document)
+    restart the polling on the new document within the same deadline.
+
+    Args:
+        page: Playwright page
+        armed: Value returned by arm_transition() before the click
+        timeout_ms: Upper bound for the whole wait in milliseconds
+
+    Returns:
+        True if transition was detected, False on timeout
+    """
+    deadline = time.monotonic() + timeout_ms / 1000
+
+    while True:
+        remaining = _remaining_ms(deadline)
+        # timeout=0 would mean "no timeout" to Playwright
+        if remaining <= 0:
+            return False
+
+        try:
+            page.wait_for_function(
+                TRANSITION_DONE_JS,
+                arg=list(armed),
+                timeout=remaining
+            )
+            return True
+        except TimeoutError:
+            return False
+        except Error as e:
+            if not _is_navigation_error(e):
+                raise
+
+
+async def async_arm_transition(page: AsyncPage) -> ArmedTransition:
+    """Async variant of arm_transition()"""
+    token = uuid.uuid4().hex
+    marker = await page.evaluate(STEP_MARKER_JS)
+    await page.evaluate(ARM_TRANSITION_JS, token)
+    return marker, token
+
+
+async def async_wait_for_transition(page: AsyncPage, armed: ArmedTransition, timeout_ms: float) -> bool:
+    """Async variant of wait_for_transition()"""
+    deadline = time.monotonic() + timeout_ms / 1000
+
+    while True:
+        remaining = _remaining_ms(deadline)
+        if remaining <= 0:
+            return False
+
+        try:
+            await page.wait_for_function(
+                TRANSITION_DONE_JS,
+                arg=list(armed),
+                timeout=remaining
+            )
+            return True
+        except TimeoutError:
+            return False
+        except Error as e:
+            if not _is_navigation_error(e):
+                raise
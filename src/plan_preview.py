@@ -0,0 +1,214 @@
+"""Offline fill plan preview: what every survey page of a config will get, without a browser"""
+
+import functools
+import logging
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from src.config_loader import ConfigValidationError, load_config_and_plan
+from src.fill_plan import NO_TOPICS
+from src.question_detector import QuestionInfo, detect_question_type
+from src.survey_pages import SCHOOL_YEAR_LABELS, TOPIC_LABELS, SurveyPage, survey_pages_for
+from src.text_normalizer import match_checkbox_labels, normalize_for_checkbox_matching
+from src.value_planner import ValuePlanner
+
+
+class _WarningCollector(logging.Handler):
+    """Keeps the warnings ValuePlanner logs, for the preview's 'warnings' list"""
+
+    def __init__(self, warnings: List[str]):
+        super().__init__(logging.WARNING)
+        self.warnings = warnings
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.warnings.append(record.getMessage().removeprefix('⚠️  '))
+
+
+class PlanPreview(ValuePlanner):
+    """
+    Fill plan of one config for the whole known page sequence
+
+    Walks survey_pages_for() for the config's school types, detects every
+    page from its question text like a live run, and computes its values
+    with the same ValuePlanner code the fillers use. Checkbox pages match
+    topics against TOPIC_LABELS with the SELECT_TOPICS_JS rules; table pages
+    show only the rows checked on their checkbox page, filled in page order
+    the way FILL_VISIBLE_INPUTS_JS does, so a topic order that differs from
+    the label order (values landing in another topic's row) is reported.
+
+    DVPP counts are random per run; pages with such values are marked
+    'random' and a seed makes them reproducible.
+
+    Examples:
+        >>> preview = PlanPreview("data/school.json", seed=1)
+        >>> [page['type'] for page in preview.pages()][:3]
+        ['intro', 'simple_inputs', 'checkboxes']
+    """
+
+    def __init__(self, config_path: str, seed: Optional[int] = None, plan_cache: Optional[str] = None):
+        """
+        Args:
+            config_path: Config file or manifest record reference
+            seed: Seed for the random counts (per access code, so any subset
+                of a wave gets the same values); None = a fresh draw
+            plan_cache: Directory caching compiled FillPlans (see src.fill_plan)
+
+        Raises:
+            ConfigValidationError: If validation fails
+            FileNotFoundError: If the config doesn't exist
+        """
+        self.config_path = config_path
+        self.config, self.plan = load_config_and_plan(config_path, plan_cache_dir=plan_cache)
+        self.seed = seed
+        self.last_checked_topics = []
+
+        # Planner warnings are collected, not printed
+        self.warnings: List[str] = []
+        self.logger = logging.Logger('plan_preview')
+        self.logger.addHandler(_WarningCollector(self.warnings))
+
+        # Label indexes checked per activity code (visible rows of its table)
+        self._checked_rows: Dict[str, List[int]] = {}
+
+    def pages(self) -> List[Dict[str, Any]]:
+        """Planned fill of every page, in survey order"""
+        # Private generator: previews never touch the global random state
+        self.rng = random.Random(f"{self.seed}:{self.config['code']}" if self.seed is not None else None)
+
+        self.last_checked_topics = []
+        self._checked_rows = {}
+        self.warnings.clear()
+        return [self._page_entry(step, page) for step, page in enumerate(survey_pages_for(self.plan.school_types))]
+
+    def _page_entry(self, step: int, page: SurveyPage) -> Dict[str, Any]:
+        entry: Dict[str, Any] = {'step': step, 'qid': page.qid}
+        info = detect_question_type(page.question_text)
+
+        if info is None:
+            entry['type'] = 'unknown'
+            self.warnings.append(f"Step {step} (qid {page.qid}): question text not recognized, a live run stops here")
+            return entry
+
+        entry.update(
+            type=info.page_type,
+            school_type=info.school_type,
+            activity_code=info.activity_code,
+            description=info.description,
+        )
+        if info.page_type != page.kind:
+            self.warnings.append(f"Step {step} (qid {page.qid}): detected as {info.page_type}, the survey shows {page.kind}")
+
+        if info.page_type == 'fixed_zero':
+            entry['values'] = ['0'] * page.num_inputs
+
+        elif info.page_type == 'simple_inputs':
+            values = self._simple_input_values(self._simple_input_counts(info), page.num_inputs)
+            entry.update(years=SCHOOL_YEAR_LABELS[:len(values)], values=values, random=True)
+
+        elif info.page_type == 'checkboxes':
+            topic_plan = self._checkbox_topics(info) or NO_TOPICS
+            checked = []
+            for topic, (index, match) in zip(topic_plan.topics, match_checkbox_labels(topic_plan.normalized, TOPIC_LABELS)):
+                if index < 0:
+                    self.warnings.append(f"Step {step} ({info.activity_code}): topic '{topic}' matches no checkbox")
+                    continue
+                checked.append({'topic': topic, 'label': TOPIC_LABELS[index], 'match': match})
+                self._checked_rows.setdefault(info.activity_code, []).append(index)
+            entry['checked'] = checked
+
+        elif info.page_type == 'table_counts':
+            entry.update(self._table_entry(step, info))
+
+        return entry
+
+    def _table_entry(self, step: int, info: QuestionInfo) -> Dict[str, Any]:
+        """Visible rows of a count table and the values each one gets"""
+        topics, values = self._table_values(info)
+        rows = sorted(set(self._checked_rows.get(info.activity_code, ())))
+        where = f"Step {step} ({info.activity_code})"
+
+        # FILL_VISIBLE_INPUTS_JS fills the visible inputs in page order,
+        # 4 per row, with the values in topic order
+        table = [
+            {'label': TOPIC_LABELS[index], 'values': [str(value) for value in values[i * 4:(i + 1) * 4]]}
+            for i, index in enumerate(rows)
+        ]
+
+        if len(values) != len(rows) * 4:
+            self.warnings.append(f"{where}: {len(values)} values for {len(rows)} visible rows × 4 years")
+
+        norms = [normalize_for_checkbox_matching(topic) for topic in topics]
+        for topic, (index, _), row in zip(topics, match_checkbox_labels(norms, TOPIC_LABELS), rows):
+            if index >= 0 and index != row:
+                self.warnings.append(
+                    f"{where}: values of '{topic}' land in row '{TOPIC_LABELS[row]}' "
+                    f"(topic order differs from the page order)"
+                )
+
+        return {
+            'topics': list(topics),
+            'rows': table,
+            'random': info.calculation != 'from_json',
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready preview: config identity, pages and warnings"""
+        pages = self.pages()
+        return {
+            'config': self.config_path,
+            'code': self.config['code'],
+            'school_name': self.config.get('school_name', ''),
+            'school_types': list(self.plan.school_types),
+            'seed': self.seed,
+            'pages': pages,
+            'warnings': list(self.warnings),
+        }
+
+
+def plan_file(config_path: str, seed: Optional[int] = None, plan_cache: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Preview of one config; a config that does not load gets {'config', 'error'}
+    """
+    try:
+        return PlanPreview(config_path, seed=seed, plan_cache=plan_cache).to_dict()
+    except (ConfigValidationError, FileNotFoundError, IndexError, ValueError) as e:
+        # Invalid config, invalid JSON or a missing manifest record
+        return {'config': config_path, 'error': str(e)}
+    except Exception as e:
+        # Anything else is reported per config too, a bulk preview goes on
+        return {'config': config_path, 'error': f"{type(e).__name__}: {e}"}
+
+
+def plan_files(
+    config_paths: List[str],
+    processes: Optional[int] = None,
+    seed: Optional[int] = None,
+    plan_cache: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Preview many configs in parallel worker processes
+
+    Args:
+        config_paths: Config files or manifest record references
+        processes: Worker processes (default: CPU count; 1 = in this process)
+        seed: See PlanPreview
+        plan_cache: See PlanPreview
+
+    Returns:
+        Previews in the order of config_paths
+    """
+    processes = max(1, min(processes or os.cpu_count() or 1, len(config_paths)))
+    plan = functools.partial(plan_file, seed=seed, plan_cache=plan_cache)
+
+    if processes == 1:
+        return [plan(path) for path in config_paths]
+
+    # Previews are cheap, so hand them out in large chunks
+    chunksize = max(1, len(config_paths) // (processes * 4))
+
+    mp_context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=processes, mp_context=mp_context) as executor:
+        return list(executor.map(plan, config_paths, chunksize=chunksize))
@@ -1,7 +1,8 @@
 """Page type detection based on question text patterns"""
 
-from typing import Optional, Dict, Literal
-from src.text_normalizer import normalize_czech_text, contains_normalized, extract_activity_code
+import hashlib
+from typing import Optional, Literal, Tuple
+from src.text_normalizer import normalize_czech_text, extract_activity_code
 
 
 PageType = Literal[
@@ -18,7 +19,14 @@ SchoolType = Literal['MS', 'ZS', 'SD']
 
 
 class QuestionInfo:
-    """Information about detected question/page"""
+    """
+    Information about detected question/page
+
+    Immutable: detection hands out the same instance for every page that
+    matches a rule, so it must never be modified.
+    """
+
+    __slots__ = ('page_type', 'school_type', 'activity_code', 'calculation', 'json_key', 'description')
 
     def __init__(
         self,
@@ -29,362 +37,279 @@ class QuestionInfo:
         json_key: Optional[str] = None,
         description: str = ""
     ):
-        self.page_type = page_type
-        self.school_type = school_type
-        self.activity_code = activity_code
-        self.calculation = calculation  # 'random', 'from_json', or None
-        self.json_key = json_key
-        self.description = description
+        set_field = object.__setattr__
+        set_field(self, 'page_type', page_type)
+        set_field(self, 'school_type', school_type)
+        set_field(self, 'activity_code', activity_code)
+        set_field(self, 'calculation', calculation)  # 'random', 'from_json', or None
+        set_field(self, 'json_key', json_key)
+        set_field(self, 'description', description)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"QuestionInfo is immutable (cannot set '{name}')")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"QuestionInfo is immutable (cannot delete '{name}')")
+
+    def _key(self) -> Tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, QuestionInfo) and self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __reduce__(self):
+        return (QuestionInfo, self._key())
 
     def __repr__(self) -> str:
         return f"QuestionInfo(type={self.page_type}, school={self.school_type}, desc={self.description})"
 
 
-def detect_question_type(question_text: str) -> Optional[QuestionInfo]:
-    """
-    Detect question/page type from question text
+# A clause is (activity code or None, substrings of the normalized text).
+# It holds when the page has that activity code (if given) and contains all
+# substrings; a rule matches when any of its clauses holds.
+Clause = Tuple[Optional[str], Tuple[str, ...]]
 
-    Args:
-        question_text: Text from ls-question-text-* element
 
-    Returns:
-        QuestionInfo object with detected page type, or None if unknown
+class Rule:
+    """One row of the detection table: page info and its match clauses"""
 
-    Detection logic based on docs/workflow_mapping.md and docs/exploration_findings.md
-    """
-    if not question_text:
-        return None
+    __slots__ = ('info', 'clauses')
 
-    normalized = normalize_czech_text(question_text)
+    def __init__(self, info: QuestionInfo, *clauses: Clause):
+        self.info = info
+        self.clauses = clauses
 
-    # Special pages (order matters!)
 
-    # Completion page
-    if "dekujeme vam" in normalized and "odpovedi byly ulozeny" in normalized:
-        return QuestionInfo(
-            page_type='completion',
-            description="Completion page"
-        )
-
-    # OMJ page (skip)
-    if ("omj" in normalized or "narodnosti" in normalized) and \
-       ("deti s omj" in normalized or "deti s omj ovlivnil" in normalized):
-        return QuestionInfo(
-            page_type='skip',
-            description="OMJ národnosti (skip)"
-        )
-
-    # Vedoucí pracovníci (fill 0)
-    if "vedoucich pracovniku" in normalized and "ve vzdelavani" in normalized:
-        return QuestionInfo(
-            page_type='fixed_zero',
-            description="Vedoucí pracovníci (fill 0)"
-        )
-
-    # Ukrajinští pracovníci (fill 0)
-    if "ukrajinskou narodnosti" in normalized or \
-       ("pracovniku ve vzdelavani" in normalized and "ukrajin" in normalized):
-        return QuestionInfo(
-            page_type='fixed_zero',
-            description="Ukrajinští pracovníci (fill 0)"
-        )
-
-    # Introduction page (IČO verification)
-    if "evidence podporenosti" in normalized and "ico" in normalized:
-        return QuestionInfo(
-            page_type='intro',
-            description="Introduction page"
-        )
-
-    # Extract activity code for further detection
-    activity_code = extract_activity_code(question_text)
+# Detection table, in priority order - the first matching rule wins.
+# Based on docs/workflow_mapping.md and docs/exploration_findings.md
+RULES: Tuple[Rule, ...] = (
+    # Special pages (order matters!)
+    Rule(
+        QuestionInfo('completion', description="Completion page"),
+        (None, ("dekujeme vam", "odpovedi byly ulozeny")),
+    ),
+    Rule(
+        QuestionInfo('skip', description="OMJ národnosti (skip)"),
+        (None, ("deti s omj",)),
+    ),
+    Rule(
+        QuestionInfo('fixed_zero', description="Vedoucí pracovníci (fill 0)"),
+        (None, ("vedoucich pracovniku", "ve vzdelavani")),
+    ),
+    Rule(
+        QuestionInfo('fixed_zero', description="Ukrajinští pracovníci (fill 0)"),
+        (None, ("ukrajinskou narodnosti",)),
+        (None, ("pracovniku ve vzdelavani", "ukrajin")),
+    ),
+    Rule(
+        QuestionInfo('intro', description="Introduction page"),
+        (None, ("evidence podporenosti", "ico")),
+    ),
 
     # MŠ pages
-    if detect_ms_pages(normalized, activity_code):
-        return detect_ms_pages(normalized, activity_code)
+    Rule(
+        QuestionInfo('simple_inputs', 'MS', '1.I/1', 'random', description="MŠ - Školní asistent"),
+        ("1.I/1", ()),
+        (None, ("skolni asistent", "ms")),
+    ),
+    Rule(
+        QuestionInfo('checkboxes', 'MS', '1.I/4', json_key='vzdělávání_MŠ_1_I_4',
+                     description="MŠ - DVPP témata (checkboxes)"),
+        ("1.I/4", ("vzdelavani pracovniku", "v jake oblasti")),
+    ),
+    Rule(
+        QuestionInfo('table_counts', 'MS', '1.I/4', 'random', description="MŠ - DVPP počty"),
+        ("1.I/4", ("vzdelavani pracovniku", "pocet deti")),
+        ("1.I/4", ("vzdelavani pracovniku", "s jakym poctem")),
+    ),
+    Rule(
+        QuestionInfo('checkboxes', 'MS', '1.I/6', json_key='1.I/6 Inovativní vzdělávání dětí v MŠ',
+                     description="MŠ - SDP/ŽZOR témata (checkboxes)"),
+        ("1.I/6", ("inovativni vzdelavani", "v jake oblasti")),
+    ),
+    Rule(
+        QuestionInfo('table_counts', 'MS', '1.I/6', 'from_json', '1.I/6 Inovativní vzdělávání dětí v MŠ',
+                     description="MŠ - SDP/ŽZOR počty (exact from JSON)"),
+        ("1.I/6", ("inovativni vzdelavani", "pocet deti")),
+        ("1.I/6", ("inovativni vzdelavani", "kolik deti")),
+    ),
+    Rule(
+        QuestionInfo('simple_inputs', 'MS', '1.I/8', 'random', description="MŠ - Tematická setkávání"),
+        ("1.I/8", ()),
+        (None, ("tematicka", "komunitni setkavani", "ms")),
+    ),
 
     # ZŠ pages
-    if detect_zs_pages(normalized, activity_code):
-        return detect_zs_pages(normalized, activity_code)
+    Rule(
+        QuestionInfo('simple_inputs', 'ZS', '1.II/1', 'random', description="ZŠ - Školní asistent"),
+        ("1.II/1", ()),
+        (None, ("jakemu poctu zaku", "poskytli podporu")),
+    ),
+    Rule(
+        QuestionInfo('simple_inputs', 'ZS', '1.I/2', 'random', description="ZŠ - Školní asistent"),
+        (None, ("skolni asistent", "zs")),
+        ("1.I/2", ()),
+    ),
+    Rule(
+        QuestionInfo('checkboxes', 'ZS', '1.II/7', json_key='vzdělávání_ZŠ_1_II_7',
+                     description="ZŠ - DVPP témata (checkboxes)"),
+        ("1.II/7", ("vzdelavani pracovniku", "v jake oblasti")),
+    ),
+    Rule(
+        QuestionInfo('table_counts', 'ZS', '1.II/7', 'random', description="ZŠ - DVPP počty"),
+        ("1.II/7", ("vzdelavani pracovniku", "pocet")),
+        ("1.II/7", ("vzdelavani pracovniku", "s jakym poctem")),
+    ),
+    Rule(
+        QuestionInfo('checkboxes', 'ZS', '1.II/9', json_key='1.II/9 Inovativní vzdělávání žáků v ZŠ',
+                     description="ZŠ - SDP/ŽZOR témata (checkboxes)"),
+        ("1.II/9", ("inovativni vzdelavani", "v jake oblasti")),
+    ),
+    Rule(
+        QuestionInfo('table_counts', 'ZS', '1.II/9', 'from_json', '1.II/9 Inovativní vzdělávání žáků v ZŠ',
+                     description="ZŠ - SDP/ŽZOR počty (exact from JSON)"),
+        ("1.II/9", ("inovativni vzdelavani", "pocet")),
+        ("1.II/9", ("inovativni vzdelavani", "kolik")),
+        ("1.II/9", ("inovativni vzdelavani", "s jakym")),
+    ),
+    Rule(
+        QuestionInfo('simple_inputs', 'ZS', '1.II/11', 'random', description="ZŠ - Tematická setkávání"),
+        ("1.II/11", ()),
+        (None, ("tematicka", "komunitni setkavani", "zs")),
+        (None, ("tematicka", "komunitni setkavani", "zaku")),
+    ),
+    # 1.I/5 and 1.I/7: older ZŠ codes (fallback)
+    Rule(
+        QuestionInfo('checkboxes', 'ZS', '1.I/5', json_key='vzdělávání_ZŠ_1_I_5',
+                     description="ZŠ - DVPP témata (checkboxes)"),
+        ("1.I/5", ("vzdelavani pracovniku", "v jake oblasti")),
+    ),
+    Rule(
+        QuestionInfo('table_counts', 'ZS', '1.I/5', 'random', description="ZŠ - DVPP počty"),
+        ("1.I/5", ("vzdelavani pracovniku",)),
+    ),
+    Rule(
+        QuestionInfo('checkboxes', 'ZS', '1.I/7', json_key='1.I/7 Inovativní vzdělávání žáků v ZŠ',
+                     description="ZŠ - SDP/ŽZOR témata (checkboxes)"),
+        ("1.I/7", ("inovativni vzdelavani", "v jake oblasti")),
+    ),
+    Rule(
+        QuestionInfo('table_counts', 'ZS', '1.I/7', 'from_json', '1.I/7 Inovativní vzdělávání žáků v ZŠ',
+                     description="ZŠ - SDP/ŽZOR počty (exact from JSON)"),
+        ("1.I/7", ("inovativni vzdelavani",)),
+    ),
 
     # ŠD pages
-    if detect_sd_pages(normalized, activity_code):
-        return detect_sd_pages(normalized, activity_code)
-
-    return None
-
-
-def detect_ms_pages(normalized: str, activity_code: str) -> Optional[QuestionInfo]:
-    """Detect MŠ-specific pages"""
-
-    # 1.I/1 Školní asistent MŠ
-    if activity_code == "1.I/1" or \
-       ("skolni asistent" in normalized and "ms" in normalized):
-        return QuestionInfo(
-            page_type='simple_inputs',
-            school_type='MS',
-            activity_code='1.I/1',
-            calculation='random',
-            description="MŠ - Školní asistent"
-        )
-
-    # 1.I/4 DVPP MŠ - Checkboxes
-    if activity_code == "1.I/4" and \
-       "vzdelavani pracovniku" in normalized and \
-       "v jake oblasti" in normalized:
-        return QuestionInfo(
-            page_type='checkboxes',
-            school_type='MS',
-            activity_code='1.I/4',
-            json_key='vzdělávání_MŠ_1_I_4',
-            description="MŠ - DVPP témata (checkboxes)"
-        )
-
-    # 1.I/4 DVPP MŠ - Counts
-    if activity_code == "1.I/4" and \
-       "vzdelavani pracovniku" in normalized and \
-       ("pocet deti" in normalized or "s jakym poctem" in normalized):
-        return QuestionInfo(
-            page_type='table_counts',
-            school_type='MS',
-            activity_code='1.I/4',
-            calculation='random',
-            description="MŠ - DVPP počty"
-        )
-
-    # 1.I/6 SDP/ŽZOR MŠ - Checkboxes
-    if activity_code == "1.I/6" and \
-       "inovativni vzdelavani" in normalized and \
-       "v jake oblasti" in normalized:
-        return QuestionInfo(
-            page_type='checkboxes',
-            school_type='MS',
-            activity_code='1.I/6',
-            json_key='1.I/6 Inovativní vzdělávání dětí v MŠ',
-            description="MŠ - SDP/ŽZOR témata (checkboxes)"
-        )
-
-    # 1.I/6 SDP/ŽZOR MŠ - Counts
-    if activity_code == "1.I/6" and \
-       "inovativni vzdelavani" in normalized and \
-       ("pocet deti" in normalized or "kolik deti" in normalized):
-        return QuestionInfo(
-            page_type='table_counts',
-            school_type='MS',
-            activity_code='1.I/6',
-            calculation='from_json',
-            json_key='1.I/6 Inovativní vzdělávání dětí v MŠ',
-            description="MŠ - SDP/ŽZOR počty (exact from JSON)"
-        )
-
-    # 1.I/8 Tematická setkávání MŠ (NEW! Not in rules.md)
-    if activity_code == "1.I/8" or \
-       ("tematicka" in normalized and "komunitni setkavani" in normalized and "ms" in normalized):
-        return QuestionInfo(
-            page_type='simple_inputs',
-            school_type='MS',
-            activity_code='1.I/8',
-            calculation='random',
-            description="MŠ - Tematická setkávání"
-        )
-
-    return None
-
-
-def detect_zs_pages(normalized: str, activity_code: str) -> Optional[QuestionInfo]:
-    """Detect ZŠ-specific pages"""
-
-    # Similar structure to MŠ but with ZŠ identifiers
-    # To be implemented when testing with ZŠ data
-
-    # 1.II/1 Školní asistent ZŠ (PRIMARY CODE!)
-    if activity_code == "1.II/1" or \
-       ("jakemu poctu zaku" in normalized and "poskytli podporu" in normalized):
-        return QuestionInfo(
-            page_type='simple_inputs',
-            school_type='ZS',
-            activity_code='1.II/1',
-            calculation='random',
-            description="ZŠ - Školní asistent"
-        )
-
-    # 1.I/2 Školní asistent ZŠ (fallback/alternative code)
-    if ("skolni asistent" in normalized and "zs" in normalized) or \
-       (activity_code == "1.I/2"):
-        return QuestionInfo(
-            page_type='simple_inputs',
-            school_type='ZS',
-            activity_code='1.I/2',
-            calculation='random',
-            description="ZŠ - Školní asistent"
-        )
-
-    # 1.II/7 DVPP ZŠ - Checkboxes (PRIMARY ZŠ DVPP CODE!)
-    if activity_code == "1.II/7" and \
-       "vzdelavani pracovniku" in normalized and \
-       "v jake oblasti" in normalized:
-        return QuestionInfo(
-            page_type='checkboxes',
-            school_type='ZS',
-            activity_code='1.II/7',
-            json_key='vzdělávání_ZŠ_1_II_7',
-            description="ZŠ - DVPP témata (checkboxes)"
-        )
-
-    # 1.II/7 DVPP ZŠ - Counts
-    if activity_code == "1.II/7" and \
-       "vzdelavani pracovniku" in normalized and \
-       ("pocet" in normalized or "s jakym poctem" in normalized):
-        return QuestionInfo(
-            page_type='table_counts',
-            school_type='ZS',
-            activity_code='1.II/7',
-            calculation='random',
-            description="ZŠ - DVPP počty"
-        )
-
-    # 1.II/9 SDP/ŽZOR ZŠ - Checkboxes (PRIMARY ZŠ SDP/ŽZOR CODE!)
-    if activity_code == "1.II/9" and \
-       "inovativni vzdelavani" in normalized and \
-       "v jake oblasti" in normalized:
-        return QuestionInfo(
-            page_type='checkboxes',
-            school_type='ZS',
-            activity_code='1.II/9',
-            json_key='1.II/9 Inovativní vzdělávání žáků v ZŠ',
-            description="ZŠ - SDP/ŽZOR témata (checkboxes)"
-        )
-
-    # 1.II/9 SDP/ŽZOR ZŠ - Counts
-    if activity_code == "1.II/9" and \
-       "inovativni vzdelavani" in normalized and \
-       ("pocet" in normalized or "kolik" in normalized or "s jakym" in normalized):
-        return QuestionInfo(
-            page_type='table_counts',
-            school_type='ZS',
-            activity_code='1.II/9',
-            calculation='from_json',
-            json_key='1.II/9 Inovativní vzdělávání žáků v ZŠ',
-            description="ZŠ - SDP/ŽZOR počty (exact from JSON)"
-        )
-
-    # 1.II/11 Tematická setkávání ZŠ (similar to MŠ 1.I/8)
-    if activity_code == "1.II/11" or \
-       ("tematicka" in normalized and "komunitni setkavani" in normalized and ("zs" in normalized or "zaku" in normalized)):
-        return QuestionInfo(
-            page_type='simple_inputs',
-            school_type='ZS',
-            activity_code='1.II/11',
-            calculation='random',
-            description="ZŠ - Tematická setkávání"
-        )
-
-    # 1.I/5 DVPP ZŠ - Alternative code (fallback)
-    if activity_code == "1.I/5" and "vzdelavani pracovniku" in normalized:
-        if "v jake oblasti" in normalized:
-            return QuestionInfo(
-                page_type='checkboxes',
-                school_type='ZS',
-                activity_code='1.I/5',
-                json_key='vzdělávání_ZŠ_1_I_5',
-                description="ZŠ - DVPP témata (checkboxes)"
-            )
-        else:
-            return QuestionInfo(
-                page_type='table_counts',
-                school_type='ZS',
-                activity_code='1.I/5',
-                calculation='random',
-                description="ZŠ - DVPP počty"
-            )
+    Rule(
+        QuestionInfo('checkboxes', 'SD', '1.V/1', json_key='vzdělávání_ŠD_ŠK_1_V_1',
+                     description="ŠD - DVPP témata (checkboxes)"),
+        ("1.V/1", ("vzdelavani pracovniku", "v jake oblasti")),
+    ),
+    Rule(
+        QuestionInfo('table_counts', 'SD', '1.V/1', 'random', description="ŠD - DVPP počty"),
+        ("1.V/1", ("vzdelavani pracovniku", "pocet")),
+        ("1.V/1", ("vzdelavani pracovniku", "s jakym poctem")),
+    ),
+    Rule(
+        QuestionInfo('checkboxes', 'SD', '1.V/3',
+                     json_key='1.V/3 Inovativní vzdělávání účastníků zájmového vzdělávání v ŠD/ŠK',
+                     description="ŠD - SDP/ŽZOR témata (checkboxes)"),
+        ("1.V/3", ("inovativni vzdelavani", "v jake oblasti")),
+    ),
+    Rule(
+        QuestionInfo('table_counts', 'SD', '1.V/3', 'from_json',
+                     '1.V/3 Inovativní vzdělávání účastníků zájmového vzdělávání v ŠD/ŠK',
+                     description="ŠD - SDP/ŽZOR počty (exact from JSON)"),
+        ("1.V/3", ("inovativni vzdelavani", "pocet")),
+        ("1.V/3", ("inovativni vzdelavani", "kolik")),
+        ("1.V/3", ("inovativni vzdelavani", "s jakym")),
+    ),
+    Rule(
+        QuestionInfo('simple_inputs', 'SD', '1.I/3', 'random', description="ŠD - Školní asistent"),
+        (None, ("skolni asistent", "sd")),
+        (None, ("skolni asistent", "sk")),
+        ("1.I/3", ()),
+    ),
+)
+
+
+def _rules_version(rules: Tuple[Rule, ...]) -> str:
+    """Short content hash of the rule table (changes whenever a rule changes)"""
+    payload = repr([(rule.info._key(), rule.clauses) for rule in rules])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:12]
+
+
+RULES_VERSION = _rules_version(RULES)
+
+
+class RuleMatcher:
+    """
+    Rule table compiled for single-pass matching
+
+    At compile time every rule's clauses are split by activity code: for
+    each code known to the table (and for pages without a known code) the
+    matcher keeps only the rules and clauses that can hold for it, in
+    priority order. A page then walks its candidate list once, testing
+    substrings with short-circuiting `in` checks.
+
+    Examples:
+        >>> matcher = RuleMatcher(RULES)
+        >>> matcher.match("1.i/4 vzdelavani pracovniku - v jake oblasti?", "1.I/4").page_type
+        'checkboxes'
+    """
 
-    # 1.I/7 SDP/ŽZOR ZŠ - Alternative code (fallback)
-    if activity_code == "1.I/7" and "inovativni vzdelavani" in normalized:
-        if "v jake oblasti" in normalized:
-            return QuestionInfo(
-                page_type='checkboxes',
-                school_type='ZS',
-                activity_code='1.I/7',
-                json_key='1.I/7 Inovativní vzdělávání žáků v ZŠ',
-                description="ZŠ - SDP/ŽZOR témata (checkboxes)"
-            )
-        else:
-            return QuestionInfo(
-                page_type='table_counts',
-                school_type='ZS',
-                activity_code='1.I/7',
-                calculation='from_json',
-                json_key='1.I/7 Inovativní vzdělávání žáků v ZŠ',
-                description="ZŠ - SDP/ŽZOR počty (exact from JSON)"
+    def __init__(self, rules: Tuple[Rule, ...]):
+        codes = {code for rule in rules for code, _ in rule.clauses if code}
+        self._by_code = {code: self._candidates(rules, code) for code in codes}
+        self._no_code = self._candidates(rules, None)
+
+    @staticmethod
+    def _candidates(rules: Tuple[Rule, ...], code: Optional[str]):
+        """(info, clause substrings) of the rules that can match a page with `code`"""
+        candidates = []
+        for rule in rules:
+            clauses = tuple(
+                terms for clause_code, terms in rule.clauses
+                if clause_code is None or clause_code == code
             )
+            if clauses:
+                candidates.append((rule.info, clauses))
+        return tuple(candidates)
+
+    def match(self, normalized: str, activity_code: str) -> Optional[QuestionInfo]:
+        """First rule matching the normalized text and activity code"""
+        for info, clauses in self._by_code.get(activity_code, self._no_code):
+            for terms in clauses:
+                for term in terms:
+                    if term not in normalized:
+                        break
+                else:
+                    return info
+
+        return None
 
-    return None
-
-
-def detect_sd_pages(normalized: str, activity_code: str) -> Optional[QuestionInfo]:
-    """Detect ŠD-specific pages"""
-
-    # 1.V/1 DVPP ŠD/ŠK - Checkboxes
-    if activity_code == "1.V/1" and \
-       "vzdelavani pracovniku" in normalized and \
-       "v jake oblasti" in normalized:
-        return QuestionInfo(
-            page_type='checkboxes',
-            school_type='SD',
-            activity_code='1.V/1',
-            json_key='vzdělávání_ŠD_ŠK_1_V_1',
-            description="ŠD - DVPP témata (checkboxes)"
-        )
-
-    # 1.V/1 DVPP ŠD/ŠK - Counts
-    if activity_code == "1.V/1" and \
-       "vzdelavani pracovniku" in normalized and \
-       ("pocet" in normalized or "s jakym poctem" in normalized):
-        return QuestionInfo(
-            page_type='table_counts',
-            school_type='SD',
-            activity_code='1.V/1',
-            calculation='random',
-            description="ŠD - DVPP počty"
-        )
-
-    # 1.V/3 SDP/ŽZOR ŠD/ŠK - Checkboxes
-    if activity_code == "1.V/3" and \
-       "inovativni vzdelavani" in normalized and \
-       "v jake oblasti" in normalized:
-        return QuestionInfo(
-            page_type='checkboxes',
-            school_type='SD',
-            activity_code='1.V/3',
-            json_key='1.V/3 Inovativní vzdělávání účastníků zájmového vzdělávání v ŠD/ŠK',
-            description="ŠD - SDP/ŽZOR témata (checkboxes)"
-        )
-
-    # 1.V/3 SDP/ŽZOR ŠD/ŠK - Counts
-    if activity_code == "1.V/3" and \
-       "inovativni vzdelavani" in normalized and \
-       ("pocet" in normalized or "kolik" in normalized or "s jakym" in normalized):
-        return QuestionInfo(
-            page_type='table_counts',
-            school_type='SD',
-            activity_code='1.V/3',
-            calculation='from_json',
-            json_key='1.V/3 Inovativní vzdělávání účastníků zájmového vzdělávání v ŠD/ŠK',
-            description="ŠD - SDP/ŽZOR počty (exact from JSON)"
-        )
-
-    # 1.I/3 Školní asistent ŠD (if needed)
-    if ("skolni asistent" in normalized and ("sd" in normalized or "sk" in normalized)) or \
-       (activity_code == "1.I/3"):
-        return QuestionInfo(
-            page_type='simple_inputs',
-            school_type='SD',
-            activity_code='1.I/3',
-            calculation='random',
-            description="ŠD - Školní asistent"
-        )
-
-    return None
+
+_MATCHER = RuleMatcher(RULES)
+
+
+def detect_question_type(question_text: str) -> Optional[QuestionInfo]:
+    """
+    Detect question/page type from question text
+
+    Args:
+        question_text: Text from ls-question-text-* element
+
+    Returns:
+        QuestionInfo object with detected page type, or None if unknown
+    """
+    if not question_text:
+        return None
+
+    normalized = normalize_czech_text(question_text)
+    return _MATCHER.match(normalized, extract_activity_code(question_text))
 
 
 def is_completion_page(page_text: str) -> bool:
@@ -0,0 +1,137 @@
+"""Request interception policy: skip assets the filler never needs"""
+
+import re
+from collections import Counter
+from typing import Iterable, Optional
+from urllib.parse import urlsplit
+
+
+class ResourcePolicy:
+    """
+    Abort non-essential requests (images, fonts, styles, third-party hosts)
+
+    The filler reads each step with one snapshot script (SNAPSHOT_JS) and
+    drives inputs via page.evaluate, so theme assets are pure overhead.
+    Documents and scripts from the survey host are let through (LimeSurvey's
+    ExpressionManager validation runs in them); third-party scripts only
+    when they match the allowlist.
+
+    Examples:
+        >>> policy = ResourcePolicy("https://evaluace.opjak.cz/index.php/262621")
+        >>> policy.should_abort('image', "https://evaluace.opjak.cz/logo.png")
+        True
+        >>> policy.should_abort('script', "https://evaluace.opjak.cz/assets/em_javascript.js")
+        False
+        >>> policy.should_abort('script', "https://www.googletagmanager.com/gtag/js")
+        True
+    """
+
+    BLOCKED_TYPES = ('image', 'font', 'stylesheet', 'media')
+
+    # Scripts LimeSurvey needs for relevance, validation and navigation
+    SCRIPT_ALLOWLIST = (
+        r'jquery',
+        r'em_javascript',
+        r'expressions',
+        r'survey_runtime',
+        r'limesurvey',
+        r'ajaxify',
+        r'bootstrap',
+        r'decimal',
+        r'moment',
+    )
+
+    def __init__(
+        self,
+        survey_url: str,
+        blocked_types: Iterable[str] = BLOCKED_TYPES,
+        block_third_party: bool = True,
+        block_scripts: bool = False,
+        script_allowlist: Optional[Iterable[str]] = None
+    ):
+        """
+        Args:
+            survey_url: Survey URL; its host is the first-party host
+            blocked_types: Playwright resource types to abort on any host
+            block_third_party: Abort all requests to other hosts (except allowlisted scripts)
+            block_scripts: Also abort survey-host scripts not matching the allowlist
+            script_allowlist: Extra regex patterns of script URLs to always allow
+        """
+        self.survey_host = urlsplit(survey_url).hostname
+        self.blocked_types = frozenset(blocked_types)
+        self.block_third_party = block_third_party
+        self.block_scripts = block_scripts
+        self._script_allowlist = re.compile(
+            '|'.join(list(self.SCRIPT_ALLOWLIST) + list(script_allowlist or [])),
+            re.IGNORECASE
+        )
+
+        # Aborted requests per resource type
+        self.aborted = Counter()
+
+    def should_abort(self, resource_type: str, url: str) -> bool:
+        """
+        Decide whether a request can be skipped
+
+        Args:
+            resource_type: Playwright resource type (document, script, image, ...)
+            url: Request URL
+
+        Returns:
+            True if the request should be aborted
+        """
+        if resource_type in self.blocked_types:
+            return True
+
+        first_party = urlsplit(url).hostname == self.survey_host
+
+        if resource_type == 'script':
+            if self._script_allowlist.search(url):
+                return False
+            return self.block_scripts if first_party else self.block_third_party
+
+        if not first_party and self.block_third_party:
+            # data: and blob: URLs have no host and never hit the network
+            return url.startswith(('http:', 'https:'))
+
+        return False
+
+    def install(self, context) -> None:
+        """
+        Route all requests of a sync BrowserContext through the policy
+
+        Args:
+            context: playwright.sync_api BrowserContext
+        """
+        def handle(route) -> None:
+            request = route.request
+            if self.should_abort(request.resource_type, request.url):
+                self.aborted[request.resource_type] += 1
+                route.abort()
+            else:
+                route.continue_()
+
+        context.route('**/*', handle)
+
+    async def install_async(self, context) -> None:
+        """
+        Route all requests of an async BrowserContext through the policy
+
+        Args:
+            context: playwright.async_api BrowserContext
+        """
+        async def handle(route) -> None:
+            request = route.request
+            if self.should_abort(request.resource_type, request.url):
+                self.aborted[request.resource_type] += 1
+                await route.abort()
+            else:
+                await route.continue_()
+
+        await context.route('**/*', handle)
+
+    def summary(self) -> str:
+        """Human readable count of aborted requests"""
+        if not self.aborted:
+            return "no requests blocked"
+        return ", ".join(f"{count} {resource_type}" for resource_type, count in self.aborted.most_common())
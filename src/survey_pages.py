@@ -0,0 +1,199 @@
+"""Known page sequence of the evaluation survey (Šablony pro MŠ a ZŠ I)"""
+
+from typing import Dict, List, Optional
+
+
+# Topic labels offered on checkbox pages (and as rows of the count tables)
+TOPIC_LABELS = [
+    "čtenářská pre/gramotnost",
+    "matematická pre/gramotnost",
+    "digitální kompetence",
+    "polytechnické vzdělávání",
+    "umělecká gramotnost",
+    "cizí jazyky",
+    "EVVO (environmentální vzdělávání, výchova a osvěta)",
+    "inkluze včetně primární prevence",
+    "pedagogická diagnostika",
+    "formativní hodnocení",
+    "kariérové vzdělávání včetně spolupráce s trhem práce",
+    "well-being a psychické zdraví",
+]
+
+SCHOOL_YEAR_LABELS = ["2022/2023", "2023/2024", "2024/2025", "2025/2026"]
+
+
+class SurveyPage:
+    """One step of the survey as rendered by LimeSurvey"""
+
+    def __init__(
+        self,
+        qid: int,
+        kind: str,
+        question_text: str,
+        school_type: Optional[str] = None,
+        activity_code: Optional[str] = None,
+        num_inputs: int = 0
+    ):
+        """
+        Args:
+            qid: LimeSurvey question id (ls-question-text-<qid>)
+            kind: 'intro', 'simple_inputs', 'checkboxes', 'table_counts', 'skip' or 'fixed_zero'
+            question_text: Question text exactly as shown on the page
+            school_type: MS, ZS or SD for school-specific pages
+            activity_code: Activity code (checkbox and table pages of one code belong together)
+            num_inputs: Number of text inputs on simple/skip/fixed_zero pages
+        """
+        self.qid = qid
+        self.kind = kind
+        self.question_text = question_text
+        self.school_type = school_type
+        self.activity_code = activity_code
+        self.num_inputs = num_inputs
+
+    def __repr__(self) -> str:
+        return f"SurveyPage(qid={self.qid}, kind={self.kind}, code={self.activity_code})"
+
+
+INTRO_PAGE = SurveyPage(
+    1000, 'intro',
+    "Evidence podpořenosti v projektech Šablony pro MŠ a ZŠ I. "
+    "Ověřte prosím, že níže uvedené IČO odpovídá Vaší organizaci."
+)
+
+SCHOOL_PAGES: Dict[str, List[SurveyPage]] = {
+    'MS': [
+        SurveyPage(
+            1101, 'simple_inputs',
+            "1.I/1 Školní asistent – MŠ: Kolika dětem v MŠ poskytl školní asistent podporu "
+            "v jednotlivých školních letech?",
+            'MS', '1.I/1', num_inputs=4
+        ),
+        SurveyPage(
+            1102, 'checkboxes',
+            "1.I/4 Vzdělávání pracovníků ve vzdělávání MŠ – V jaké oblasti se pracovníci vzdělávali?",
+            'MS', '1.I/4'
+        ),
+        SurveyPage(
+            1103, 'table_counts',
+            "1.I/4 Vzdělávání pracovníků ve vzdělávání MŠ – Uveďte počet dětí, "
+            "kterých se vzdělávání pracovníků v dané oblasti týkalo.",
+            'MS', '1.I/4'
+        ),
+        SurveyPage(
+            1104, 'checkboxes',
+            "1.I/6 Inovativní vzdělávání dětí v MŠ – V jaké oblasti probíhalo inovativní vzdělávání?",
+            'MS', '1.I/6'
+        ),
+        SurveyPage(
+            1105, 'table_counts',
+            "1.I/6 Inovativní vzdělávání dětí v MŠ – Uveďte počet dětí podpořených "
+            "inovativním vzděláváním v dané oblasti.",
+            'MS', '1.I/6'
+        ),
+        SurveyPage(
+            1106, 'simple_inputs',
+            "1.I/8 Tematická a komunitní setkávání v MŠ – Kolik dětí se účastnilo setkávání?",
+            'MS', '1.I/8', num_inputs=4
+        ),
+    ],
+    'ZS': [
+        SurveyPage(
+            1201, 'simple_inputs',
+            "1.II/1 Jakému počtu žáků v ZŠ poskytli školní asistenti podporu "
+            "v jednotlivých školních letech?",
+            'ZS', '1.II/1', num_inputs=4
+        ),
+        SurveyPage(
+            1202, 'checkboxes',
+            "1.II/7 Vzdělávání pracovníků ve vzdělávání ZŠ – V jaké oblasti se pracovníci vzdělávali?",
+            'ZS', '1.II/7'
+        ),
+        SurveyPage(
+            1203, 'table_counts',
+            "1.II/7 Vzdělávání pracovníků ve vzdělávání ZŠ – S jakým počtem žáků pracovali "
+            "pracovníci vzdělaní v dané oblasti?",
+            'ZS', '1.II/7'
+        ),
+        SurveyPage(
+            1204, 'checkboxes',
+            "1.II/9 Inovativní vzdělávání žáků v ZŠ – V jaké oblasti probíhalo inovativní vzdělávání?",
+            'ZS', '1.II/9'
+        ),
+        SurveyPage(
+            1205, 'table_counts',
+            "1.II/9 Inovativní vzdělávání žáků v ZŠ – Kolik žáků bylo podpořeno "
+            "inovativním vzděláváním v dané oblasti?",
+            'ZS', '1.II/9'
+        ),
+        SurveyPage(
+            1206, 'simple_inputs',
+            "1.II/11 Tematická a komunitní setkávání v ZŠ – Kolik žáků se účastnilo setkávání?",
+            'ZS', '1.II/11', num_inputs=4
+        ),
+    ],
+    'SD': [
+        SurveyPage(
+            1301, 'checkboxes',
+            "1.V/1 Vzdělávání pracovníků ve vzdělávání ŠD/ŠK – V jaké oblasti se pracovníci vzdělávali?",
+            'SD', '1.V/1'
+        ),
+        SurveyPage(
+            1302, 'table_counts',
+            "1.V/1 Vzdělávání pracovníků ve vzdělávání ŠD/ŠK – S jakým počtem účastníků pracovali "
+            "pracovníci vzdělaní v dané oblasti?",
+            'SD', '1.V/1'
+        ),
+        SurveyPage(
+            1303, 'checkboxes',
+            "1.V/3 Inovativní vzdělávání účastníků zájmového vzdělávání v ŠD/ŠK – "
+            "V jaké oblasti probíhalo inovativní vzdělávání?",
+            'SD', '1.V/3'
+        ),
+        SurveyPage(
+            1304, 'table_counts',
+            "1.V/3 Inovativní vzdělávání účastníků zájmového vzdělávání v ŠD/ŠK – "
+            "Kolik účastníků bylo podpořeno inovativním vzděláváním v dané oblasti?",
+            'SD', '1.V/3'
+        ),
+    ],
+}
+
+COMMON_PAGES: List[SurveyPage] = [
+    SurveyPage(
+        1401, 'skip',
+        "Kolik dětí s OMJ ovlivnil projekt? Uveďte počty podle národnosti.",
+        num_inputs=3
+    ),
+    SurveyPage(
+        1402, 'fixed_zero',
+        "Kolik vedoucích pracovníků ve vzdělávání se účastnilo aktivit projektu?",
+        num_inputs=2
+    ),
+    SurveyPage(
+        1403, 'fixed_zero',
+        "Kolik pracovníků s ukrajinskou národností se účastnilo aktivit projektu?",
+        num_inputs=2
+    ),
+]
+
+COMPLETION_TEXT = "Děkujeme Vám! Vaše odpovědi byly uloženy."
+
+
+def survey_pages_for(school_types: List[str]) -> List[SurveyPage]:
+    """
+    Page sequence the survey shows for the given school types
+
+    Args:
+        school_types: School types with count > 0 (e.g. ['MS', 'SD'])
+
+    Returns:
+        Pages in survey order (intro, school sections, common pages)
+    """
+    pages = [INTRO_PAGE]
+
+    for school_type in ['MS', 'ZS', 'SD']:
+        if school_type in school_types:
+            pages.extend(SCHOOL_PAGES[school_type])
+
+    pages.extend(COMMON_PAGES)
+    return pages
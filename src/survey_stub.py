@@ -0,0 +1,473 @@
+"""Local LimeSurvey stand-in server for offline, reproducible runs
+
+Replays the survey flow of evaluace.opjak.cz: token login, intro page,
+MŠ/ZŠ/ŠD question pages with the same ls-question-text-* markup, checkbox
+lists, topic × year tables with ls-hidden rows and the "Děkujeme Vám"
+completion page. A small ExpressionManager stand-in (java<SGQA> mirror
+fields, one recalculation per input/change event) makes --bulk-fill
+measurable.
+
+Usage:
+    python -m src.survey_stub --port 8765 --latency 0.2
+    python main.py data/config.json --url http://127.0.0.1:8765/index.php/262621
+"""
+
+import argparse
+import html
+import random
+import secrets
+import threading
+import time
+from http.cookies import SimpleCookie
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from src.survey_pages import (
+    SurveyPage,
+    TOPIC_LABELS,
+    SCHOOL_YEAR_LABELS,
+    COMPLETION_TEXT,
+    survey_pages_for
+)
+
+
+SURVEY_ID = "262621"
+SURVEY_PATH = f"/index.php/{SURVEY_ID}"
+SESSION_COOKIE = "LS_SESSION"
+CSRF_FIELD = "YII_CSRF_TOKEN"
+
+# ExpressionManager stand-in: answer fields have java<SGQA> mirror inputs,
+# every input/change event copies the value into the mirror and runs a
+# recalculation pass over all fields of the page (like LimeSurvey's
+# relevance/validation pass), so per-field events cost O(fields²) per page.
+EM_SCRIPT = """<script>
+(function () {
+    window.emRecalculations = 0;
+    window.ExprMgr_process_relevance_and_tailoring = function (evt, name, type) {
+        window.emRecalculations++;
+        document.querySelectorAll('input[type="text"], input[type="checkbox"]').forEach(function (el) {
+            var mirror = document.getElementById('java' + el.name);
+            var value = mirror ? mirror.value : '';
+            var cell = el.closest('td, li');
+            if (cell) cell.classList.toggle('has-error', el.type === 'text' && value !== '' && !/^[0-9]+$/.test(value));
+        });
+    };
+    window.checkconditions = function (value, name, type) {
+        var mirror = document.getElementById('java' + name);
+        if (mirror) {
+            var el = document.getElementsByName(name)[0];
+            mirror.value = type === 'checkbox' ? (el.checked ? 'Y' : '') : value;
+        }
+        window.ExprMgr_process_relevance_and_tailoring('onchange', name, type);
+    };
+    ['input', 'change'].forEach(function (evt) {
+        document.addEventListener(evt, function (e) {
+            if (e.target.name && e.target.type !== 'hidden') {
+                window.checkconditions(e.target.value, e.target.name, e.target.type);
+            }
+        });
+    });
+})();
+</script>"""
+
+# Theme assets referenced by every page (so resource blocking is measurable)
+ASSETS = {
+    '/assets/theme.css': ('text/css', b"body { font-family: sans-serif; } .ls-hidden { display: none; }\n" * 200),
+    '/assets/logo.png': ('image/png', b"\x89PNG\r\n\x1a\n" + b"\x00" * 20000),
+    '/assets/font.woff2': ('font/woff2', b"\x00" * 30000),
+    '/assets/jquery.min.js': ('application/javascript', b"/* jQuery stand-in */\n"),
+}
+
+
+class StubSession:
+    """State of one respondent (one cookie)"""
+
+    def __init__(self, csrf_token: str):
+        self.csrf_token = csrf_token
+        self.token: Optional[str] = None
+        self.pages: List[SurveyPage] = []
+        self.step = 0
+        self.answers: Dict[str, str] = {}
+        # Checked topic indexes per activity code (drive ls-hidden rows)
+        self.checked: Dict[str, List[int]] = {}
+
+
+class SurveyStubServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server emulating the LimeSurvey survey
+
+    Attributes:
+        url: Survey URL to pass to FormFiller (form_url / --url)
+        completed: Submitted answers of finished surveys, by token
+        requests_served: Number of handled requests
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        school_types: Optional[List[str]] = None,
+        single_use_tokens: bool = False,
+        error_rate: float = 0.0
+    ):
+        """
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 = any free port)
+            latency: Seconds added to every page request
+            jitter: Random extra latency, uniform 0..jitter seconds
+            school_types: Sections shown for tokens not registered via register_token()
+            single_use_tokens: Reject tokens of already completed surveys (like the live server)
+            error_rate: Share of page requests answered 503 without touching the session
+                (an overloaded server, for the backoff path)
+        """
+        super().__init__((host, port), StubRequestHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.default_school_types = school_types or ['MS', 'ZS', 'SD']
+        self.single_use_tokens = single_use_tokens
+        self.error_rate = error_rate
+
+        self.tokens: Dict[str, List[str]] = {}
+        self.sessions: Dict[str, StubSession] = {}
+        self.completed: Dict[str, Dict[str, str]] = {}
+        self.requests_served = 0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{SURVEY_PATH}"
+
+    def register_token(self, token: str, school_types: List[str]) -> None:
+        """Show only the given school sections to a token"""
+        self.tokens[token] = list(school_types)
+
+    def start(self) -> 'SurveyStubServer':
+        """Serve in a background thread"""
+        self._thread = threading.Thread(target=self.serve_forever, name="survey-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the port"""
+        self.shutdown()
+        self.server_close()
+
+    def new_session(self) -> Tuple[str, StubSession]:
+        """Create a session with a fresh CSRF token"""
+        session_id = secrets.token_hex(16)
+        session = StubSession(secrets.token_hex(16))
+        with self._lock:
+            self.sessions[session_id] = session
+        return session_id, session
+
+    def simulate_latency(self) -> None:
+        """Sleep the configured per-request latency"""
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            time.sleep(delay)
+
+    def simulate_overload(self) -> bool:
+        """Whether this page request fails with 503 (see error_rate)"""
+        return self.error_rate > 0 and random.random() < self.error_rate
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """Request handler of SurveyStubServer"""
+
+    server: SurveyStubServer
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args) -> None:
+        # Keep benchmark output clean
+        pass
+
+    # ------------------------------------------------------------------
+    # HTTP methods
+    # ------------------------------------------------------------------
+
+    def do_GET(self) -> None:
+        path = urlsplit(self.path).path
+        self.server.requests_served += 1
+
+        if path in ASSETS:
+            content_type, body = ASSETS[path]
+            self._send(200, body, content_type)
+            return
+
+        if path.rstrip('/') != SURVEY_PATH:
+            self._send(404, b"Not found", 'text/plain')
+            return
+
+        self.server.simulate_latency()
+        if self.server.simulate_overload():
+            self._send(503, b"Service Unavailable", 'text/plain')
+            return
+
+        session_id, session = self._session()
+
+        if session.token is None:
+            self._send_page(session_id, self._render_login(session))
+        else:
+            self._send_page(session_id, self._render_step(session))
+
+    def do_POST(self) -> None:
+        path = urlsplit(self.path).path
+        self.server.requests_served += 1
+
+        length = int(self.headers.get('Content-Length', 0))
+        form = {
+            key: values[-1]
+            for key, values in parse_qs(self.rfile.read(length).decode('utf-8'), keep_blank_values=True).items()
+        }
+
+        if path.rstrip('/') != SURVEY_PATH:
+            self._send(404, b"Not found", 'text/plain')
+            return
+
+        self.server.simulate_latency()
+        if self.server.simulate_overload():
+            self._send(503, b"Service Unavailable", 'text/plain')
+            return
+
+        session_id, session = self._session()
+
+        if form.get(CSRF_FIELD) != session.csrf_token:
+            self._send(400, "CSRF token mismatch".encode('utf-8'), 'text/plain')
+            return
+
+        if session.token is None:
+            self._send_page(session_id, self._login(session, form.get('token', '').strip()))
+            return
+
+        if form.get('move') == 'movenext' and form.get('thisstep') == str(session.step):
+            self._store_answers(session, form)
+            session.step += 1
+
+            if session.step >= len(session.pages):
+                self.server.completed[session.token] = dict(session.answers)
+
+        self._send_page(session_id, self._render_step(session))
+
+    # ------------------------------------------------------------------
+    # Survey logic
+    # ------------------------------------------------------------------
+
+    def _session(self) -> Tuple[str, StubSession]:
+        """Session of the request cookie, or a new one"""
+        cookie = SimpleCookie(self.headers.get('Cookie', ''))
+        morsel = cookie.get(SESSION_COOKIE)
+
+        if morsel and morsel.value in self.server.sessions:
+            return morsel.value, self.server.sessions[morsel.value]
+
+        return self.server.new_session()
+
+    def _login(self, session: StubSession, token: str) -> str:
+        """Start the survey for a token, or show the login page with an error"""
+        if not token:
+            return self._render_login(session, "Zadejte prosím přístupový kód.")
+
+        if self.server.single_use_tokens and token in self.server.completed:
+            return self._render_login(session, "Tento přístupový kód již byl použit.")
+
+        school_types = self.server.tokens.get(token, self.server.default_school_types)
+        session.token = token
+        session.pages = survey_pages_for(school_types)
+        session.step = 0
+        return self._render_step(session)
+
+    def _store_answers(self, session: StubSession, form: Dict[str, str]) -> None:
+        """Remember submitted answers of the current step"""
+        page = session.pages[session.step]
+        prefix = self._field_prefix(page)
+
+        for key, value in form.items():
+            if key.startswith(prefix):
+                session.answers[key] = value
+
+        if page.kind == 'checkboxes':
+            session.checked[page.activity_code] = [
+                index for index in range(len(TOPIC_LABELS))
+                if form.get(f"{prefix}SQ{index + 1:03d}") == 'Y'
+            ]
+
+    # ------------------------------------------------------------------
+    # Rendering
+    # ------------------------------------------------------------------
+
+    def _field_prefix(self, page: SurveyPage) -> str:
+        """LimeSurvey SGQA prefix of a question's fields"""
+        return f"{SURVEY_ID}X{page.qid // 100}X{page.qid}"
+
+    def _layout(self, session: StubSession, step: Optional[int], body: str) -> str:
+        """Common page frame with theme assets and the survey form"""
+        step_field = f'<input type="hidden" name="thisstep" value="{step}">' if step is not None else ''
+        return f"""<!DOCTYPE html>
+<html lang="cs">
+<head>
+<meta charset="utf-8">
+<title>Evidence podpořenosti</title>
+<link rel="stylesheet" href="/assets/theme.css">
+<script src="/assets/jquery.min.js"></script>
+</head>
+<body>
+<img src="/assets/logo.png" alt="OP JAK">
+<form id="limesurvey" name="limesurvey" method="post" action="{SURVEY_PATH}">
+<input type="hidden" name="{CSRF_FIELD}" value="{session.csrf_token}">
+{step_field}
+{body}
+</form>
+{EM_SCRIPT}
+</body>
+</html>"""
+
+    def _render_login(self, session: StubSession, error: str = "") -> str:
+        """Token login page"""
+        error_html = f'<div class="alert alert-danger">{html.escape(error)}</div>' if error else ''
+        return self._layout(session, None, f"""
+{error_html}
+<p>Pro přístup k dotazníku zadejte přístupový kód.</p>
+<label for="token">Přístupový kód:</label>
+<input type="text" class="form-control" name="token" id="token" value="">
+<button type="submit" class="btn btn-primary" name="continue">Pokračovat</button>
+""")
+
+    def _render_step(self, session: StubSession) -> str:
+        """Current question page, or the completion page"""
+        if session.step >= len(session.pages):
+            return self._layout(session, None, f"""
+<div class="completed-text">
+<p>{html.escape(COMPLETION_TEXT)}</p>
+</div>
+""")
+
+        page = session.pages[session.step]
+        prefix = self._field_prefix(page)
+
+        if page.kind == 'checkboxes':
+            answers = self._render_checkboxes(prefix)
+        elif page.kind == 'table_counts':
+            answers = self._render_table(prefix, session.checked.get(page.activity_code, []))
+        elif page.kind == 'intro':
+            answers = '<p class="ico">IČO: 00000000</p>'
+        else:
+            answers = self._render_inputs(prefix, page)
+
+        return self._layout(session, session.step, f"""
+<div class="question-container" id="question{page.qid}">
+<div class="ls-label-question" id="ls-question-text-{prefix}">{html.escape(page.question_text)}</div>
+<div class="answer-container">
+{answers}
+</div>
+</div>
+<div class="ls-move-buttons">
+<button type="submit" name="move" value="movenext" class="ls-move-btn ls-move-forward btn btn-primary">Další</button>
+</div>
+""")
+
+    def _render_checkboxes(self, prefix: str) -> str:
+        """Multiple choice list (label right after its checkbox)"""
+        items = []
+        for index, label in enumerate(TOPIC_LABELS, start=1):
+            name = f"{prefix}SQ{index:03d}"
+            items.append(
+                f'<li class="question-item answer-item checkbox-item">'
+                f'<input type="checkbox" name="{name}" id="answer{name}" value="Y">'
+                f'<label for="answer{name}" class="control-label checkbox-label">{html.escape(label)}</label>'
+                f'{self._mirror(name)}</li>'
+            )
+        return '<ul class="ls-answers answers-list">' + ''.join(items) + '</ul>'
+
+    def _render_table(self, prefix: str, checked: List[int]) -> str:
+        """Topic × school year array; rows of unchecked topics are ls-hidden"""
+        header = ''.join(f'<th>{year}</th>' for year in SCHOOL_YEAR_LABELS)
+        rows = []
+        for index, label in enumerate(TOPIC_LABELS):
+            hidden = '' if index in checked else ' ls-hidden'
+            names = [f"{prefix}SQ{index + 1:03d}_SQ{col:03d}" for col in range(1, len(SCHOOL_YEAR_LABELS) + 1)]
+            cells = ''.join(
+                f'<td><input type="text" class="form-control" name="{name}" value="">{self._mirror(name)}</td>'
+                for name in names
+            )
+            rows.append(
+                f'<tr id="javatbd{prefix}SQ{index + 1:03d}" class="answers-list{hidden}">'
+                f'<th class="answertext">{html.escape(label)}</th>{cells}</tr>'
+            )
+        return f'<table class="ls-answers"><tr><td></td>{header}</tr>' + ''.join(rows) + '</table>'
+
+    def _render_inputs(self, prefix: str, page: SurveyPage) -> str:
+        """Simple text inputs, one row per school year (or numbered row)"""
+        rows = []
+        for index in range(page.num_inputs):
+            label = SCHOOL_YEAR_LABELS[index] if page.kind == 'simple_inputs' else f"Položka {index + 1}"
+            name = f"{prefix}SQ{index + 1:03d}"
+            rows.append(
+                f'<tr class="answers-list"><th class="answertext">{label}</th>'
+                f'<td><input type="text" class="form-control" name="{name}" value="">{self._mirror(name)}</td></tr>'
+            )
+        return '<table class="ls-answers">' + ''.join(rows) + '</table>'
+
+    def _mirror(self, name: str) -> str:
+        """ExpressionManager mirror of an answer field"""
+        return f'<input type="hidden" id="java{name}" name="java{name}" value="">'
+
+    # ------------------------------------------------------------------
+    # Low-level response helpers
+    # ------------------------------------------------------------------
+
+    def _send_page(self, session_id: str, body: str) -> None:
+        self._send(200, body.encode('utf-8'), 'text/html; charset=utf-8', session_id)
+
+    def _send(self, status: int, body: bytes, content_type: str, session_id: Optional[str] = None) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if session_id:
+            self.send_header('Set-Cookie', f"{SESSION_COOKIE}={session_id}; Path=/; HttpOnly")
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main() -> None:
+    """Run the stub server in the foreground"""
+    parser = argparse.ArgumentParser(description='Local LimeSurvey stand-in server')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind (default: %(default)s)')
+    parser.add_argument('--port', type=int, default=8765, help='Port to bind (default: %(default)s)')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every page request')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Random extra latency up to N seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of page requests answered 503 (0..1)')
+    parser.add_argument(
+        '--school-types',
+        default='MS,ZS,SD',
+        help='Sections shown for every token, comma separated (default: %(default)s)'
+    )
+    args = parser.parse_args()
+
+    server = SurveyStubServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        school_types=[s.strip() for s in args.school_types.split(',') if s.strip()]
+    )
+    print(f"Survey stub running at {server.url} (Ctrl+C to stop)")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
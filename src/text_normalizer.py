@@ -2,8 +2,74 @@
 
 import unicodedata
 import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
 
 
+# Upper bound of distinct inputs kept by normalize_czech_text (whole page
+# texts are called repeatedly by detection and completion checks)
+NORMALIZE_CACHE_SIZE = 4096
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+class _DiacriticsTable(dict):
+    """
+    str.translate table built lazily: character → its NFD form without 'Mn' marks
+
+    NFD of a whole string is the per-character decomposition followed by
+    canonical reordering of combining marks. Reordering cannot change the
+    result as long as every combining mark (non-zero combining class) is
+    dropped; characters decomposing into a kept combining mark (e.g. 'Mc'
+    marks) are recorded in `unsafe` and such texts take the reference path.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.unsafe = set()
+
+    def __missing__(self, code: int) -> str:
+        char = chr(code)
+        decomposed = unicodedata.normalize('NFD', char)
+        kept = ''.join(c for c in decomposed if unicodedata.category(c) != 'Mn')
+
+        if any(unicodedata.combining(c) for c in kept):
+            self.unsafe.add(char)
+
+        self[code] = kept
+        return kept
+
+
+_DIACRITICS_TABLE = _DiacriticsTable()
+
+
+def _normalize_czech_text_reference(text: str) -> str:
+    """
+    Character-by-character implementation of normalize_czech_text
+
+    Kept as the definition of the expected output: normalize_czech_text falls
+    back to it for rare characters and benchmarks/bench_text_normalizer.py
+    checks both give identical results.
+    """
+    if not text:
+        return ""
+
+    # NFD normalization - decompose characters (á → a + ́)
+    nfd = unicodedata.normalize('NFD', text)
+
+    # Remove diacritics (combining characters)
+    no_diacritics = ''.join(
+        char for char in nfd
+        if unicodedata.category(char) != 'Mn'
+    )
+
+    # Lowercase and collapse whitespace
+    normalized = re.sub(r'\s+', ' ', no_diacritics.lower().strip())
+
+    return normalized
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
 def normalize_czech_text(text: str) -> str:
     """
     Normalize Czech text for comparison
@@ -12,6 +78,10 @@ def normalize_czech_text(text: str) -> str:
     - Collapse whitespace
     - Trim leading/trailing spaces
 
+    Diacritics are removed with a cached translation table (ASCII text skips
+    it) and results are memoized for the last NORMALIZE_CACHE_SIZE inputs.
+    The output is identical to _normalize_czech_text_reference.
+
     Args:
         text: Input text with Czech diacritics
 
@@ -27,19 +97,41 @@ def normalize_czech_text(text: str) -> str:
     if not text:
         return ""
 
-    # NFD normalization - decompose characters (á → a + ́)
-    nfd = unicodedata.normalize('NFD', text)
+    if text.isascii():
+        no_diacritics = text
+    else:
+        no_diacritics = text.translate(_DIACRITICS_TABLE)
 
-    # Remove diacritics (combining characters)
-    no_diacritics = ''.join(
-        char for char in nfd
-        if unicodedata.category(char) != 'Mn'
-    )
+        # Text contains a character whose marks NFD may reorder
+        if _DIACRITICS_TABLE.unsafe and not _DIACRITICS_TABLE.unsafe.isdisjoint(text):
+            return _normalize_czech_text_reference(text)
 
     # Lowercase and collapse whitespace
-    normalized = re.sub(r'\s+', ' ', no_diacritics.lower().strip())
+    return _WHITESPACE_RE.sub(' ', no_diacritics.lower().strip())
 
-    return normalized
+
+def normalize_many(texts: Iterable[str]) -> List[str]:
+    """
+    Normalize a batch of texts (e.g. all checkbox labels of a page)
+
+    Repeated texts are normalized once.
+
+    Args:
+        texts: Input texts
+
+    Returns:
+        Normalized texts in input order
+
+    Examples:
+        >>> normalize_many(["Inkluze", "EVVO ", "Inkluze"])
+        ["inkluze", "evvo", "inkluze"]
+    """
+    normalized = {}
+    return [
+        normalized[text] if text in normalized
+        else normalized.setdefault(text, normalize_czech_text(text))
+        for text in texts
+    ]
 
 
 def compare_texts(text1: str, text2: str) -> bool:
@@ -155,6 +247,47 @@ def normalize_for_checkbox_matching(text: str) -> str:
     return normalize_czech_text(no_parens)
 
 
+def match_checkbox_labels(topic_norms: Iterable[str], labels: List[str]) -> List[Tuple[int, str]]:
+    """
+    Find the checkbox label of each topic, with the rules of SELECT_TOPICS_JS
+
+    A topic matches the first label with the same normalized text, else the
+    first label with the same first word when that word is longer than 3
+    characters.
+
+    Args:
+        topic_norms: Topics normalized with normalize_for_checkbox_matching
+        labels: Checkbox labels as shown on the page, in document order
+
+    Returns:
+        Per topic (label index, 'exact' | 'first_word'), or (-1, 'unmatched')
+
+    Examples:
+        >>> match_checkbox_labels(["evvo", "robotika"], ["EVVO (environmentální vzdělávání)"])
+        [(0, 'exact'), (-1, 'unmatched')]
+    """
+    exact: Dict[str, int] = {}
+    by_first_word: Dict[str, int] = {}
+    for index, label in enumerate(labels):
+        if not label:
+            continue
+        label_norm = normalize_for_checkbox_matching(label)
+        exact.setdefault(label_norm, index)
+        by_first_word.setdefault(label_norm.split(' ')[0], index)
+
+    matches = []
+    for topic_norm in topic_norms:
+        if topic_norm in exact:
+            matches.append((exact[topic_norm], 'exact'))
+            continue
+        first_word = topic_norm.split(' ')[0]
+        if len(first_word) > 3 and first_word in by_first_word:
+            matches.append((by_first_word[first_word], 'first_word'))
+        else:
+            matches.append((-1, 'unmatched'))
+    return matches
+
+
 def extract_activity_code(text: str) -> str:
     """
     Extract activity code from question text (e.g., "1.I/4", "1.I/6", "1.V/1")
@@ -0,0 +1,133 @@
+"""Values to fill per page, computed from the fill plan (no browser access)"""
+
+import logging
+import random
+from typing import Any, Dict, List, Optional
+
+from src.calculator import generate_counts_for_years, generate_counts_for_topics
+from src.fill_plan import FillPlan, TopicPlan
+from src.question_detector import QuestionInfo
+from src.logger_config import log_warning
+
+
+class ValuePlanner:
+    """
+    Value planning shared by FormFiller, AsyncFormFiller, HttpFormFiller and plan previews
+
+    Subclasses provide `config`, `plan` (FillPlan), `logger` and
+    `last_checked_topics` (topics of the last checkbox page, used by a DVPP
+    count page whose activity has no topics in JSON). `rng` is the random
+    generator of the counts (None = the global one).
+    """
+
+    config: Dict[str, Any]
+    plan: FillPlan
+    logger: logging.Logger
+    last_checked_topics: List[str]
+    rng: Optional[random.Random] = None
+
+    # SDP/ŽZOR codes: 1.I/6 (MŠ), 1.I/7 (ZŠ - old), 1.II/9 (ZŠ - primary), 1.V/3 (ŠD)
+    # DVPP codes: 1.I/4 (MŠ), 1.I/5 (ZŠ - old), 1.II/7 (ZŠ - primary), 1.V/1 (ŠD)
+    SDP_ZZOR_CODES = ['1.I/6', '1.I/7', '1.II/9', '1.V/3']
+
+    def _simple_input_counts(self, info: QuestionInfo) -> List[int]:
+        """Random counts for the first 3 school years"""
+        base_count = self.plan.base_count(info.school_type)
+        return generate_counts_for_years(base_count, num_years=3, rng=self.rng)
+
+    def _simple_input_values(self, counts: List[int], num_inputs: int) -> List[str]:
+        """
+        Values for FILL_VISIBLE_INPUTS_JS on a simple year page
+
+        Contract: the page's visible text inputs in document order are the
+        school years 2022/2023 … 2025/2026. The first 3 get the counts, the
+        4th (2025/2026) is explicitly set to '' so it stays empty even if it
+        was prefilled, and any further inputs are not touched.
+
+        Examples:
+            >>> filler._simple_input_values([4, 5, 6], 4)
+            ['4', '5', '6', '']
+            >>> filler._simple_input_values([4, 5, 6], 3)
+            ['4', '5', '6']
+        """
+        values = [str(count) for count in counts]
+        if num_inputs > len(values):
+            values.append('')
+        return values
+
+    def _checkbox_topics(self, info: QuestionInfo) -> TopicPlan:
+        """
+        Topics to check on a checkbox page
+
+        Also remembers them for the subsequent count page.
+
+        Returns:
+            Topics from the fill plan (names and normalized labels), empty
+            (already logged) if none
+        """
+        # Get topics from the compiled plan
+        # Check if this is SDP/ŽZOR or DVPP based on activity code
+        if info.activity_code in self.SDP_ZZOR_CODES:
+            # SDP/ŽZOR - topics are dict keys
+            topics = self.plan.sdp_zzor_topics(info.json_key)
+        else:
+            # DVPP - topics are list items (includes 1.I/4, 1.I/5, 1.II/7, 1.V/1)
+            topics = self.plan.dvpp_topics(info.json_key)
+
+        if not topics:
+            log_warning(self.logger, f"No topics found for {info.json_key}")
+            log_warning(self.logger, f"Available keys: {list(self.config.get('sdp_zzor', {}).keys())}")
+            return []
+
+        self.logger.info(f"Checking {len(topics)} checkboxes")
+
+        # Store topics for next page (counts page)
+        self.last_checked_topics = list(topics.topics)
+
+        return topics
+
+    def _table_values(self, info: QuestionInfo):
+        """
+        Topics and flat row-major values for a topic × year table
+
+        Returns:
+            (topics, values) - 4 values per topic, the 4th (2025/2026) always 0
+        """
+        base_count = self.plan.base_count(info.school_type)
+
+        # Get topics and determine values
+        if info.calculation == 'from_json':
+            # SDP/ŽZOR - exact values from JSON, compiled into the plan
+            # (3 years, then 0 for 2025/2026)
+            topic_plan = self.plan.sdp_zzor_topics(info.json_key)
+            topics = list(topic_plan.topics)
+            values = list(topic_plan.values)
+
+        else:
+            # DVPP - random values
+            # Try to get topics from JSON first
+            dvpp_topics = list(self.plan.dvpp_topics(info.json_key).topics)
+
+            # If not in JSON, use topics from previous checkbox page
+            if not dvpp_topics and self.last_checked_topics:
+                self.logger.info("Using topics from previous checkbox page")
+                dvpp_topics = self.last_checked_topics
+
+            topics = dvpp_topics
+            num_topics = len(topics)
+            # Generate only 3 years of random values
+            random_values = generate_counts_for_topics(base_count, num_topics, num_years=3, rng=self.rng)
+
+            # Add 0 for every 4th value (2025/2026)
+            values = []
+            for i in range(num_topics):
+                # Add 3 random values
+                values.extend(random_values[i*3:(i+1)*3])
+                # Add 0 for 2025/2026
+                values.append(0)
+
+        # Fill inputs using JavaScript (handles hidden fields)
+        num_fields = len(topics) * 4
+        self.logger.info(f"Filling {num_fields} fields ({len(topics)} topics × 4 years, last year empty)")
+
+        return topics, values
@@ -0,0 +1,109 @@
+"""HttpFormFiller against the local survey stub: retries of failed requests"""
+
+import json
+import logging
+import random
+
+import pytest
+
+from src.concurrency import Backoff
+from src.http_engine import HttpFormFiller
+from src.survey_pages import TOPIC_LABELS
+from src.survey_stub import SurveyStubServer
+
+
+SCHOOL_TYPES = ['MS', 'ZS', 'SD']
+
+
+class FastRetryFiller(HttpFormFiller):
+    """Same retry logic, without the real backoff pauses"""
+
+    BACKOFF = Backoff(base=0.001, cap=0.005)
+
+
+class FailingCallsStub(SurveyStubServer):
+    """Stub answering 503 to the given page requests (1-based, GET and POST)"""
+
+    def __init__(self, failing_calls, **kwargs):
+        super().__init__(**kwargs)
+        self.failing_calls = set(failing_calls)
+        self.calls = 0
+
+    def simulate_overload(self) -> bool:
+        self.calls += 1
+        return self.calls in self.failing_calls
+
+
+def _write_config(tmp_path, code: str) -> str:
+    """All school types, three topics per activity (the ALL benchmark shape)"""
+    topics = TOPIC_LABELS[:3]
+    years = {"2022-2023": 5, "2023-2024": 7, "2024-2025": 9}
+    config = {
+        "code": code,
+        "school_name": f"Test {code}",
+        "MS": 40,
+        "ZS": 250,
+        "SD": 60,
+        "dvpp_topics": {
+            "vzdělávání_MŠ_1_I_4": topics,
+            "vzdělávání_ZŠ_1_II_7": topics,
+            "vzdělávání_ŠD_ŠK_1_V_1": topics,
+        },
+        "sdp_zzor": {
+            "1.I/6 Inovativní vzdělávání dětí v MŠ": {topic: years for topic in topics},
+            "1.II/9 Inovativní vzdělávání žáků v ZŠ": {topic: years for topic in topics},
+            "1.V/3 Inovativní vzdělávání účastníků zájmového vzdělávání v ŠD/ŠK": {topic: years for topic in topics},
+        },
+    }
+    path = tmp_path / f"{code}.json"
+    path.write_text(json.dumps(config, ensure_ascii=False), encoding='utf-8')
+    return str(path)
+
+
+def _filler(config_path: str, stub: SurveyStubServer) -> FastRetryFiller:
+    logger = logging.getLogger('test_http_engine')
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+    return FastRetryFiller(config_path=config_path, logger=logger, form_url=stub.url)
+
+
+@pytest.fixture
+def stub_factory():
+    stubs = []
+
+    def start(stub: SurveyStubServer) -> SurveyStubServer:
+        stubs.append(stub.start())
+        return stub
+
+    yield start
+
+    for stub in stubs:
+        stub.stop()
+
+
+def test_login_post_503_resubmits_access_code(tmp_path, stub_factory):
+    # Call 1 is the login page, call 2 the token POST
+    stub = stub_factory(FailingCallsStub(failing_calls=[2], port=0))
+    stub.register_token('LOGIN503', SCHOOL_TYPES)
+
+    assert _filler(_write_config(tmp_path, 'LOGIN503'), stub).fill_http()
+
+
+def test_login_gives_up_when_the_server_keeps_failing(tmp_path, stub_factory):
+    stub = stub_factory(FailingCallsStub(failing_calls=range(2, 100), port=0))
+    stub.register_token('DOWN', SCHOOL_TYPES)
+
+    assert not _filler(_write_config(tmp_path, 'DOWN'), stub).fill_http()
+
+
+def test_surveys_complete_under_error_rate(tmp_path, stub_factory):
+    random.seed(1)
+    stub = stub_factory(SurveyStubServer(port=0, error_rate=0.2))
+
+    results = []
+    for i in range(5):
+        code = f"ERR{i}"
+        stub.register_token(code, SCHOOL_TYPES)
+        results.append(_filler(_write_config(tmp_path, code), stub).fill_http())
+
+    assert results == [True] * 5